@@ -5,7 +5,20 @@ Analyse-Modul für Sportwetten-Prognose App
 from .validation import validate_match_data, check_alerts
 from .h2h_analysis import analyze_h2h
 from .risk_scoring import calculate_risk_score, calculate_extended_risk_scores_strict
-from .match_analysis import analyze_match_v47_ml, analyze_match_with_extended_data
+from .match_analysis import (
+    analyze_match_v47_ml,
+    analyze_matches_batch,
+    analyze_matches_isolated,
+    analyze_match_with_extended_data,
+)
+from .analysis_cache import ANALYSIS_CACHE, AnalysisCache
+from .goal_models import (
+    GOAL_MODELS,
+    goal_model_matrix,
+    cached_goal_model_matrix,
+    fit_dixon_coles_rho,
+    fit_dixon_coles_rho_from_history,
+)
 
 __all__ = [
     # Validation
@@ -18,5 +31,16 @@ __all__ = [
     "calculate_extended_risk_scores_strict",
     # Match Analysis
     "analyze_match_v47_ml",
+    "analyze_matches_batch",
+    "analyze_matches_isolated",
     "analyze_match_with_extended_data",
+    # Analysis Cache
+    "ANALYSIS_CACHE",
+    "AnalysisCache",
+    # Goal Models
+    "GOAL_MODELS",
+    "goal_model_matrix",
+    "cached_goal_model_matrix",
+    "fit_dixon_coles_rho",
+    "fit_dixon_coles_rho_from_history",
 ]
@@ -0,0 +1,104 @@
+"""
+Prozessweiter Cache für Match-Analysen
+
+Streamlit-Sessions und der Telegram-Bot laufen im selben Prozess; gleiche
+Fixtures werden an Spieltagen von vielen Nutzern geöffnet. Der Cache hält
+fertige Analyse-Dictionaries (LRU + TTL) unter einem stabilen Hash der
+geparsten MatchData plus Modell-Version und ML-Korrektur-Zustand.
+"""
+
+import copy
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional
+
+from data.models import MatchData
+
+# Bei Änderungen an der Analyse-Logik erhöhen -> alte Einträge ungültig
+ANALYSIS_VERSION = "v4.9-ml"
+
+DEFAULT_MAX_ENTRIES = 512
+DEFAULT_TTL_SECONDS = 15 * 60
+
+
+def ml_state_key(pos_model, goal_model: Optional[str] = None, goal_model_params=None) -> str:
+    """
+    Zustand, der das Analyse-Ergebnis neben den Match-Daten beeinflusst:
+    trainiertes Positions-Modell (Instanz + Trainingszeitpunkt) und Tor-Modell.
+    """
+    if pos_model is not None and getattr(pos_model, "is_trained", False):
+        ml = f"{type(pos_model).__name__}:{id(pos_model)}:{pos_model.last_trained}"
+    else:
+        ml = "off"
+    params = sorted((goal_model_params or {}).items())
+    return f"{ml}|{goal_model or 'poisson'}:{params}"
+
+
+def match_data_key(match: MatchData, state_key: str = "") -> str:
+    """
+    Stabiler Inhalts-Hash einer MatchData (dataclass-repr enthält alle Felder
+    inkl. Teams, H2H und Quoten) plus Analyse-Version und ML-Zustand.
+    """
+    payload = f"{ANALYSIS_VERSION}|{state_key}|{match!r}"
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+class AnalysisCache:
+    """
+    Thread-sicherer LRU-Cache mit TTL und Treffer-Zählern
+
+    Gespeicherte und ausgegebene Ergebnisse sind Kopien, da Aufrufer die
+    Dictionaries nachträglich verändern (z.B. predicted_score, _sheet_id).
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, ttl_seconds: float = DEFAULT_TTL_SECONDS):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[Dict]:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or now - entry[0] > self.ttl_seconds:
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            result = entry[1]
+        return copy.deepcopy(result)
+
+    def put(self, key: str, result: Dict) -> None:
+        stored = copy.deepcopy(result)
+        with self._lock:
+            self._entries[key] = (time.monotonic(), stored)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._entries),
+                "hit_rate": round(self.hits / total, 3) if total else 0.0,
+            }
+
+
+# Eine Instanz pro Prozess (App-Sessions + Telegram-Bot-Thread)
+ANALYSIS_CACHE = AnalysisCache()
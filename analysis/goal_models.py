@@ -0,0 +1,263 @@
+"""
+Tor-Modelle für die Ergebnismatrix
+
+Austauschbare Modelle, die aus den μ-Werten (erwartete Tore Heim/Auswärts)
+die Ergebnismatrix P(Heim = i, Auswärts = j) bauen:
+
+- "poisson":      unabhängige Poisson-Verteilungen (bisheriges Verhalten)
+- "dixon_coles":  Poisson mit ρ-Korrektur der Ergebnisse 0:0, 0:1, 1:0, 1:1
+- "bivariate":    bivariates Poisson mit gemeinsamer Komponente λ3
+- "negbin":       unabhängige Negativ-Binomial-Verteilungen (Überdispersion)
+
+Alle Modelle erhalten die Randerwartungswerte μ und arbeiten wie
+score_matrix() sowohl für ein Match (N x N) als auch für viele Matches
+(M x N x N). Einzelne Matrizen werden pro (Modell, μ, Parameter) gecacht.
+"""
+
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from analysis.score_matrix import DEFAULT_MAX_GOALS, score_matrix
+from utils.math_helpers import poisson_pmf_array
+
+GOAL_MODELS = ("poisson", "dixon_coles", "bivariate", "negbin")
+
+# Standard-Parameter je Modell (ρ aus der Literatur, bis er gefittet ist)
+DEFAULT_MODEL_PARAMS = {
+    "poisson": {},
+    "dixon_coles": {"rho": -0.13},
+    "bivariate": {"lambda3": 0.1},
+    "negbin": {"dispersion": 10.0},
+}
+
+
+def _model_params(model: str, params: Optional[Dict]) -> Dict[str, float]:
+    """Standard-Parameter des Modells, überschrieben durch params"""
+    if model not in GOAL_MODELS:
+        raise ValueError(f"Unbekanntes Tor-Modell: {model}")
+    merged = dict(DEFAULT_MODEL_PARAMS[model])
+    if params:
+        merged.update(params)
+    return merged
+
+
+def _dixon_coles_matrix(mu_h, mu_a, rho: float, max_goals: int) -> np.ndarray:
+    """Poisson-Matrix mit Dixon-Coles τ-Faktoren auf den vier Niedrig-Zellen"""
+    mu_h = np.maximum(np.asarray(mu_h, dtype=float), 0.0)
+    mu_a = np.maximum(np.asarray(mu_a, dtype=float), 0.0)
+    matrix = score_matrix(mu_h, mu_a, max_goals)
+    if max_goals < 1:
+        return matrix
+
+    matrix[..., 0, 0] *= 1.0 - mu_h * mu_a * rho
+    matrix[..., 0, 1] *= 1.0 + mu_h * rho
+    matrix[..., 1, 0] *= 1.0 + mu_a * rho
+    matrix[..., 1, 1] *= 1.0 - rho
+    # ρ außerhalb des gültigen Bereichs würde negative Zellen erzeugen
+    return np.maximum(matrix, 0.0)
+
+
+def _bivariate_matrix(mu_h, mu_a, lambda3: float, max_goals: int) -> np.ndarray:
+    """
+    Bivariates Poisson: X = X1 + X3, Y = X2 + X3 mit λ1 = μh - λ3,
+    λ2 = μa - λ3, so dass die Randerwartungswerte μ bleiben.
+
+    P(i, j) = Σ_k p1(i - k) · p2(j - k) · p3(k)
+    """
+    mu_h = np.maximum(np.asarray(mu_h, dtype=float), 0.0)
+    mu_a = np.maximum(np.asarray(mu_a, dtype=float), 0.0)
+    lam3 = np.minimum(max(lambda3, 0.0), 0.999 * np.minimum(mu_h, mu_a))
+
+    n = max_goals + 1
+    pmf_1 = poisson_pmf_array(mu_h - lam3, max_goals)
+    pmf_2 = poisson_pmf_array(mu_a - lam3, max_goals)
+    pmf_3 = poisson_pmf_array(lam3, max_goals)
+
+    matrix = np.zeros(mu_h.shape + (n, n))
+    for k in range(n):
+        matrix[..., k:, k:] += (
+            pmf_3[..., k, None, None]
+            * pmf_1[..., : n - k, None]
+            * pmf_2[..., None, : n - k]
+        )
+    return matrix
+
+
+def _negbin_pmf(mu, dispersion: float, max_goals: int) -> np.ndarray:
+    """
+    Negativ-Binomial-PMF mit Erwartungswert μ und Varianz μ + μ²/r
+    (r = dispersion) über die Rekursion p(k+1) = p(k) · (k + r)/(k + 1) · q
+    """
+    mu = np.maximum(np.asarray(mu, dtype=float), 0.0)[..., None]
+    r = float(dispersion)
+    q = mu / (r + mu)
+    k = np.arange(max_goals)
+    steps = (k + r) / (k + 1) * q
+    p0 = (r / (r + mu)) ** r
+    return p0 * np.concatenate([np.ones_like(mu), np.cumprod(steps, axis=-1)], axis=-1)
+
+
+def goal_model_matrix(
+    mu_home,
+    mu_away,
+    model: str = "poisson",
+    params: Optional[Dict] = None,
+    max_goals: int = DEFAULT_MAX_GOALS,
+) -> np.ndarray:
+    """
+    Ergebnismatrix des gewählten Tor-Modells (vektorisiert)
+
+    Args:
+        mu_home: Erwartete Tore Heim (Skalar oder Array der Länge M)
+        mu_away: Erwartete Tore Auswärts (gleiche Form wie mu_home)
+        model: Eines von GOAL_MODELS
+        params: Modell-Parameter (rho / lambda3 / dispersion), fehlende
+            Werte aus DEFAULT_MODEL_PARAMS
+        max_goals: Höchste betrachtete Toranzahl pro Team
+
+    Returns:
+        (N, N) bzw. (M, N, N) Array mit P(Heim = i, Auswärts = j)
+    """
+    p = _model_params(model, params)
+
+    if model == "poisson":
+        return score_matrix(mu_home, mu_away, max_goals)
+    if model == "dixon_coles":
+        return _dixon_coles_matrix(mu_home, mu_away, float(p["rho"]), max_goals)
+    if model == "bivariate":
+        return _bivariate_matrix(mu_home, mu_away, float(p["lambda3"]), max_goals)
+
+    pmf_h = _negbin_pmf(mu_home, p["dispersion"], max_goals)
+    pmf_a = _negbin_pmf(mu_away, p["dispersion"], max_goals)
+    return pmf_h[..., :, None] * pmf_a[..., None, :]
+
+
+@lru_cache(maxsize=1024)
+def _cached_matrix(
+    model: str,
+    mu_home: float,
+    mu_away: float,
+    params_key: Tuple[Tuple[str, float], ...],
+    max_goals: int,
+) -> np.ndarray:
+    matrix = goal_model_matrix(mu_home, mu_away, model, dict(params_key), max_goals)
+    matrix.flags.writeable = False
+    return matrix
+
+
+def cached_goal_model_matrix(
+    mu_home: float,
+    mu_away: float,
+    model: str = "poisson",
+    params: Optional[Dict] = None,
+    max_goals: int = DEFAULT_MAX_GOALS,
+) -> np.ndarray:
+    """
+    Wie goal_model_matrix() für ein einzelnes Match, aber gecacht pro
+    (Modell, μ Heim, μ Auswärts, Parameter, max_goals).
+
+    Die zurückgegebene Matrix ist schreibgeschützt (geteilt zwischen Aufrufern).
+    """
+    params_key = tuple(sorted(_model_params(model, params).items()))
+    return _cached_matrix(model, float(mu_home), float(mu_away), params_key, max_goals)
+
+
+def _rho_bounds(mu_h: np.ndarray, mu_a: np.ndarray) -> Tuple[float, float]:
+    """Bereich für ρ, in dem alle τ-Faktoren aller Matches positiv bleiben"""
+    eps = 1e-6
+    low = max(-1.0 / max(float(mu_h.max()), eps), -1.0 / max(float(mu_a.max()), eps))
+    high = min(1.0 / max(float((mu_h * mu_a).max()), eps), 1.0)
+    return low + eps, high - eps
+
+
+def fit_dixon_coles_rho(
+    mu_home, mu_away, home_goals, away_goals, grid_size: int = 401
+) -> Dict:
+    """
+    Maximum-Likelihood-Schätzung von ρ bei gegebenen μ-Werten
+
+    Nur der τ-Faktor hängt von ρ ab, und τ ist in ρ linear:
+    τ = 1 + c·ρ mit c = -μh·μa (0:0), μh (0:1), μa (1:0), -1 (1:1), sonst c = 0.
+    Die Log-Likelihood Σ log(1 + c·ρ) wird daher auf einem ρ-Gitter als eine
+    (Gitter x Matches)-Matrixoperation ausgewertet und anschließend mit
+    Newton-Schritten verfeinert (die Funktion ist konkav).
+
+    Args:
+        mu_home, mu_away: Vorhergesagte μ-Werte je Match
+        home_goals, away_goals: Tatsächliche Tore je Match
+        grid_size: Anzahl Gitterpunkte für die Grobsuche
+
+    Returns:
+        Dictionary mit rho, log_likelihood (ρ-Anteil), n_matches, n_low_scores
+    """
+    mu_h = np.maximum(np.asarray(mu_home, dtype=float), 0.0)
+    mu_a = np.maximum(np.asarray(mu_away, dtype=float), 0.0)
+    hg = np.asarray(home_goals, dtype=int)
+    ag = np.asarray(away_goals, dtype=int)
+
+    c = np.select(
+        [(hg == 0) & (ag == 0), (hg == 0) & (ag == 1), (hg == 1) & (ag == 0), (hg == 1) & (ag == 1)],
+        [-mu_h * mu_a, mu_h, mu_a, -np.ones_like(mu_h)],
+        default=0.0,
+    )
+    c = c[c != 0.0]
+
+    if c.size == 0:
+        return {"rho": 0.0, "log_likelihood": 0.0, "n_matches": int(mu_h.size), "n_low_scores": 0}
+
+    low, high = _rho_bounds(mu_h, mu_a)
+    grid = np.linspace(low, high, grid_size)
+    ll = np.log1p(np.outer(grid, c)).sum(axis=1)
+    best = int(np.argmax(ll))
+    rho = grid[best]
+    lo = grid[max(best - 1, 0)]
+    hi = grid[min(best + 1, grid_size - 1)]
+
+    for _ in range(20):
+        tau = 1.0 + c * rho
+        grad = np.sum(c / tau)
+        hess = -np.sum((c / tau) ** 2)
+        if hess == 0:
+            break
+        step = grad / hess
+        rho = float(np.clip(rho - step, lo, hi))
+        if abs(step) < 1e-10:
+            break
+
+    return {
+        "rho": float(rho),
+        "log_likelihood": float(np.log1p(c * rho).sum()),
+        "n_matches": int(mu_h.size),
+        "n_low_scores": int(c.size),
+    }
+
+
+def fit_dixon_coles_rho_from_history(historical_matches: List[Dict]) -> Dict:
+    """
+    Fittet ρ auf den Einträgen aus load_historical_matches_from_sheets()
+    (HISTORICAL_DATA: predicted_mu_home/away + actual_score "h:a").
+
+    Einträge ohne lesbares Ergebnis werden übersprungen.
+    """
+    rows = []
+    for match in historical_matches:
+        score = str(match.get("actual_score", "")).replace("-", ":").split(":")
+        try:
+            rows.append(
+                (
+                    float(match["predicted_mu_home"]),
+                    float(match["predicted_mu_away"]),
+                    int(score[0]),
+                    int(score[1]),
+                )
+            )
+        except (KeyError, ValueError, IndexError):
+            continue
+
+    if not rows:
+        return {"rho": 0.0, "log_likelihood": 0.0, "n_matches": 0, "n_low_scores": 0}
+
+    data = np.array(rows, dtype=float)
+    return fit_dixon_coles_rho(data[:, 0], data[:, 1], data[:, 2], data[:, 3])
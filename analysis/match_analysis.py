@@ -2,10 +2,18 @@
 Haupt-Analyse-Funktion für Match-Prognosen (v4.7+ SMART-PRECISION)
 """
 
+import copy
+import numpy as np
 import streamlit as st
-from typing import Dict, Optional
+from typing import Dict, List, Optional, Tuple
 from data.models import MatchData, ExtendedMatchData
-from utils.math_helpers import poisson_probability
+from analysis.analysis_cache import ANALYSIS_CACHE, match_data_key, ml_state_key
+from analysis.goal_models import goal_model_matrix
+from analysis.score_matrix import (
+    market_probabilities,
+    consistent_scoreline,
+    top_scorelines as score_top_scorelines,
+)
 from analysis.h2h_analysis import analyze_h2h
 from analysis.risk_scoring import (
     calculate_risk_score,
@@ -19,175 +27,160 @@ def _safe_get_session(key):
     except Exception:
         return None
 
-def analyze_match_v47_ml(match: MatchData) -> Dict:
+def _pack_match_arrays(matches: List[MatchData]) -> Dict[str, np.ndarray]:
+    """
+    Packt die für SMART-PRECISION benötigten Team-Werte aller Matches in
+    NumPy-Arrays (ein Eintrag pro Match).
     """
-    v6.0 mit v4.9 SMART-PRECISION LOGIK + ML-Korrekturen
-
-    NEU von v4.9:
-    - Form-Faktoren Integration
-    - TKI-Krise deaktiviert BTTS-Dominanz-Killer
-    - FTS-Check nur bei PPG > 1.0 (nicht 0.5)
-    - Form-Boost bei starker Defensive reduziert
-    - TKI-Krise überschreibt Form-Malus
-    - Strengere Dominanz-Dämpfer
-    - Auswärts-Underdog Boost
-    - Verschärfte Clean Sheet Validierung
-    - Conversion-Rate Adjustment
 
-    Args:
-        match: MatchData Objekt mit allen Spiel-Informationen
+    def col(getter):
+        return np.fromiter((getter(m) for m in matches), dtype=float, count=len(matches))
+
+    return {
+        "s_ha_h": col(lambda m: m.home_team.goals_scored_per_match_ha),
+        "c_ha_h": col(lambda m: m.home_team.goals_conceded_per_match_ha),
+        "s_ha_a": col(lambda m: m.away_team.goals_scored_per_match_ha),
+        "c_ha_a": col(lambda m: m.away_team.goals_conceded_per_match_ha),
+        "xg_for_h": col(lambda m: m.home_team.xg_for_ha),
+        "xg_against_h": col(lambda m: m.home_team.xg_against_ha),
+        "xg_for_a": col(lambda m: m.away_team.xg_for_ha),
+        "xg_against_a": col(lambda m: m.away_team.xg_against_ha),
+        "cs_h": col(lambda m: m.home_team.cs_yes_ha * 100),
+        "cs_a": col(lambda m: m.away_team.cs_yes_ha * 100),
+        "ppg_h": col(lambda m: m.home_team.ppg_ha),
+        "ppg_a": col(lambda m: m.away_team.ppg_ha),
+        "conv_h": col(lambda m: m.home_team.conversion_rate * 100),
+        "conv_a": col(lambda m: m.away_team.conversion_rate * 100),
+        "form_ppg_h": col(lambda m: m.home_team.form_points / 5),
+        "form_ppg_a": col(lambda m: m.away_team.form_points / 5),
+        "fts_h": col(lambda m: m.home_team.fts_yes_ha),
+        "fts_a": col(lambda m: m.away_team.fts_yes_ha),
+    }
 
-    Returns:
-        Dictionary mit vollständiger Analyse
-    """
 
-    # DATEN-EXTRAKTION
-    s_c_ha = [
-        match.home_team.goals_scored_per_match_ha,
-        match.home_team.goals_conceded_per_match_ha,
-        match.away_team.goals_scored_per_match_ha,
-        match.away_team.goals_conceded_per_match_ha,
-    ]
+def _form_factor(form_ppg: np.ndarray, overall_ppg: np.ndarray) -> np.ndarray:
+    """Form-Faktor aus Verhältnis Form-PPG / Heim-Auswärts-PPG (1.0 bei PPG = 0)"""
+    form_ratio = np.divide(
+        form_ppg, overall_ppg, out=np.ones_like(form_ppg), where=overall_ppg != 0
+    )
+    factor = np.select(
+        [form_ratio < 0.4, form_ratio < 0.6, form_ratio > 1.5, form_ratio > 1.2],
+        [0.70, 0.85, 1.20, 1.10],
+        default=1.0,
+    )
+    return np.where(overall_ppg == 0, 1.0, factor)
 
-    xg_ha = [
-        match.home_team.xg_for_ha,
-        match.home_team.xg_against_ha,
-        match.away_team.xg_for_ha,
-        match.away_team.xg_against_ha,
-    ]
 
-    cs_rates = [match.home_team.cs_yes_ha * 100, match.away_team.cs_yes_ha * 100]
+def _clean_sheet_factor(cs_rate: np.ndarray) -> np.ndarray:
+    """Dämpfer für die gegnerischen Tore bei hoher Clean-Sheet-Quote"""
+    return np.select(
+        [cs_rate > 50, cs_rate > 40, cs_rate > 30], [0.70, 0.80, 0.85], default=1.0
+    )
 
-    ppg = [match.home_team.ppg_ha, match.away_team.ppg_ha]
 
-    conv_rate = [
-        match.home_team.conversion_rate * 100,
-        match.away_team.conversion_rate * 100,
-    ]
+def _conversion_factor(conversion_rate: np.ndarray) -> np.ndarray:
+    """Conversion-Rate Adjustment (> 14% Boost, < 8% Malus)"""
+    return np.select(
+        [conversion_rate > 14, conversion_rate < 8], [1.10, 0.90], default=1.0
+    )
 
-    # Form-Daten
-    form_ppg_h = match.home_team.form_points / 5
-    form_ppg_a = match.away_team.form_points / 5
 
-    # Failed to Score
-    fts_h = match.home_team.fts_yes_ha
-    fts_a = match.away_team.fts_yes_ha
+def _smart_precision_mu(arr: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    """
+    v4.9 SMART-PRECISION μ-Berechnung, vektorisiert über alle Matches.
 
-    # --- v4.9 SMART-PRECISION LOGIK ---
+    Args:
+        arr: Ergebnis von _pack_match_arrays()
 
+    Returns:
+        Dictionary mit Arrays für mu, TKI, Form-Faktoren und PPG-Differenz
+    """
     # 1. BASIS μ
-    mu_h = (xg_ha[0] + s_c_ha[0]) / 2
-    mu_a = (xg_ha[2] + s_c_ha[2]) / 2
+    mu_h = (arr["xg_for_h"] + arr["s_ha_h"]) / 2
+    mu_a = (arr["xg_for_a"] + arr["s_ha_a"]) / 2
 
     # 2. FORM-FAKTOR
-    def calculate_form_factor(form_ppg, overall_ppg):
-        if overall_ppg == 0:
-            return 1.0
-        form_ratio = form_ppg / overall_ppg
-
-        if form_ratio < 0.4:
-            return 0.70
-        elif form_ratio < 0.6:
-            return 0.85
-        elif form_ratio > 1.5:
-            return 1.20
-        elif form_ratio > 1.2:
-            return 1.10
-        else:
-            return 1.0
-
-    form_factor_h = calculate_form_factor(form_ppg_h, ppg[0])
-    form_factor_a = calculate_form_factor(form_ppg_a, ppg[1])
+    form_factor_h = _form_factor(arr["form_ppg_h"], arr["ppg_h"])
+    form_factor_a = _form_factor(arr["form_ppg_a"], arr["ppg_a"])
 
     # 3. TKI BERECHNUNG (früh, für spätere Checks)
-    tki_h = max(0, s_c_ha[1] - xg_ha[1])
-    tki_a = max(0, s_c_ha[3] - xg_ha[3])
-    tki_combined = tki_h + tki_a
+    tki_h = np.maximum(0.0, arr["c_ha_h"] - arr["xg_against_h"])
+    tki_a = np.maximum(0.0, arr["c_ha_a"] - arr["xg_against_a"])
 
     # 4. NEU v4.9: TKI-KRISE ÜBERSCHREIBT FORM-MALUS
-    if tki_a > 1.0:  # Gast-Keeper in Krise
-        if form_factor_h < 1.0:
-            form_factor_h = 1.0  # Ignoriere Heim-Form-Malus
-
-    if tki_h > 1.0:  # Heim-Keeper in Krise
-        if form_factor_a < 1.0:
-            form_factor_a = 1.0  # Ignoriere Gast-Form-Malus
-
-    # 5. NEU v4.9: DEFENSIVE CONTEXT CHECK (Form-Boost reduzieren)
-    if cs_rates[0] > 40 and form_factor_h > 1.0:
-        form_factor_h = 1.0 + (form_factor_h - 1.0) * 0.5  # Halbiere den Boost
-
-    if cs_rates[1] > 40 and form_factor_a > 1.0:
-        form_factor_a = 1.0 + (form_factor_a - 1.0) * 0.5
+    form_factor_h = np.where((tki_a > 1.0) & (form_factor_h < 1.0), 1.0, form_factor_h)
+    form_factor_a = np.where((tki_h > 1.0) & (form_factor_a < 1.0), 1.0, form_factor_a)
+
+    # 5. NEU v4.9: DEFENSIVE CONTEXT CHECK (Form-Boost halbieren)
+    form_factor_h = np.where(
+        (arr["cs_h"] > 40) & (form_factor_h > 1.0),
+        1.0 + (form_factor_h - 1.0) * 0.5,
+        form_factor_h,
+    )
+    form_factor_a = np.where(
+        (arr["cs_a"] > 40) & (form_factor_a > 1.0),
+        1.0 + (form_factor_a - 1.0) * 0.5,
+        form_factor_a,
+    )
 
     # 6. Form-Faktor anwenden
-    mu_h *= form_factor_h
-    mu_a *= form_factor_a
+    mu_h = mu_h * form_factor_h
+    mu_a = mu_a * form_factor_a
 
     # 7. DOMINANZ-DÄMPFER (aggressiv)
-    ppg_diff = ppg[0] - ppg[1]
-
-    if ppg_diff > 1.5:
-        mu_a *= 0.45
-        mu_h *= 1.30
-    elif ppg_diff > 1.2:
-        mu_a *= 0.55
-        mu_h *= 1.25
-    elif ppg_diff > 0.8:
-        mu_a *= 0.65
-        mu_h *= 1.15
+    ppg_diff = arr["ppg_h"] - arr["ppg_a"]
+    dominance = [ppg_diff > 1.5, ppg_diff > 1.2, ppg_diff > 0.8]
+    mu_a = mu_a * np.select(dominance, [0.45, 0.55, 0.65], default=1.0)
+    mu_h = mu_h * np.select(dominance, [1.30, 1.25, 1.15], default=1.0)
 
     # 8. AUSWÄRTS-UNDERDOG BOOST
-    if ppg_diff < -0.5:
-        mu_a *= 1.20
-        mu_h *= 0.80
-    elif ppg_diff < -0.3:
-        mu_a *= 1.10
-        mu_h *= 0.90
+    underdog = [ppg_diff < -0.5, ppg_diff < -0.3]
+    mu_a = mu_a * np.select(underdog, [1.20, 1.10], default=1.0)
+    mu_h = mu_h * np.select(underdog, [0.80, 0.90], default=1.0)
 
     # 9. CLEAN SHEET VALIDIERUNG (verschärft)
-    if cs_rates[0] > 50:
-        mu_a *= 0.70
-    elif cs_rates[0] > 40:
-        mu_a *= 0.80
-    elif cs_rates[0] > 30:
-        mu_a *= 0.85
-
-    if cs_rates[1] > 50:
-        mu_h *= 0.70
-    elif cs_rates[1] > 40:
-        mu_h *= 0.80
-    elif cs_rates[1] > 30:
-        mu_h *= 0.85
+    mu_a = mu_a * _clean_sheet_factor(arr["cs_h"])
+    mu_h = mu_h * _clean_sheet_factor(arr["cs_a"])
 
     # 10. TKI-BOOST
     mu_h = mu_h * (1 + (tki_a * 0.4))
     mu_a = mu_a * (1 + (tki_h * 0.4))
 
     # 11. CONVERSION-RATE ADJUSTMENT
-    def apply_conversion_adjustment(mu, conversion_rate):
-        if conversion_rate > 14:
-            return mu * 1.10
-        elif conversion_rate < 8:
-            return mu * 0.90
-        return mu
+    mu_h = mu_h * _conversion_factor(arr["conv_h"])
+    mu_a = mu_a * _conversion_factor(arr["conv_a"])
+
+    return {
+        "mu_h": mu_h,
+        "mu_a": mu_a,
+        "tki_h": tki_h,
+        "tki_a": tki_a,
+        "form_factor_h": form_factor_h,
+        "form_factor_a": form_factor_a,
+        "ppg_diff": ppg_diff,
+    }
 
-    mu_h = apply_conversion_adjustment(mu_h, conv_rate[0])
-    mu_a = apply_conversion_adjustment(mu_a, conv_rate[1])
 
-    # ML-Korrektur (Phase 3) - NACH allen v4.9 Anpassungen
-    ml_info = {"applied": False, "reason": "ML-Modell nicht initialisiert"}
+def _apply_ml_correction(
+    match: MatchData, mu_h: float, mu_a: float, pos_model, ml_correction: Optional[Dict] = None
+):
+    """
+    ML-Korrektur (Phase 3) - NACH allen v4.9 Anpassungen
 
-    # NEU:
-    _pos_model = _safe_get_session("position_ml_model")
-    if (
-        _pos_model
-        and _pos_model.is_trained
-    ):
-        ml_correction = _pos_model.predict_correction(
-            home_team=match.home_team, away_team=match.away_team, match_date=match.date
-        )
+    Args:
+        ml_correction: bereits berechnete Vorhersage (pos_model.predict_corrections),
+            sonst wird predict_correction für dieses Match aufgerufen
 
+    Returns:
+        (mu_h, mu_a, ml_info)
+    """
+    ml_info = {"applied": False, "reason": "ML-Modell nicht initialisiert"}
+
+    if pos_model and pos_model.is_trained:
+        if ml_correction is None:
+            ml_correction = pos_model.predict_correction(
+                home_team=match.home_team, away_team=match.away_team, match_date=match.date
+            )
         if ml_correction["is_trained"] and ml_correction["confidence"] > 0.3:
             mu_h_original = mu_h
             mu_a_original = mu_a
@@ -211,60 +204,51 @@ def analyze_match_v47_ml(match: MatchData) -> Dict:
                 "confidence": ml_correction["confidence"],
             }
 
-    # 12. POISSON MATRIX
-    wh, dr, wa, ov25, btts_p = 0.0, 0.0, 0.0, 0.0, 0.0
-    max_p, score = 0.0, (0, 0)
-    scoreline_probs = []  # sammle Poisson-Scoreline-Wahrscheinlichkeiten
-
-    for i in range(9):
-        for j in range(9):
-            p = poisson_probability(mu_h, i) * poisson_probability(mu_a, j)
-            scoreline_probs.append((i, j, p))
-            if i > j:
-                wh += p
-            elif i == j:
-                dr += p
-            else:
-                wa += p
-            if (i + j) > 2.5:
-                ov25 += p
-            if i > 0 and j > 0:
-                btts_p += p
-            if p > max_p:
-                max_p, score = p, (i, j)
+    return mu_h, mu_a, ml_info
 
 
-    # Top-Scorelines für UI/Export (damit predicted_score bei starken OU/BTTS-Signalen konsistent gewählt werden kann)
-    scoreline_probs.sort(key=lambda x: x[2], reverse=True)
-    top_scorelines = [(f"{i}-{j}", round(p * 100, 2)) for i, j, p in scoreline_probs[:20]]
+def _finalize_analysis(
+    match: MatchData,
+    stage: Dict[str, float],
+    ml_info: Dict,
+    matrix: np.ndarray,
+    markets: Dict[str, float],
+    score: Tuple[int, int],
+) -> Dict:
+    """
+    Zweiter Teil der Analyse für EIN Match: BTTS-Filter, Risiko-Scores und
+    Ergebnis-Dictionary.
 
-    # KONSISTENZ-FIX: predicted_score darf nicht dem 1X2-Tipp widersprechen.
-    # score/max_p oben ist das globale Maximum über ALLE Zellen - das kann eine
-    # andere Ergebnis-Kategorie (Heimsieg/Remis/Auswärtssieg) sein als der
-    # tatsächliche 1X2-Tipp (der aus der SUMME wh/dr/wa gebildet wird).
-    # Deshalb hier: unter den Zellen, die zur Tipp-Kategorie passen, die
-    # wahrscheinlichste nehmen - garantiert konsistent mit dem 1X2-Tipp.
-    if wh >= dr and wh >= wa:
-        tipp_kategorie = "home"
-    elif wa >= wh and wa >= dr:
-        tipp_kategorie = "away"
-    else:
-        tipp_kategorie = "draw"
-
-    consistent_max_p, consistent_score = 0.0, score
-    for i, j, p in scoreline_probs:
-        if tipp_kategorie == "home" and i > j:
-            passt = True
-        elif tipp_kategorie == "away" and i < j:
-            passt = True
-        elif tipp_kategorie == "draw" and i == j:
-            passt = True
-        else:
-            passt = False
-        if passt and p > consistent_max_p:
-            consistent_max_p, consistent_score = p, (i, j)
+    Args:
+        match: MatchData Objekt
+        stage: Skalare Werte eines Matches aus _smart_precision_mu()
+            (mu bereits inkl. ML-Korrektur)
+        ml_info: Info-Dictionary der ML-Korrektur
+        matrix: Poisson-Ergebnismatrix (N x N) des Matches
+        markets: Markt-Wahrscheinlichkeiten (0-1) aus market_probabilities()
+        score: Zum 1X2-Tipp konsistentes Ergebnis (Heim, Auswärts)
+    """
+    mu_h = stage["mu_h"]
+    mu_a = stage["mu_a"]
+    tki_h = stage["tki_h"]
+    tki_a = stage["tki_a"]
+    tki_combined = tki_h + tki_a
+    form_factor_h = stage["form_factor_h"]
+    form_factor_a = stage["form_factor_a"]
+    ppg_diff = stage["ppg_diff"]
+    form_ppg_h = stage["form_ppg_h"]
+    form_ppg_a = stage["form_ppg_a"]
+    fts_h = stage["fts_h"]
+    fts_a = stage["fts_a"]
+
+    wh = markets["home_win"]
+    dr = markets["draw"]
+    wa = markets["away_win"]
+    ov25 = markets["over_25"]
+    btts_p = markets["btts_yes"]
 
-    score = consistent_score
+    # Top-Scorelines für UI/Export (damit predicted_score bei starken OU/BTTS-Signalen konsistent gewählt werden kann)
+    top_scorelines = score_top_scorelines(matrix, 20)
 
     # 13. BTTS-PRÄZISIONS-FILTER v4.9
     if mu_h < 1.0 or mu_a < 1.0:
@@ -343,6 +327,7 @@ def analyze_match_v47_ml(match: MatchData) -> Dict:
             "btts_no": round((1 - btts_p) * 100, 1),
         },
         "scorelines": top_scorelines,
+        "score_matrix": matrix,
         "predicted_score": f"{score[0]}-{score[1]}",
         "risk_score": risk_score,
         "extended_risk": extended_risk,
@@ -354,11 +339,11 @@ def analyze_match_v47_ml(match: MatchData) -> Dict:
         },
     }
 
-    # Versuche zu speichern (optional - import wird später hinzugefügt)
+    # Speichern im Hintergrund (Write-Behind-Queue, gebündeltes append)
     try:
-        from models.tracking import save_prediction_to_sheets
+        from models.prediction_queue import enqueue_prediction
 
-        save_prediction_to_sheets(
+        enqueue_prediction(
             match_info=result["match_info"],
             probabilities=result["probabilities"],
             odds=result["odds"],
@@ -372,6 +357,173 @@ def analyze_match_v47_ml(match: MatchData) -> Dict:
     return result
 
 
+
+def analyze_match_v47_ml(match: MatchData, use_cache: bool = True) -> Dict:
+    """
+    v6.0 mit v4.9 SMART-PRECISION LOGIK + ML-Korrekturen
+
+    NEU von v4.9:
+    - Form-Faktoren Integration
+    - TKI-Krise deaktiviert BTTS-Dominanz-Killer
+    - FTS-Check nur bei PPG > 1.0 (nicht 0.5)
+    - Form-Boost bei starker Defensive reduziert
+    - TKI-Krise überschreibt Form-Malus
+    - Strengere Dominanz-Dämpfer
+    - Auswärts-Underdog Boost
+    - Verschärfte Clean Sheet Validierung
+    - Conversion-Rate Adjustment
+
+    Args:
+        match: MatchData Objekt mit allen Spiel-Informationen
+        use_cache: False erzwingt eine Neuberechnung (am ANALYSIS_CACHE vorbei)
+
+    Returns:
+        Dictionary mit vollständiger Analyse
+    """
+    return analyze_matches_batch([match], use_cache=use_cache)[0]
+
+
+def analyze_matches_batch(matches: List[MatchData], use_cache: bool = True) -> List[Dict]:
+    """
+    Analysiert alle Matches eines Spieltags in einem Durchgang.
+
+    Die SMART-PRECISION μ-Anpassungen (Form, TKI, Dominanz, Clean Sheet,
+    Conversion) laufen vektorisiert über alle Matches; ML-Korrektur,
+    Poisson-Matrix und Risiko-Scores danach pro Match.
+
+    Bereits analysierte Matches (gleiche MatchData, gleiches ML-/Tor-Modell)
+    kommen aus dem prozessweiten ANALYSIS_CACHE; nur die übrigen werden
+    berechnet (und gespeichert).
+
+    Args:
+        matches: Liste von MatchData Objekten
+        use_cache: False erzwingt eine Neuberechnung aller Matches
+
+    Returns:
+        Liste von Analyse-Dictionaries (gleiche Reihenfolge und gleiches
+        Format wie analyze_match_v47_ml)
+    """
+    if not matches:
+        return []
+
+    pos_model = _safe_get_session("position_ml_model")
+    goal_model = _safe_get_session("goal_model") or "poisson"
+    goal_model_params = _safe_get_session("goal_model_params")
+
+    if not use_cache:
+        return _analyze_uncached(matches, pos_model, goal_model, goal_model_params)
+
+    state_key = ml_state_key(pos_model, goal_model, goal_model_params)
+    keys = [match_data_key(match, state_key) for match in matches]
+    results: List[Optional[Dict]] = [ANALYSIS_CACHE.get(key) for key in keys]
+
+    # Fehlende Matches (Duplikate im selben Aufruf nur einmal) berechnen
+    missing: Dict[str, int] = {}
+    for idx, (key, result) in enumerate(zip(keys, results)):
+        if result is None and key not in missing:
+            missing[key] = idx
+
+    if missing:
+        computed = _analyze_uncached(
+            [matches[idx] for idx in missing.values()],
+            pos_model,
+            goal_model,
+            goal_model_params,
+        )
+        for key, result in zip(missing, computed):
+            ANALYSIS_CACHE.put(key, result)
+        by_key = dict(zip(missing, computed))
+        for idx, key in enumerate(keys):
+            if results[idx] is None:
+                result = by_key[key]
+                results[idx] = result if missing[key] == idx else copy.deepcopy(result)
+
+    return results
+
+
+def analyze_matches_isolated(
+    matches: List[MatchData], use_cache: bool = True
+) -> List[Tuple[Optional[Dict], Optional[Exception]]]:
+    """
+    Wie analyze_matches_batch, aber ein fehlerhaftes Match nimmt die übrigen
+    nicht mit: schlägt der Batch fehl, wird jedes Match einzeln analysiert.
+
+    Returns:
+        Liste (Ergebnis, Fehler) in Match-Reihenfolge - genau eines von
+        beiden ist None
+    """
+    try:
+        return [(result, None) for result in analyze_matches_batch(matches, use_cache)]
+    except Exception:
+        pass
+
+    results = []
+    for match in matches:
+        try:
+            results.append((analyze_matches_batch([match], use_cache)[0], None))
+        except Exception as e:
+            results.append((None, e))
+    return results
+
+
+def _analyze_uncached(
+    matches: List[MatchData], pos_model, goal_model: str, goal_model_params
+) -> List[Dict]:
+    """Vollständige Batch-Analyse ohne Cache (siehe analyze_matches_batch)"""
+    arr = _pack_match_arrays(matches)
+    stage = _smart_precision_mu(arr)
+    stage["form_ppg_h"] = arr["form_ppg_h"]
+    stage["form_ppg_a"] = arr["form_ppg_a"]
+    stage["fts_h"] = arr["fts_h"]
+    stage["fts_a"] = arr["fts_a"]
+
+    # ML-Korrektur: Features und model.predict einmal für alle Matches
+    ml_corrections = [None] * len(matches)
+    if pos_model and pos_model.is_trained and hasattr(pos_model, "predict_corrections"):
+        ml_corrections = pos_model.predict_corrections(
+            [match.home_team for match in matches],
+            [match.away_team for match in matches],
+            [match.date for match in matches],
+        )
+
+    ml_infos = []
+    for idx, match in enumerate(matches):
+        mu_h, mu_a, ml_info = _apply_ml_correction(
+            match,
+            float(stage["mu_h"][idx]),
+            float(stage["mu_a"][idx]),
+            pos_model,
+            ml_corrections[idx],
+        )
+        stage["mu_h"][idx] = mu_h
+        stage["mu_a"][idx] = mu_a
+        ml_infos.append(ml_info)
+
+    # 12. ERGEBNIS-MATRIX - alle Matches als (M, N, N) Tensor
+    # (Tor-Modell aus dem Session State, Standard: unabhängiges Poisson)
+    matrices = goal_model_matrix(stage["mu_h"], stage["mu_a"], goal_model, goal_model_params)
+    markets = market_probabilities(matrices)
+
+    # KONSISTENZ-FIX: predicted_score darf nicht dem 1X2-Tipp widersprechen.
+    # Das globale Maximum über ALLE Zellen kann eine andere Ergebnis-Kategorie
+    # (Heimsieg/Remis/Auswärtssieg) sein als der tatsächliche 1X2-Tipp (der
+    # aus der SUMME wh/dr/wa gebildet wird). Deshalb: unter den Zellen, die
+    # zur Tipp-Kategorie passen, die wahrscheinlichste nehmen.
+    score_h, score_a = consistent_scoreline(matrices, markets)
+
+    results = []
+    for idx, match in enumerate(matches):
+        match_stage = {key: float(values[idx]) for key, values in stage.items()}
+        match_markets = {key: float(values[idx]) for key, values in markets.items()}
+        score = (int(score_h[idx]), int(score_a[idx]))
+        results.append(
+            _finalize_analysis(
+                match, match_stage, ml_infos[idx], matrices[idx], match_markets, score
+            )
+        )
+    return results
+
+
 def analyze_match_with_extended_data(
     match: MatchData, extended_data: Optional[ExtendedMatchData] = None
 ):
@@ -392,20 +544,13 @@ def analyze_match_with_extended_data(
         and st.session_state.get("extended_ml_model")
         and st.session_state.extended_ml_model.is_trained
     ):
-        from ml.features import create_position_features, create_extended_features
-
-        position_features = create_position_features(
-            match.home_team, match.away_team, match.date
-        )
-
-        extended_features = create_extended_features(
-            extended_data,
-            {"actual_score": f"{result['mu']['home']:.0f}:{result['mu']['away']:.0f}"},
-        )
-
         extended_ml = st.session_state.extended_ml_model
-        extended_correction = extended_ml.predict_with_extended_data(
-            position_features, extended_features
+        extended_correction = extended_ml.predict_with_match_data(
+            match.home_team,
+            match.away_team,
+            match.date,
+            extended_data,
+            actual_score=f"{result['mu']['home']:.0f}:{result['mu']['away']:.0f}",
         )
 
         if extended_correction.get("confidence", 0) > 0.3:
@@ -0,0 +1,130 @@
+"""
+Poisson-Ergebnismatrix (Score-Matrix)
+
+Baut die Wahrscheinlichkeitsmatrix P(Heim = i, Auswärts = j) als äußeres
+Produkt zweier Poisson-PMF-Vektoren und leitet daraus die Märkte
+(1X2, Über/Unter 2.5, BTTS) per Masken-Summe ab.
+
+Alle Funktionen arbeiten sowohl für ein einzelnes Match (Matrix N x N) als
+auch für viele Matches gleichzeitig (Tensor M x N x N): die führenden
+Achsen werden einfach mitgeführt.
+"""
+
+from functools import lru_cache
+from typing import Dict, Tuple
+
+import numpy as np
+
+from utils.math_helpers import poisson_pmf_array
+
+# 0..8 Tore pro Team -> 9x9 Matrix (wie bisher in analyze_match_v47_ml)
+DEFAULT_MAX_GOALS = 8
+
+
+@lru_cache(maxsize=8)
+def _masks(max_goals: int) -> Dict[str, np.ndarray]:
+    """Boolesche Masken (N x N) für die Markt-Kategorien"""
+    i, j = np.indices((max_goals + 1, max_goals + 1))
+    return {
+        "home": i > j,
+        "draw": i == j,
+        "away": i < j,
+        "over_25": (i + j) > 2.5,
+        "btts": (i > 0) & (j > 0),
+    }
+
+
+def poisson_pmf_vector(mu, max_goals: int = DEFAULT_MAX_GOALS) -> np.ndarray:
+    """
+    Poisson-PMF für k = 0..max_goals (vektorisiert, vorberechnete Fakultäten)
+
+    Args:
+        mu: Erwartete Tore (Skalar oder Array beliebiger Form)
+        max_goals: Höchste betrachtete Toranzahl
+
+    Returns:
+        Array der Form (*mu.shape, max_goals + 1)
+    """
+    return poisson_pmf_array(mu, max_goals)
+
+
+def score_matrix(mu_home, mu_away, max_goals: int = DEFAULT_MAX_GOALS) -> np.ndarray:
+    """
+    Ergebnismatrix als äußeres Produkt der beiden PMF-Vektoren
+
+    Args:
+        mu_home: Erwartete Tore Heim (Skalar oder Array der Länge M)
+        mu_away: Erwartete Tore Auswärts (gleiche Form wie mu_home)
+        max_goals: Höchste betrachtete Toranzahl pro Team
+
+    Returns:
+        (N, N) bzw. (M, N, N) Array mit P(Heim = i, Auswärts = j)
+    """
+    pmf_h = poisson_pmf_vector(mu_home, max_goals)
+    pmf_a = poisson_pmf_vector(mu_away, max_goals)
+    return pmf_h[..., :, None] * pmf_a[..., None, :]
+
+
+def market_probabilities(matrix: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Markt-Wahrscheinlichkeiten (0-1) per Masken-Summe über die Matrix
+
+    Returns:
+        Dictionary mit home_win, draw, away_win, over_25, btts_yes
+        (Skalar-Arrays bei einer Matrix, Länge M bei einem Tensor)
+    """
+    masks = _masks(matrix.shape[-1] - 1)
+    return {
+        "home_win": np.sum(matrix, axis=(-2, -1), where=masks["home"]),
+        "draw": np.sum(matrix, axis=(-2, -1), where=masks["draw"]),
+        "away_win": np.sum(matrix, axis=(-2, -1), where=masks["away"]),
+        "over_25": np.sum(matrix, axis=(-2, -1), where=masks["over_25"]),
+        "btts_yes": np.sum(matrix, axis=(-2, -1), where=masks["btts"]),
+    }
+
+
+def consistent_scoreline(
+    matrix: np.ndarray, markets: Dict[str, np.ndarray]
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Wahrscheinlichste Scoreline INNERHALB der 1X2-Tipp-Kategorie
+    (masked argmax), damit predicted_score nie dem 1X2-Tipp widerspricht.
+
+    Tipp-Kategorie wie bisher: Heim bei Gleichstand mit Remis/Auswärts
+    bevorzugt, danach Auswärts, sonst Remis. Hat die Kategorie keine Zelle
+    mit p > 0, wird das globale Maximum genommen.
+
+    Returns:
+        (home_goals, away_goals) als Integer-Arrays
+    """
+    n = matrix.shape[-1]
+    masks = _masks(n - 1)
+    wh, dr, wa = markets["home_win"], markets["draw"], markets["away_win"]
+
+    is_home = (wh >= dr) & (wh >= wa)
+    is_away = ~is_home & (wa >= wh) & (wa >= dr)
+    is_home = np.asarray(is_home)[..., None, None]
+    is_away = np.asarray(is_away)[..., None, None]
+    tip_mask = np.where(
+        is_home, masks["home"], np.where(is_away, masks["away"], masks["draw"])
+    )
+
+    flat = matrix.reshape(matrix.shape[:-2] + (n * n,))
+    masked = np.where(tip_mask, matrix, 0.0).reshape(flat.shape)
+    best = np.argmax(masked, axis=-1)
+    has_cell = np.take_along_axis(masked, best[..., None], axis=-1)[..., 0] > 0
+    best = np.where(has_cell, best, np.argmax(flat, axis=-1))
+    return best // n, best % n
+
+
+def top_scorelines(matrix: np.ndarray, top_n: int = 20):
+    """
+    Die top_n wahrscheinlichsten Scorelines einer (N x N) Matrix
+
+    Returns:
+        Liste von ("i-j", Wahrscheinlichkeit in %) absteigend sortiert
+    """
+    n = matrix.shape[-1]
+    flat = matrix.ravel()
+    order = np.argsort(-flat, kind="stable")[:top_n]
+    return [(f"{idx // n}-{idx % n}", round(float(flat[idx]) * 100, 2)) for idx in order]
@@ -2,8 +2,8 @@
 Monte-Carlo-Spielsimulation
 
 Simuliert ein Spiel N-mal auf Basis der bereits berechneten μ-Werte
-(erwartete Tore Heim/Auswärts aus SMART-PRECISION oder einem späteren
-Dixon-Coles-Modell) und liefert empirische Wahrscheinlichkeiten für
+(erwartete Tore Heim/Auswärts aus SMART-PRECISION) und einem Tor-Modell
+aus analysis.goal_models (Poisson, Dixon-Coles, ...) und liefert empirische Wahrscheinlichkeiten für
 1X2, Über/Unter 2.5, BTTS sowie die häufigsten Ergebnisse.
 
 Bewusst getrennt von match_analysis.py gehalten: die Simulation nimmt
@@ -12,7 +12,89 @@ Modell diese Werte liefert.
 """
 
 import numpy as np
-from typing import Dict, Optional
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from analysis.goal_models import cached_goal_model_matrix
+from analysis.score_matrix import (
+    market_probabilities,
+    top_scorelines as score_top_scorelines,
+)
+
+
+# Scoreline-Histogramm: Tore je Team werden bei SCORE_HIST_SIZE - 1 gekappt
+# (nur für die Ergebnis-Häufigkeiten, Märkte zählen die echten Ziehungen)
+SCORE_HIST_SIZE = 16
+
+# engine="auto": höchstens so viel Wahrscheinlichkeit darf außerhalb der
+# exakten Ergebnismatrix liegen, sonst wird simuliert
+AUTO_MAX_TAIL_MASS = 1e-6
+
+# Standard-Blockgröße: begrenzt den Speicher pro Aufruf unabhängig von n_sims
+DEFAULT_CHUNK_SIZE = 250_000
+
+# Markt-Definitionen auf simulierten Toren (für Kombi-Wetten / Legs)
+MARKETS = {
+    "home_win": lambda h, a: h > a,
+    "draw": lambda h, a: h == a,
+    "away_win": lambda h, a: h < a,
+    "over_25": lambda h, a: (h + a) > 2.5,
+    "under_25": lambda h, a: (h + a) < 2.5,
+    "btts_yes": lambda h, a: (h > 0) & (a > 0),
+    "btts_no": lambda h, a: (h == 0) | (a == 0),
+}
+
+# Direkt ausgezählte Märkte; away_win, under_25 und btts_no sind Gegenereignisse
+_BASE_MARKETS = ("home_win", "draw", "over_25", "btts_yes")
+
+
+def _ci95(p: float, n: int) -> float:
+    """Halbe Breite des 95%-Konfidenzintervalls (Normalapprox. der Binomialverteilung)."""
+    return 1.96 * ((p * (1 - p)) / n) ** 0.5
+
+
+def _exact_match_markets(
+    mu_home: float,
+    mu_away: float,
+    matrix: np.ndarray,
+    top_n_scorelines: int,
+) -> Dict:
+    """
+    Exakte Märkte aus der Ergebnismatrix des Tor-Modells im selben Format
+    wie die Simulation (n_sims 0, Konfidenzintervalle 0, Ø-Tore = μ; alle
+    Tor-Modelle erhalten die Randerwartungswerte).
+    """
+    markets = {m: float(p) for m, p in market_probabilities(matrix).items()}
+    over25 = markets["over_25"]
+    btts_yes = markets["btts_yes"]
+
+    return {
+        "n_sims": 0,
+        "engine": "exact",
+        "mu_home": mu_home,
+        "mu_away": mu_away,
+        "probabilities": {
+            "home_win": round(markets["home_win"] * 100, 1),
+            "draw": round(markets["draw"] * 100, 1),
+            "away_win": round(markets["away_win"] * 100, 1),
+            "over_25": round(over25 * 100, 1),
+            "under_25": round((1.0 - over25) * 100, 1),
+            "btts_yes": round(btts_yes * 100, 1),
+            "btts_no": round((1.0 - btts_yes) * 100, 1),
+        },
+        "confidence_95": {
+            "home_win": 0.0,
+            "draw": 0.0,
+            "away_win": 0.0,
+            "over_25": 0.0,
+            "btts_yes": 0.0,
+        },
+        "avg_goals": {
+            "home": round(max(mu_home, 0.0), 2),
+            "away": round(max(mu_away, 0.0), 2),
+            "total": round(max(mu_home, 0.0) + max(mu_away, 0.0), 2),
+        },
+        "top_scorelines": score_top_scorelines(matrix, top_n_scorelines),
+    }
 
 
 def simulate_match(
@@ -21,9 +103,20 @@ def simulate_match(
     n_sims: int = 10_000,
     seed: Optional[int] = None,
     top_n_scorelines: int = 10,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    target_ci: Optional[float] = None,
+    engine: str = "mc",
+    goal_model: str = "poisson",
+    model_params: Optional[Dict] = None,
 ) -> Dict:
     """
-    Simuliert ein Spiel n_sims-mal per Poisson-Ziehung.
+    Simuliert ein Spiel n_sims-mal per Poisson-Ziehung (bzw. Ziehung aus der
+    Ergebnismatrix des gewählten Tor-Modells).
+
+    Gezogen wird blockweise (chunk_size Spiele pro Block); pro Block werden
+    nur Zähler und ein festes Scoreline-Histogramm (np.bincount auf h*K+a)
+    fortgeschrieben. Der Speicherbedarf ist damit konstant in n_sims, auch
+    10 Mio. Durchläufe sind möglich.
 
     Args:
         mu_home: Erwartete Tore Heimteam (aus analyze_match_v47_ml -> result["mu"]["home"])
@@ -31,45 +124,112 @@ def simulate_match(
         n_sims: Anzahl Durchläufe (z.B. 1_000 / 10_000 / 100_000 / 1_000_000)
         seed: Optionaler Seed für Reproduzierbarkeit (None = zufällig)
         top_n_scorelines: Wie viele häufigste Ergebnisse zurückgegeben werden
+        chunk_size: Spiele pro Block
+        target_ci: Optionaler Frühabbruch: sobald die größte halbe Breite des
+            95%-Konfidenzintervalls (in Prozentpunkten) darunter liegt, wird
+            nach dem aktuellen Block gestoppt. n_sims ist dann die Obergrenze.
+        engine: "mc" = Monte-Carlo-Ziehung, "exact" = analytisch aus der
+            Ergebnismatrix des Tor-Modells (0..SCORE_HIST_SIZE-1 Tore je Team;
+            n_sims, seed, chunk_size und target_ci werden ignoriert,
+            Konfidenzintervalle = 0), "auto" = exakt, außer die Matrix
+            verliert beim unabhängigen Poisson mehr als AUTO_MAX_TAIL_MASS
+            Wahrscheinlichkeit an höhere Ergebnisse (sehr große μ) - dann
+            Monte-Carlo, das die vollständige Verteilung zieht. Die übrigen
+            Tor-Modelle ziehen auch in Monte-Carlo aus derselben Matrix,
+            dort bleibt "auto" exakt.
+        goal_model: Tor-Modell aus analysis.goal_models.GOAL_MODELS
+        model_params: Parameter des Tor-Modells (z.B. {"rho": -0.1})
 
     Returns:
         Dictionary mit Wahrscheinlichkeiten, Konfidenzintervallen (95%) und
-        den häufigsten simulierten Ergebnissen.
+        den häufigsten simulierten Ergebnissen. "n_sims" enthält die
+        tatsächlich simulierten Spiele (0 bei exakter Berechnung), "engine"
+        die genutzte Methode.
     """
+    if engine not in ("mc", "exact", "auto"):
+        raise ValueError(f"Unbekannte engine: {engine}")
     if n_sims <= 0:
         raise ValueError("n_sims muss > 0 sein")
+    if chunk_size <= 0:
+        raise ValueError("chunk_size muss > 0 sein")
+
+    if engine in ("exact", "auto"):
+        matrix = cached_goal_model_matrix(
+            max(mu_home, 0.0), max(mu_away, 0.0), goal_model, model_params, SCORE_HIST_SIZE - 1
+        )
+        tail_mass = 1.0 - float(matrix.sum())
+        if engine == "exact" or goal_model != "poisson" or tail_mass <= AUTO_MAX_TAIL_MASS:
+            return _exact_match_markets(mu_home, mu_away, matrix, top_n_scorelines)
 
     rng = np.random.default_rng(seed)
+    mu_h = max(mu_home, 0.0)
+    mu_a = max(mu_away, 0.0)
+
+    k = SCORE_HIST_SIZE
+    # Nicht-Poisson-Modelle: Ziehung der Scoreline-Codes aus der Matrix
+    cell_cdf = None
+    if goal_model != "poisson":
+        matrix = cached_goal_model_matrix(mu_h, mu_a, goal_model, model_params, k - 1)
+        cell_cdf = np.cumsum(matrix.ravel())
+        cell_cdf /= cell_cdf[-1]
+
+    score_hist = np.zeros(k * k, dtype=np.int64)
+    n_home_win = n_draw = n_away_win = n_over25 = n_btts = 0
+    sum_home = sum_away = 0
+    done = 0
+
+    while done < n_sims:
+        size = min(chunk_size, n_sims - done)
 
-    # Vektorisierte Poisson-Ziehung -- auch bei 1 Mio. Durchläufen < 1s
-    home_goals = rng.poisson(max(mu_home, 0.0), n_sims)
-    away_goals = rng.poisson(max(mu_away, 0.0), n_sims)
+        # Vektorisierte Poisson-Ziehung pro Block
+        if cell_cdf is None:
+            home_goals = rng.poisson(mu_h, size)
+            away_goals = rng.poisson(mu_a, size)
+        else:
+            cells = np.searchsorted(cell_cdf, rng.random(size), side="right")
+            cells = np.minimum(cells, k * k - 1)
+            home_goals, away_goals = np.divmod(cells, k)
 
-    total_goals = home_goals + away_goals
+        n_home_win += int(np.count_nonzero(home_goals > away_goals))
+        n_draw += int(np.count_nonzero(home_goals == away_goals))
+        n_away_win += int(np.count_nonzero(home_goals < away_goals))
+        n_over25 += int(np.count_nonzero(home_goals + away_goals > 2.5))
+        n_btts += int(np.count_nonzero((home_goals > 0) & (away_goals > 0)))
+        sum_home += int(home_goals.sum())
+        sum_away += int(away_goals.sum())
 
-    home_win = float(np.mean(home_goals > away_goals))
-    draw = float(np.mean(home_goals == away_goals))
-    away_win = float(np.mean(home_goals < away_goals))
-    over25 = float(np.mean(total_goals > 2.5))
+        # Häufigste Ergebnisse: festes Histogramm statt np.unique über alle Paare
+        codes = np.minimum(home_goals, k - 1) * k + np.minimum(away_goals, k - 1)
+        score_hist += np.bincount(codes, minlength=k * k)
+
+        done += size
+
+        if target_ci is not None and done < n_sims:
+            widest = max(
+                _ci95(c / done, done)
+                for c in (n_home_win, n_draw, n_away_win, n_over25, n_btts)
+            )
+            if widest * 100 <= target_ci:
+                break
+
+    home_win = n_home_win / done
+    draw = n_draw / done
+    away_win = n_away_win / done
+    over25 = n_over25 / done
     under25 = 1.0 - over25
-    btts_yes = float(np.mean((home_goals > 0) & (away_goals > 0)))
+    btts_yes = n_btts / done
     btts_no = 1.0 - btts_yes
 
-    def _ci95(p: float) -> float:
-        """Halbe Breite des 95%-Konfidenzintervalls (Normalapprox. der Binomialverteilung)."""
-        return 1.96 * ((p * (1 - p)) / n_sims) ** 0.5
-
-    # Häufigste Ergebnisse (vektorisiert statt Counter -> deutlich schneller bei großem n_sims)
-    scorelines = np.stack([home_goals, away_goals], axis=1)
-    unique_scores, counts = np.unique(scorelines, axis=0, return_counts=True)
-    order = np.argsort(-counts)[:top_n_scorelines]
+    order = np.argsort(-score_hist, kind="stable")[:top_n_scorelines]
     top_scorelines = [
-        (f"{unique_scores[i][0]}-{unique_scores[i][1]}", round(float(counts[i]) / n_sims * 100, 2))
-        for i in order
+        (f"{code // k}-{code % k}", round(float(score_hist[code]) / done * 100, 2))
+        for code in order
+        if score_hist[code] > 0
     ]
 
     return {
-        "n_sims": n_sims,
+        "n_sims": done,
+        "engine": "mc",
         "mu_home": mu_home,
         "mu_away": mu_away,
         "probabilities": {
@@ -82,16 +242,164 @@ def simulate_match(
             "btts_no": round(btts_no * 100, 1),
         },
         "confidence_95": {
-            "home_win": round(_ci95(home_win) * 100, 2),
-            "draw": round(_ci95(draw) * 100, 2),
-            "away_win": round(_ci95(away_win) * 100, 2),
-            "over_25": round(_ci95(over25) * 100, 2),
-            "btts_yes": round(_ci95(btts_yes) * 100, 2),
+            "home_win": round(_ci95(home_win, done) * 100, 2),
+            "draw": round(_ci95(draw, done) * 100, 2),
+            "away_win": round(_ci95(away_win, done) * 100, 2),
+            "over_25": round(_ci95(over25, done) * 100, 2),
+            "btts_yes": round(_ci95(btts_yes, done) * 100, 2),
         },
         "avg_goals": {
-            "home": round(float(home_goals.mean()), 2),
-            "away": round(float(away_goals.mean()), 2),
-            "total": round(float(total_goals.mean()), 2),
+            "home": round(sum_home / done, 2),
+            "away": round(sum_away / done, 2),
+            "total": round((sum_home + sum_away) / done, 2),
         },
         "top_scorelines": top_scorelines,
     }
+
+
+def simulate_matches(
+    mu_home: Sequence[float],
+    mu_away: Sequence[float],
+    n_sims: int = 10_000,
+    seed: Optional[int] = None,
+    combinations: Optional[List[List[Tuple[int, str]]]] = None,
+    top_n_scorelines: int = 5,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Dict:
+    """
+    Simuliert mehrere Spiele gemeinsam: pro Block wird ein
+    (Durchläufe x Spiele) Poisson-Tensor gezogen, sodass jede Zeile ein
+    kompletter Spieltag ist. Damit lassen sich neben den Einzelmärkten
+    auch Kombi-Wetten (mehrere Legs) direkt auszählen.
+
+    Args:
+        mu_home: Erwartete Tore Heim pro Spiel
+        mu_away: Erwartete Tore Auswärts pro Spiel (gleiche Länge)
+        n_sims: Anzahl Durchläufe
+        seed: Optionaler Seed für Reproduzierbarkeit
+        combinations: Liste von Kombis; jede Kombi ist eine Liste von Legs
+            (Spiel-Index, Markt), Markt aus MARKETS, z.B.
+            [[(0, "home_win"), (1, "over_25"), (2, "btts_yes")]]
+        top_n_scorelines: Häufigste Ergebnisse pro Spiel
+        chunk_size: Durchläufe pro Block (begrenzt den Speicher)
+
+    Returns:
+        Dictionary mit "matches" (ein Eintrag pro Spiel im Format von
+        simulate_match) und "combinations" (gemeinsame Wahrscheinlichkeit,
+        Produkt der Einzelwahrscheinlichkeiten und 95%-KI pro Kombi)
+    """
+    mu_h = np.maximum(np.asarray(mu_home, dtype=float), 0.0)
+    mu_a = np.maximum(np.asarray(mu_away, dtype=float), 0.0)
+    if mu_h.ndim != 1 or mu_h.shape != mu_a.shape:
+        raise ValueError("mu_home und mu_away müssen gleich lange Listen sein")
+    if n_sims <= 0:
+        raise ValueError("n_sims muss > 0 sein")
+    if chunk_size <= 0:
+        raise ValueError("chunk_size muss > 0 sein")
+
+    combinations = combinations or []
+    n_matches = len(mu_h)
+    for combo in combinations:
+        for match_idx, market in combo:
+            if market not in MARKETS:
+                raise ValueError(f"Unbekannter Markt: {market}")
+            if not 0 <= match_idx < n_matches:
+                raise ValueError(f"Ungültiger Spiel-Index: {match_idx}")
+
+    rng = np.random.default_rng(seed)
+    # Zeilen pro Block so wählen, dass der Tensor ~chunk_size Zellen hat
+    rows = max(1, chunk_size // max(n_matches, 1))
+
+    k = SCORE_HIST_SIZE
+    market_counts = {m: np.zeros(n_matches, dtype=np.int64) for m in MARKETS}
+    combo_counts = np.zeros(len(combinations), dtype=np.int64)
+    score_hist = np.zeros(n_matches * k * k, dtype=np.int64)
+    sum_home = np.zeros(n_matches, dtype=np.int64)
+    sum_away = np.zeros(n_matches, dtype=np.int64)
+    offsets = np.arange(n_matches) * (k * k)
+    done = 0
+
+    while done < n_sims:
+        size = min(rows, n_sims - done)
+
+        home_goals = rng.poisson(mu_h, (size, n_matches))
+        away_goals = rng.poisson(mu_a, (size, n_matches))
+
+        # Nur die Basis-Märkte auszählen, Gegenereignisse per Differenz
+        outcomes = {m: MARKETS[m](home_goals, away_goals) for m in _BASE_MARKETS}
+        for m in _BASE_MARKETS:
+            market_counts[m] += np.count_nonzero(outcomes[m], axis=0)
+
+        for c, combo in enumerate(combinations):
+            joint = np.ones(size, dtype=bool)
+            for match_idx, market in combo:
+                if market not in outcomes:
+                    outcomes[market] = MARKETS[market](home_goals, away_goals)
+                joint &= outcomes[market][:, match_idx]
+            combo_counts[c] += int(np.count_nonzero(joint))
+
+        sum_home += home_goals.sum(axis=0)
+        sum_away += away_goals.sum(axis=0)
+
+        codes = np.minimum(home_goals, k - 1) * k + np.minimum(away_goals, k - 1)
+        score_hist += np.bincount(
+            (codes + offsets).ravel(), minlength=n_matches * k * k
+        )
+
+        done += size
+
+    market_counts["away_win"] = done - market_counts["home_win"] - market_counts["draw"]
+    market_counts["under_25"] = done - market_counts["over_25"]
+    market_counts["btts_no"] = done - market_counts["btts_yes"]
+    probs = {m: market_counts[m] / done for m in MARKETS}
+    hist = score_hist.reshape(n_matches, k * k)
+
+    matches = []
+    for i in range(n_matches):
+        order = np.argsort(-hist[i], kind="stable")[:top_n_scorelines]
+        matches.append(
+            {
+                "mu_home": float(mu_home[i]),
+                "mu_away": float(mu_away[i]),
+                "probabilities": {
+                    m: round(float(probs[m][i]) * 100, 1) for m in MARKETS
+                },
+                "confidence_95": {
+                    m: round(_ci95(float(probs[m][i]), done) * 100, 2)
+                    for m in ("home_win", "draw", "away_win", "over_25", "btts_yes")
+                },
+                "avg_goals": {
+                    "home": round(float(sum_home[i]) / done, 2),
+                    "away": round(float(sum_away[i]) / done, 2),
+                    "total": round(float(sum_home[i] + sum_away[i]) / done, 2),
+                },
+                "top_scorelines": [
+                    (f"{code // k}-{code % k}", round(float(hist[i][code]) / done * 100, 2))
+                    for code in order
+                    if hist[i][code] > 0
+                ],
+            }
+        )
+
+    combo_results = []
+    for c, combo in enumerate(combinations):
+        joint_p = float(combo_counts[c]) / done
+        independent_p = 1.0
+        for match_idx, market in combo:
+            independent_p *= float(probs[market][match_idx])
+        combo_results.append(
+            {
+                "legs": [(int(i), m) for i, m in combo],
+                "probability": round(joint_p * 100, 2),
+                "independent_probability": round(independent_p * 100, 2),
+                "confidence_95": round(_ci95(joint_p, done) * 100, 2),
+                "fair_odds": round(1 / joint_p, 2) if joint_p > 0 else None,
+            }
+        )
+
+    return {
+        "n_sims": done,
+        "n_matches": n_matches,
+        "matches": matches,
+        "combinations": combo_results,
+    }
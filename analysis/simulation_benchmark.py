@@ -0,0 +1,98 @@
+"""
+Prüf- und Benchmark-Skript für analysis.simulation.simulate_matches
+
+1. Plausibilität: bei Legs in verschiedenen Spielen (unabhängig) muss die
+   gemeinsame Wahrscheinlichkeit einer Kombi dem Produkt der exakten
+   Einzelwahrscheinlichkeiten aus simulate_match entsprechen.
+2. Laufzeit: ein gemeinsamer (Durchläufe x Spiele) Tensor gegenüber
+   simulate_match pro Spiel. Die Poisson-Ziehung dominiert in beiden
+   Fällen (gleich viele Ziehungen); der gemeinsame Tensor ist nicht
+   schneller, liefert aber die Kombi-Wahrscheinlichkeiten mit.
+
+Aufruf:
+    python -m analysis.simulation_benchmark [--sims N]
+"""
+
+import argparse
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from analysis.simulation import simulate_match, simulate_matches
+
+CHECKS = [
+    ([1.6, 1.1, 2.0], [0.9, 1.3, 0.7], [(0, "home_win"), (1, "over_25"), (2, "btts_yes")]),
+    ([1.2, 1.4], [1.2, 1.0], [(0, "draw"), (1, "under_25")]),
+    ([2.3, 0.8, 1.5, 1.1], [0.6, 1.7, 1.5, 1.0], [(0, "home_win"), (1, "away_win"), (3, "btts_no")]),
+]
+
+
+def check_combination_consistency(
+    mu_home: Sequence[float],
+    mu_away: Sequence[float],
+    combination: List[Tuple[int, str]],
+    n_sims: int = 200_000,
+    seed: Optional[int] = 0,
+) -> Dict:
+    """
+    Returns:
+        Dictionary mit joint, product (jeweils %), deviation und ci95
+        (Prozentpunkte) sowie ok (Abweichung innerhalb 3 halber KI-Breiten)
+    """
+    sim = simulate_matches(
+        mu_home, mu_away, n_sims=n_sims, seed=seed, combinations=[combination]
+    )
+    combo = sim["combinations"][0]
+
+    product = 1.0
+    for match_idx, market in combination:
+        exact = simulate_match(mu_home[match_idx], mu_away[match_idx], engine="exact")
+        product *= exact["probabilities"][market] / 100
+
+    deviation = abs(combo["probability"] - product * 100)
+    tolerance = 3 * max(combo["confidence_95"], 0.05) + 0.1  # + Rundung der Einzelwerte
+    return {
+        "joint": combo["probability"],
+        "product": round(product * 100, 2),
+        "deviation": round(deviation, 2),
+        "ci95": combo["confidence_95"],
+        "ok": deviation <= tolerance,
+    }
+
+
+def benchmark_matchday(n_matches: int = 9, n_sims: int = 100_000, seed: int = 0) -> Dict:
+    """Laufzeit simulate_matches (ein Aufruf) vs. simulate_match pro Spiel (ms)"""
+    rng = np.random.default_rng(seed)
+    mu_home = rng.uniform(0.6, 2.4, n_matches)
+    mu_away = rng.uniform(0.5, 2.0, n_matches)
+
+    start = time.perf_counter()
+    for h, a in zip(mu_home, mu_away):
+        simulate_match(float(h), float(a), n_sims=n_sims, seed=seed)
+    per_match = time.perf_counter() - start
+
+    start = time.perf_counter()
+    simulate_matches(mu_home, mu_away, n_sims=n_sims, seed=seed)
+    joint = time.perf_counter() - start
+    return {"per_match_ms": per_match * 1000, "joint_ms": joint * 1000}
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="simulate_matches check + benchmark")
+    arg_parser.add_argument("--sims", type=int, default=200_000)
+    args = arg_parser.parse_args()
+
+    for mu_h, mu_a, combo in CHECKS:
+        row = check_combination_consistency(mu_h, mu_a, combo, n_sims=args.sims)
+        status = "OK" if row["ok"] else "ABWEICHUNG"
+        print(
+            f"{status:<10} joint {row['joint']:6.2f}%  Produkt {row['product']:6.2f}%  "
+            f"Δ {row['deviation']:.2f} (KI ±{row['ci95']:.2f})  {combo}"
+        )
+
+    timing = benchmark_matchday(n_sims=args.sims)
+    print(
+        f"9 Spiele x {args.sims} Durchläufe: pro Spiel {timing['per_match_ms']:.1f} ms, "
+        f"gemeinsam {timing['joint_ms']:.1f} ms"
+    )
@@ -38,13 +38,20 @@ from config.settings import initialize_session_state
 from data import (
     list_daily_sheets_in_folder,
     list_match_tabs_for_day,
-    read_worksheet_text_by_id,
+    read_worksheet_grid_by_id,
+    read_worksheets_grid_by_id,
     parse_date,
     DataParser,
 )
+from data.google_sheets import (
+    BATCH_GET_MAX_RANGES,
+    prefetch_day_tabs,
+    refresh_sheet_caches,
+    spreadsheet_version,
+)
 
 # Analysis
-from analysis import validate_match_data, analyze_match_v47_ml
+from analysis import validate_match_data, analyze_match_v47_ml, analyze_matches_isolated
 
 # ML Predictions
 from ui.ml_predictions_ui import show_ml_predictions_tab
@@ -258,6 +265,11 @@ from ui import (
 
 # Navigator helpers
 from utils.match_index import build_match_index, get_flag_emoji
+from utils.match_search import (
+    DEFAULT_DAYS_AHEAD,
+    get_match_search_index,
+    refresh_match_search_index,
+)
 
 # ML
 from ml import TablePositionML
@@ -283,6 +295,13 @@ def main():
     except Exception:
         pass  # Bot-Fehler sollen die App nie blockieren
 
+    # ML-Models im Hintergrund vorladen (Import von xgboost/sklearn dauert)
+    try:
+        from ml.football_ml_models import get_ml_models
+        get_ml_models(warm_up=True)
+    except Exception:
+        pass
+
     # --- Export-Handler (läuft bei jedem Rerun) ---
     # Wichtig: Button-Klicks lösen immer einen Rerun aus. Damit Exporte auch ohne "Analyse erneut starten"
     # funktionieren, führen wir die Exporte hier aus – basierend auf dem zuletzt gespeicherten Analyse-Result.
@@ -344,7 +363,10 @@ def main():
     with col_refresh:
         if st.button("🔄 Aktualisieren"):
             st.session_state["_force_reanalyze"] = True
-            st.cache_data.clear()
+            # Nur Sheets-Caches neu validieren statt st.cache_data.clear():
+            # unveränderte Tages-Sheets kommen danach aus dem Disk-Cache
+            refresh_sheet_caches()
+            build_match_index.clear()
             st.rerun()
 
     # Lade Daily Sheets
@@ -407,9 +429,20 @@ def main():
 
     st.info(f"🎯 {len(match_tabs)} Matches verfügbar für {selected_date_str}")
 
+    # Alle Match-Tabs des Tages in wenigen batchGet-Aufrufen vorladen
+    # (Navigator, Einzel-/Bulk-Analyse, ML-Tab und Export lesen daraus)
+    with st.spinner("Lade Matches des Tages..."):
+        prefetch_day_tabs(sheet_id, tuple(match_tabs))
+
     # ================== MATCH NAVIGATOR INDEX (cached) ==================
     match_index = build_match_index(sheet_id, tuple(match_tabs))
 
+    # Tagesübergreifender Such-Index (Tag einhängen ist auf Reruns ein No-op)
+    search_index = get_match_search_index(folder_id)
+    search_index.ensure_day(
+        selected_date_str, sheet_id, spreadsheet_version(sheet_id), match_index
+    )
+
     # Sidebar (Navigator + Settings)
     today = date.today()
     today_str = today.strftime("%d.%m.%Y")
@@ -431,6 +464,7 @@ def main():
             "today": today,
             "today_count": today_count,
             "match_index": match_index,
+            "grouped": search_index.grouped_for_day(selected_date_str),
             "on_date_change": _on_date_change,
             "flag_fn": get_flag_emoji,
         }
@@ -481,12 +515,9 @@ def main():
         if view_mode == "league" and country_sel and league_sel:
             filtered = [m for m in match_index if (m.get("country")==country_sel and m.get("league")==league_sel)]
         elif view_mode == "search" and q:
-            def _hit(m):
-                hay = " ".join([
-                    str(m.get("home","")), str(m.get("away","")), str(m.get("country","")), str(m.get("league","")), str(m.get("competition","")), str(m.get("tab",""))
-                ]).lower()
-                return q in hay
-            filtered = [m for m in match_index if _hit(m)]
+            # Präfix-Suche über den invertierten Index (Team/Liga/Land/Tab)
+            hit_tabs = {m["tab"] for m in search_index.search(q, days=[selected_date_str])}
+            filtered = [m for m in match_index if m.get("tab") in hit_tabs]
         # else: all
         filtered_tabs = [m.get("tab") for m in filtered]
 
@@ -498,6 +529,34 @@ def main():
         subtitle = (" – ".join(title_bits)) if title_bits else "Alle Spiele"
         st.subheader(f"🧾 Spiele ({len(filtered)}) · {subtitle}")
 
+        if view_mode == "search" and q:
+            # Treffer der nächsten Tage (inkrementell aktualisierter Multi-Tages-Index)
+            refresh_match_search_index(folder_id, include_days=(selected_date_str,))
+            other_days = [
+                m
+                for m in search_index.search(
+                    q, start=today, end=today + timedelta(days=DEFAULT_DAYS_AHEAD)
+                )
+                if m["day"] != selected_date_str
+            ]
+            if other_days:
+                with st.expander(
+                    f"📆 {len(other_days)} Treffer in den nächsten {DEFAULT_DAYS_AHEAD} Tagen"
+                ):
+                    for m in other_days:
+                        col_m, col_go = st.columns([4, 1])
+                        with col_m:
+                            st.markdown(
+                                f"**{m['day']}** · {m.get('flag', '🌍')} "
+                                f"{m.get('home', '')} vs {m.get('away', '')}"
+                                f" · {m.get('league', '')}"
+                            )
+                        with col_go:
+                            if st.button("➡️", key=f"go::{m['spreadsheet_id']}::{m['tab']}"):
+                                _on_date_change(parse_date(m["day"]))
+                                st.session_state.selected_tab = m["tab"]
+                                st.rerun()
+
         if not filtered:
             st.warning("Keine Spiele für den aktuellen Filter gefunden.")
         else:
@@ -562,8 +621,10 @@ def main():
             if not selected_tab:
                 st.info("Bitte zuerst ein Match auswählen.")
             else:
-                match_text = read_worksheet_text_by_id(sheet_id, selected_tab)
-                if match_text:
+                # Gleiches Zellen-Raster wie die Analyse (ein Cache-Eintrag pro Tab)
+                match_grid = read_worksheet_grid_by_id(sheet_id, selected_tab)
+                if match_grid:
+                    match_text = "\n".join("\t".join(row) for row in match_grid)
                     st.text_area("Daten", match_text, height=300)
                 else:
                     st.error("Fehler beim Laden der Daten")
@@ -600,14 +661,14 @@ def main():
         # SINGLE MATCH ANALYSE
         if analyze_single or auto_analyze:
             with st.spinner(f"Analysiere {selected_tab}..."):
-                match_text = read_worksheet_text_by_id(sheet_id, selected_tab)
+                match_grid = read_worksheet_grid_by_id(sheet_id, selected_tab)
 
-                if not match_text:
+                if not match_grid:
                     st.error("❌ Fehler beim Laden der Match-Daten")
                 else:
                     parser = DataParser()
                     try:
-                        match_data = parser.parse(match_text)
+                        match_data = parser.parse_grid(match_grid)
 
                         is_valid, missing = validate_match_data(match_data)
 
@@ -650,7 +711,9 @@ def main():
                         ):
                             result = st.session_state.current_match_result[match_key]
                         else:
-                            result = analyze_match_v47_ml(match_data)
+                            result = analyze_match_v47_ml(
+                                match_data, use_cache=not force_reanalyze
+                            )
                             result = choose_consistent_predicted_score(result)
                             # Speichere sheet_id und tab für ML Predictions
                             result['_sheet_id'] = sheet_id
@@ -876,23 +939,45 @@ def main():
             status_text = st.empty()
 
             all_results = []
+            n_tabs = len(filtered_tabs)
+
+            # Pipeline blockweise: ein batchGet pro Block, Parsen, EIN
+            # Batch-Durchlauf der Analyse; Fortschritt nach jedem Block
+            for start in range(0, n_tabs, BATCH_GET_MAX_RANGES):
+                chunk = tuple(filtered_tabs[start : start + BATCH_GET_MAX_RANGES])
+                status_text.text(
+                    f"Lade {start + 1}-{start + len(chunk)}/{n_tabs} ..."
+                )
+                grids = read_worksheets_grid_by_id(sheet_id, chunk)
+
+                parsed_tabs = []
+                parsed_matches = []
+                for tab in chunk:
+                    match_grid = grids.get(tab)
+                    if match_grid:
+                        parser = DataParser()
+                        try:
+                            parsed_matches.append(parser.parse_grid(match_grid))
+                            parsed_tabs.append(tab)
+
+                        except Exception as e:
+                            st.warning(f"⚠️ Fehler bei {tab}: {str(e)}")
+
+                status_text.text(
+                    f"Analysiere {start + 1}-{start + len(chunk)}/{n_tabs} ..."
+                )
+                # Schlägt der Block fehl, wird Match für Match wiederholt -
+                # nur die wirklich fehlerhaften Tabs fallen weg
+                batch_results = analyze_matches_isolated(parsed_matches)
 
-            for i, tab in enumerate(filtered_tabs):
-                status_text.text(f"Analysiere {i + 1}/{len(filtered_tabs)}: {tab}")
-                progress_bar.progress((i + 1) / len(filtered_tabs))
-
-                match_text = read_worksheet_text_by_id(sheet_id, tab)
-
-                if match_text:
-                    parser = DataParser()
-                    try:
-                        match_data = parser.parse(match_text)
-                        result = analyze_match_v47_ml(match_data)
-                        result = choose_consistent_predicted_score(result)
-                        all_results.append({"tab": tab, "result": result})
+                for tab, (result, error) in zip(parsed_tabs, batch_results):
+                    if error is not None:
+                        st.warning(f"⚠️ Fehler bei {tab}: {str(error)}")
+                        continue
+                    result = choose_consistent_predicted_score(result)
+                    all_results.append({"tab": tab, "result": result})
 
-                    except Exception as e:
-                        st.warning(f"⚠️ Fehler bei {tab}: {str(e)}")
+                progress_bar.progress((start + len(chunk)) / n_tabs)
 
             status_text.text("✅ Analyse abgeschlossen!")
 
@@ -972,9 +1057,9 @@ def main():
                     ]
 
                     # Lade original MatchData nochmal
-                    match_text = read_worksheet_text_by_id(sheet_id, selected_tab)
+                    match_grid = read_worksheet_grid_by_id(sheet_id, selected_tab)
                     parser = DataParser()
-                    match_data = parser.parse(match_text)
+                    match_data = parser.parse_grid(match_grid)
 
                     if save_historical_directly(
                         match_data=match_data,
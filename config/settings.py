@@ -31,6 +31,13 @@ def initialize_session_state():
     if "extended_ml_model" not in st.session_state:
         st.session_state.extended_ml_model = None
 
+    # Tor-Modell für die Ergebnismatrix (analysis.goal_models)
+    if "goal_model" not in st.session_state:
+        st.session_state.goal_model = "poisson"
+
+    if "goal_model_params" not in st.session_state:
+        st.session_state.goal_model_params = None
+
     # Demo-Modus
     if "enable_demo_mode" not in st.session_state:
         st.session_state.enable_demo_mode = False
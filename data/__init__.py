@@ -2,7 +2,14 @@
 Daten-Modul für Sportwetten-Prognose App
 """
 
-from .models import TeamStats, H2HResult, MatchData, ExtendedMatchData
+from .models import (
+    TeamStats,
+    TeamStatsBatch,
+    TeamStatsRow,
+    H2HResult,
+    MatchData,
+    ExtendedMatchData,
+)
 from .parser import DataParser
 from .google_sheets import (
     connect_to_sheets,
@@ -15,12 +22,21 @@ from .google_sheets import (
     read_worksheet_data,
     get_all_worksheets_by_id,
     read_worksheet_text_by_id,
+    read_worksheet_grid_by_id,
+    read_worksheets_grid_by_id,
     get_tracking_sheet_id,
+    spreadsheet_version,
+    refresh_sheet_caches,
+    prefetch_day_tabs,
+    prefetched_tab_values,
 )
+from .sheets_cache import SheetsDiskCache, SHEETS_DISK_CACHE
 
 __all__ = [
     # Models
     "TeamStats",
+    "TeamStatsBatch",
+    "TeamStatsRow",
     "H2HResult",
     "MatchData",
     "ExtendedMatchData",
@@ -37,5 +53,14 @@ __all__ = [
     "read_worksheet_data",
     "get_all_worksheets_by_id",
     "read_worksheet_text_by_id",
+    "read_worksheet_grid_by_id",
+    "read_worksheets_grid_by_id",
     "get_tracking_sheet_id",
+    "spreadsheet_version",
+    "refresh_sheet_caches",
+    "prefetch_day_tabs",
+    "prefetched_tab_values",
+    # Persistenter Sheets-Cache
+    "SheetsDiskCache",
+    "SHEETS_DISK_CACHE",
 ]
@@ -0,0 +1,158 @@
+"""
+Prozessweite Google API Clients
+
+Statt bei jedem Aufruf Credentials zu erzeugen und den Service per
+Discovery neu zu bauen, hält dieses Modul pro (API, Version, Scopes) EINEN
+Service (statisches Discovery-Dokument aus googleapiclient) und pro Scopes
+EIN Credentials-Objekt (Token wird von AuthorizedHttp bei Bedarf erneuert).
+
+httplib2 ist nicht thread-sicher: jeder Request leiht sich deshalb für
+die Dauer von execute() eine eigene AuthorizedHttp aus einem Pool. Der
+Service selbst kann so gefahrlos von Streamlit-Sessions und dem
+Telegram-Bot-Thread gleichzeitig genutzt werden.
+"""
+
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Dict, Optional, Sequence, Tuple
+
+import httplib2
+from google.oauth2.service_account import Credentials
+from google_auth_httplib2 import AuthorizedHttp
+from googleapiclient.discovery import build
+from googleapiclient.http import HttpRequest
+
+logger = logging.getLogger(__name__)
+
+MAX_IDLE_CONNECTIONS = 8  # pro Credentials gehaltene, freie Transports
+
+
+class HttpPool:
+    """
+    Thread-sicherer Pool autorisierter httplib2-Transports
+
+    Args:
+        credentials: Geteilte Service-Account Credentials
+        max_idle: Maximal aufbewahrte freie Transports (mehr werden bei
+            Bedarf erzeugt und danach verworfen)
+    """
+
+    def __init__(self, credentials: Credentials, max_idle: int = MAX_IDLE_CONNECTIONS):
+        self.credentials = credentials
+        self.max_idle = max_idle
+        self._idle = []
+        self._lock = threading.Lock()
+        self.created = 0
+
+    def _new_http(self) -> AuthorizedHttp:
+        self.created += 1
+        return AuthorizedHttp(self.credentials, http=httplib2.Http())
+
+    @contextmanager
+    def connection(self):
+        with self._lock:
+            http = self._idle.pop() if self._idle else None
+            if http is None:
+                http = self._new_http()
+        try:
+            yield http
+        finally:
+            with self._lock:
+                if len(self._idle) < self.max_idle:
+                    self._idle.append(http)
+
+
+class PooledHttpRequest(HttpRequest):
+    """HttpRequest, das für execute() eine Verbindung aus dem Pool leiht"""
+
+    pool: Optional[HttpPool] = None
+
+    def execute(self, http=None, num_retries=0):
+        if http is not None or self.pool is None:
+            return super().execute(http=http, num_retries=num_retries)
+        with self.pool.connection() as pooled:
+            return super().execute(http=pooled, num_retries=num_retries)
+
+
+def _request_builder(pool: HttpPool):
+    def build_request(http, *args, **kwargs):
+        request = PooledHttpRequest(http, *args, **kwargs)
+        request.pool = pool
+        return request
+
+    return build_request
+
+
+_lock = threading.Lock()
+_credentials: Dict[Tuple[str, Tuple[str, ...]], Credentials] = {}
+_pools: Dict[Tuple[str, Tuple[str, ...]], HttpPool] = {}
+_services: Dict[Tuple[str, str, str, Tuple[str, ...]], object] = {}
+
+
+def load_service_account_info() -> Optional[dict]:
+    """Service-Account aus Streamlit Secrets (gcp_service_account)"""
+    try:
+        import streamlit as st
+
+        return dict(st.secrets["gcp_service_account"])
+    except Exception:
+        return None
+
+
+def get_credentials(scopes: Sequence[str], info: Optional[dict] = None) -> Credentials:
+    """Geteilte Credentials pro Service-Account und Scopes"""
+    info = info if info is not None else load_service_account_info()
+    if not info:
+        raise RuntimeError("Keine GCP Service-Account Credentials gefunden")
+    key = (info.get("client_email", ""), tuple(sorted(scopes)))
+    with _lock:
+        creds = _credentials.get(key)
+        if creds is None:
+            creds = Credentials.from_service_account_info(info, scopes=list(scopes))
+            _credentials[key] = creds
+            _pools[key] = HttpPool(creds)
+        return creds
+
+
+def get_google_service(
+    api: str, version: str, scopes: Sequence[str], info: Optional[dict] = None
+):
+    """
+    Gecachter, thread-sicher nutzbarer Google API Service
+
+    Args:
+        api: z.B. "sheets" oder "drive"
+        version: z.B. "v4" oder "v3"
+        scopes: OAuth Scopes
+        info: Service-Account Dictionary (Standard: Streamlit Secrets)
+
+    Raises:
+        RuntimeError: Wenn keine Credentials vorhanden sind
+    """
+    info = info if info is not None else load_service_account_info()
+    creds = get_credentials(scopes, info)
+    cred_key = (info.get("client_email", ""), tuple(sorted(scopes)))
+    key = (api, version) + cred_key
+    with _lock:
+        service = _services.get(key)
+        if service is None:
+            pool = _pools[cred_key]
+            service = build(
+                api,
+                version,
+                http=AuthorizedHttp(creds, http=httplib2.Http()),
+                requestBuilder=_request_builder(pool),
+                static_discovery=True,
+                cache_discovery=False,
+            )
+            _services[key] = service
+        return service
+
+
+def reset_google_clients() -> None:
+    """Verwirft alle gecachten Services, Credentials und Pools"""
+    with _lock:
+        _services.clear()
+        _pools.clear()
+        _credentials.clear()
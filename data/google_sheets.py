@@ -2,20 +2,24 @@
 Google Sheets und Google Drive Verbindungsfunktionen
 """
 
+import hashlib
 import re
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime, date
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Sequence, Tuple
 
 import streamlit as st
-from google.oauth2.service_account import Credentials
-from googleapiclient.discovery import build
 
 from config.constants import DRIVE_SCOPES, SHEETS_SCOPES
+from data.google_clients import get_google_service
+from data.sheets_cache import SHEETS_DISK_CACHE
 
 
 def connect_to_sheets(readonly: bool = True):
     """
-    Verbindet sich mit Google Sheets API
+    Verbindet sich mit Google Sheets API (geteilter, gepoolter Client)
 
     Args:
         readonly: Wenn True, nur Lesezugriff
@@ -24,12 +28,8 @@ def connect_to_sheets(readonly: bool = True):
         Google Sheets Service oder None bei Fehler
     """
     try:
-        credentials_dict = st.secrets["gcp_service_account"]
-        creds = Credentials.from_service_account_info(
-            credentials_dict, scopes=SHEETS_SCOPES
-        )
-        service = build("sheets", "v4", credentials=creds)
-        return service
+        credentials_dict = dict(st.secrets["gcp_service_account"])
+        return get_google_service("sheets", "v4", SHEETS_SCOPES, credentials_dict)
     except Exception as e:
         st.error(f"❌ Fehler bei Google Sheets Verbindung: {e}")
         return None
@@ -37,23 +37,66 @@ def connect_to_sheets(readonly: bool = True):
 
 def connect_to_drive():
     """
-    Verbindet sich mit Google Drive API
+    Verbindet sich mit Google Drive API (geteilter, gepoolter Client)
 
     Returns:
         Google Drive Service oder None bei Fehler
     """
     try:
-        credentials_dict = st.secrets["gcp_service_account"]
-        creds = Credentials.from_service_account_info(
-            credentials_dict, scopes=DRIVE_SCOPES
-        )
-        service = build("drive", "v3", credentials=creds)
-        return service
+        credentials_dict = dict(st.secrets["gcp_service_account"])
+        return get_google_service("drive", "v3", DRIVE_SCOPES, credentials_dict)
     except Exception as e:
         st.error(f"❌ Fehler bei Google Drive Verbindung: {e}")
         return None
 
 
+def _drive_version_string(meta: Dict) -> Optional[str]:
+    """Versions-String aus Drive-Metadaten (modifiedTime + version)"""
+    if not meta.get("modifiedTime"):
+        return None
+    return f"{meta['modifiedTime']}|{meta.get('version', '')}"
+
+
+def _fetch_spreadsheet_version(spreadsheet_id: str) -> Optional[str]:
+    try:
+        service = connect_to_drive()
+        if service is None:
+            return None
+        meta = (
+            service.files()
+            .get(fileId=spreadsheet_id, fields="modifiedTime,version")
+            .execute()
+        )
+        return _drive_version_string(meta)
+    except Exception:
+        return None
+
+
+def spreadsheet_version(spreadsheet_id: str) -> Optional[str]:
+    """
+    Drive-Version eines Spreadsheets (höchstens alle VERSION_CHECK_INTERVAL
+    Sekunden neu abgefragt); None wenn Drive nicht erreichbar ist
+    """
+    return SHEETS_DISK_CACHE.version(spreadsheet_id, _fetch_spreadsheet_version)
+
+
+def _disk_cached(spreadsheet_id: str, key: str, fetch):
+    """
+    Liest key aus dem persistenten Cache, solange die Drive-Version des
+    Spreadsheets unverändert ist; sonst fetch() und speichern.
+    Ohne bekannte Version wird immer frisch gelesen.
+    """
+    version = spreadsheet_version(spreadsheet_id)
+    if version:
+        cached = SHEETS_DISK_CACHE.get(spreadsheet_id, key, version)
+        if cached is not None:
+            return cached
+    value = fetch()
+    if version and value is not None:
+        SHEETS_DISK_CACHE.put(spreadsheet_id, key, version, value)
+    return value
+
+
 DATE_NAME_RE = re.compile(r"^\d{2}\.\d{2}\.\d{4}$")
 
 
@@ -86,7 +129,7 @@ def list_daily_sheets_in_folder(folder_id: str) -> Dict[str, str]:
             service.files()
             .list(
                 q=q,
-                fields="nextPageToken, files(id, name)",
+                fields="nextPageToken, files(id, name, modifiedTime, version)",
                 pageToken=page_token,
                 pageSize=1000,
             )
@@ -97,6 +140,8 @@ def list_daily_sheets_in_folder(folder_id: str) -> Dict[str, str]:
             name = (f.get("name") or "").strip()
             if DATE_NAME_RE.match(name):
                 date_to_id[name] = f["id"]
+                # Version gleich mitnehmen -> spart files().get pro Tages-Sheet
+                SHEETS_DISK_CACHE.note_version(f["id"], _drive_version_string(f))
 
         page_token = resp.get("nextPageToken")
         if not page_token:
@@ -120,15 +165,17 @@ def list_match_tabs_for_day(sheet_id: str) -> List[str]:
     if service is None:
         return []
 
-    meta = (
-        service.spreadsheets()
-        .get(spreadsheetId=sheet_id, fields="sheets(properties(title,index))")
-        .execute()
-    )
+    def fetch() -> List[str]:
+        meta = (
+            service.spreadsheets()
+            .get(spreadsheetId=sheet_id, fields="sheets(properties(title,index))")
+            .execute()
+        )
+        sheets = meta.get("sheets", [])
+        sheets_sorted = sorted(sheets, key=lambda s: s["properties"].get("index", 0))
+        return [s["properties"]["title"] for s in sheets_sorted]
 
-    sheets = meta.get("sheets", [])
-    sheets_sorted = sorted(sheets, key=lambda s: s["properties"].get("index", 0))
-    return [s["properties"]["title"] for s in sheets_sorted]
+    return _disk_cached(sheet_id, "meta:tabs", fetch)
 
 
 @st.cache_data(ttl=300)
@@ -236,35 +283,197 @@ def get_all_worksheets_by_id(spreadsheet_id: str):
         return None
 
 
-@st.cache_data(ttl=300)
-def read_worksheet_text_by_id(spreadsheet_id: str, sheet_name: str) -> Optional[str]:
+# Maximale Anzahl Tabs pro values().batchGet Aufruf
+BATCH_GET_MAX_RANGES = 50
+
+# Tages-Prefetch: Rohwerte aller Match-Tabs eines Spreadsheets im Speicher
+DAY_PREFETCH_TTL = 300  # Sekunden
+MAX_PREFETCHED_DAYS = 3
+
+_day_store_lock = threading.Lock()
+_day_stores: "OrderedDict[str, Tuple[float, Optional[str], Dict[str, List[List[str]]]]]" = OrderedDict()
+
+
+def _values_to_grid(data: List[List[str]]) -> List[List[str]]:
+    """Zeilen-Raster ohne Leerzeilen (Format für DataParser.parse_grid)"""
+    return [row for row in data if any(cell.strip() for cell in row if cell)]
+
+
+def _values_to_text(data: List[List[str]]) -> str:
+    """Zeilen (ohne Leerzeilen) als Tab-getrennter Text für den DataParser"""
+    return "\n".join("\t".join(row) for row in _values_to_grid(data))
+
+
+def _prefetched_day(spreadsheet_id: str) -> Dict[str, List[List[str]]]:
+    """Vorgeladene Tab-Werte eines Spreadsheets (leer, wenn veraltet)"""
+    with _day_store_lock:
+        entry = _day_stores.get(spreadsheet_id)
+    if entry is None:
+        return {}
+    loaded_at, version, values = entry
+    expired = time.monotonic() - loaded_at > DAY_PREFETCH_TTL
+    if expired or (version and spreadsheet_version(spreadsheet_id) != version):
+        with _day_store_lock:
+            _day_stores.pop(spreadsheet_id, None)
+        return {}
+    return values
+
+
+def prefetched_tab_values(
+    spreadsheet_id: str, sheet_name: str
+) -> Optional[List[List[str]]]:
+    """Rohwerte (A:Z) eines Tabs aus dem Tages-Prefetch oder None"""
+    return _prefetched_day(spreadsheet_id).get(sheet_name)
+
+
+def _read_tab_values(
+    spreadsheet_id: str, sheet_names: Sequence[str]
+) -> Dict[str, Optional[List[List[str]]]]:
     """
-    Wie read_worksheet_data(), aber spreadsheetId direkt (Text-Repräsentation A:Z)
+    Rohwerte (A:Z) mehrerer Tabs: Tages-Prefetch -> Disk-Cache -> ein
+    values().batchGet pro BATCH_GET_MAX_RANGES fehlender Tabs.
+
+    Schlägt ein batchGet fehl (z.B. ein Tab wurde umbenannt), werden die
+    Tabs dieses Blocks einzeln gelesen.
+
+    Returns:
+        Dictionary Tab-Name -> Zeilen (None bei Fehler)
     """
-    try:
-        service = connect_to_sheets(readonly=True)
-        if service is None:
-            return None
+    prefetched = _prefetched_day(spreadsheet_id)
+    values: Dict[str, Optional[List[List[str]]]] = {
+        name: prefetched[name] for name in sheet_names if name in prefetched
+    }
+    missing = [name for name in sheet_names if name not in values]
+    if not missing:
+        return values
+
+    version = spreadsheet_version(spreadsheet_id)
+    if version:
+        for name in missing:
+            cached = SHEETS_DISK_CACHE.get(spreadsheet_id, f"values:{name}", version)
+            if cached is not None:
+                values[name] = cached
+        missing = [name for name in missing if name not in values]
+        if not missing:
+            return values
 
-        range_name = f"'{sheet_name}'!A:Z"
-        result = (
-            service.spreadsheets()
-            .values()
-            .get(spreadsheetId=spreadsheet_id, range=range_name)
-            .execute()
-        )
-        data = result.get("values", [])
+    service = connect_to_sheets(readonly=True)
+    if service is None:
+        values.update({name: None for name in missing})
+        return values
+
+    def store(name: str, rows: List[List[str]]) -> None:
+        values[name] = rows
+        if version:
+            SHEETS_DISK_CACHE.put(spreadsheet_id, f"values:{name}", version, rows)
+
+    for start in range(0, len(missing), BATCH_GET_MAX_RANGES):
+        chunk = missing[start : start + BATCH_GET_MAX_RANGES]
+        try:
+            result = (
+                service.spreadsheets()
+                .values()
+                .batchGet(
+                    spreadsheetId=spreadsheet_id,
+                    ranges=[f"'{name}'!A:Z" for name in chunk],
+                )
+                .execute()
+            )
+            for name, value_range in zip(chunk, result.get("valueRanges", [])):
+                store(name, value_range.get("values", []))
+        except Exception:
+            for name in chunk:
+                try:
+                    result = (
+                        service.spreadsheets()
+                        .values()
+                        .get(spreadsheetId=spreadsheet_id, range=f"'{name}'!A:Z")
+                        .execute()
+                    )
+                    store(name, result.get("values", []))
+                except Exception as e:
+                    st.error(f"❌ Fehler: {e}")
+                    values[name] = None
+
+    return values
+
+
+def prefetch_day_tabs(spreadsheet_id: str, sheet_names: Tuple[str, ...]) -> int:
+    """
+    Lädt alle Match-Tabs eines Tages (A:Z) in wenigen batchGet-Aufrufen in
+    den Tages-Speicher. Einzel-, Bulk-, ML- und Export-Lesezugriffe sowie
+    der Navigator bedienen sich danach dort statt je ein values().get.
 
-        text_data: List[str] = []
-        for row in data:
-            if any(cell.strip() for cell in row if cell):
-                text_data.append("\t".join(row))
-        return "\n".join(text_data)
+    Returns:
+        Anzahl vorgeladener Tabs
+    """
+    prefetched = _prefetched_day(spreadsheet_id)
+    if prefetched and all(name in prefetched for name in sheet_names):
+        return len(sheet_names)
+
+    values = _read_tab_values(spreadsheet_id, sheet_names)
+    loaded = dict(prefetched)
+    loaded.update({name: rows for name, rows in values.items() if rows is not None})
+    version = spreadsheet_version(spreadsheet_id)
+    with _day_store_lock:
+        _day_stores[spreadsheet_id] = (time.monotonic(), version, loaded)
+        _day_stores.move_to_end(spreadsheet_id)
+        while len(_day_stores) > MAX_PREFETCHED_DAYS:
+            _day_stores.popitem(last=False)
+    return sum(1 for name in sheet_names if name in loaded)
+
+
+@st.cache_data(ttl=300)
+def read_worksheet_grid_by_id(
+    spreadsheet_id: str, sheet_name: str
+) -> Optional[List[List[str]]]:
+    """
+    Liest ein Worksheet (A:Z) als Zellen-Raster ohne Leerzeilen
+
+    Für DataParser.parse_grid() - spart das Zusammenfügen zu Text und das
+    erneute Zerlegen im Parser. Nutzt den Tages-Prefetch, falls vorhanden.
+    """
+    try:
+        rows = _read_tab_values(spreadsheet_id, (sheet_name,))[sheet_name]
+        return None if rows is None else _values_to_grid(rows)
     except Exception as e:
         st.error(f"❌ Fehler: {e}")
         return None
 
 
+def read_worksheet_text_by_id(spreadsheet_id: str, sheet_name: str) -> Optional[str]:
+    """
+    Wie read_worksheet_data(), aber spreadsheetId direkt (Text-Repräsentation A:Z)
+
+    Dünner Adapter über read_worksheet_grid_by_id() (dort gecacht).
+    """
+    grid = read_worksheet_grid_by_id(spreadsheet_id, sheet_name)
+    return None if grid is None else _values_to_text(grid)
+
+
+@st.cache_data(ttl=300)
+def read_worksheets_grid_by_id(
+    spreadsheet_id: str, sheet_names: Tuple[str, ...]
+) -> Dict[str, Optional[List[List[str]]]]:
+    """
+    Wie read_worksheet_grid_by_id(), aber für viele Tabs auf einmal:
+    vorgeladene bzw. unveränderte Tabs kommen aus Tages-Prefetch oder
+    Disk-Cache, der Rest per batchGet (BATCH_GET_MAX_RANGES Tabs pro Aufruf).
+
+    Args:
+        spreadsheet_id: ID des Tages-Spreadsheets
+        sheet_names: Tab-Namen (Tuple, damit der Aufruf cachebar ist)
+
+    Returns:
+        Dictionary Tab-Name -> Zellen-Raster (None bei Fehler)
+    """
+    values = _read_tab_values(spreadsheet_id, sheet_names)
+    return {
+        name: None if values.get(name) is None else _values_to_grid(values[name])
+        for name in sheet_names
+    }
+
+
 @st.cache_data(ttl=300)
 def read_worksheet_text_range_by_id(
     spreadsheet_id: str, sheet_name: str, a1_range: str = "A1:Z40"
@@ -279,19 +488,18 @@ def read_worksheet_text_range_by_id(
             return None
 
         range_name = f"'{sheet_name}'!{a1_range}"
-        result = (
-            service.spreadsheets()
-            .values()
-            .get(spreadsheetId=spreadsheet_id, range=range_name)
-            .execute()
-        )
-        data = result.get("values", [])
 
-        text_data: List[str] = []
-        for row in data:
-            if any(cell.strip() for cell in row if cell):
-                text_data.append("\t".join(row))
-        return "\n".join(text_data)
+        def fetch() -> List[List[str]]:
+            result = (
+                service.spreadsheets()
+                .values()
+                .get(spreadsheetId=spreadsheet_id, range=range_name)
+                .execute()
+            )
+            return result.get("values", [])
+
+        data = _disk_cached(spreadsheet_id, f"range:{range_name}", fetch)
+        return _values_to_text(data)
     except Exception as e:
         st.error(f"❌ Fehler: {e}")
         return None
@@ -325,13 +533,17 @@ def read_worksheet_values_range_by_id(
             return None
 
         range_name = f"'{sheet_name}'!{a1_range}"
-        result = (
-            service.spreadsheets()
-            .values()
-            .get(spreadsheetId=spreadsheet_id, range=range_name)
-            .execute()
-        )
-        return result.get("values", [])
+
+        def fetch() -> List[List[str]]:
+            result = (
+                service.spreadsheets()
+                .values()
+                .get(spreadsheetId=spreadsheet_id, range=range_name)
+                .execute()
+            )
+            return result.get("values", [])
+
+        return _disk_cached(spreadsheet_id, f"range:{range_name}", fetch)
     except Exception:
         return None
 
@@ -349,24 +561,56 @@ def batch_get_worksheet_values_ranges_by_id(
         ranges: A1 ranges including sheet name, e.g. ("'Tab1'!B4:E7", "'Tab2'!B4:E7")
 
     Returns:
-        Mapping: range -> values (2D list)
+        Mapping: requested range -> values (2D list)
     """
     try:
         service = connect_to_sheets(readonly=True)
         if service is None:
             return {}
 
-        result = (
-            service.spreadsheets()
-            .values()
-            .batchGet(spreadsheetId=spreadsheet_id, ranges=list(ranges))
-            .execute()
-        )
-
-        out: Dict[str, List[List[str]]] = {}
-        for vr in result.get("valueRanges", []) or []:
-            r = vr.get("range", "")
-            out[r] = vr.get("values", []) or []
-        return out
+        def fetch() -> Dict[str, List[List[str]]]:
+            result = (
+                service.spreadsheets()
+                .values()
+                .batchGet(spreadsheetId=spreadsheet_id, ranges=list(ranges))
+                .execute()
+            )
+            # valueRanges kommen in Anfrage-Reihenfolge; die API normalisiert
+            # "range" (z.B. ohne Quotes), daher nach angefragtem Bereich mappen
+            out: Dict[str, List[List[str]]] = {}
+            for r, vr in zip(ranges, result.get("valueRanges", []) or []):
+                out[r] = vr.get("values", []) or []
+            return out
+
+        key = "ranges:" + hashlib.sha1("\n".join(ranges).encode("utf-8")).hexdigest()
+        return _disk_cached(spreadsheet_id, key, fetch)
     except Exception:
         return {}
+
+
+# Alle Lese-Funktionen mit st.cache_data (für refresh_sheet_caches)
+_CACHED_READERS = (
+    list_daily_sheets_in_folder,
+    list_match_tabs_for_day,
+    read_sheet_range,
+    read_worksheet_data,
+    read_worksheet_grid_by_id,
+    read_worksheets_grid_by_id,
+    read_worksheet_text_range_by_id,
+    read_worksheet_values_range_by_id,
+    batch_get_worksheet_values_ranges_by_id,
+)
+
+
+def refresh_sheet_caches() -> None:
+    """
+    "Aktualisieren": leert die In-Memory Caches der Lese-Funktionen und
+    erzwingt eine neue Drive-Versions-Prüfung. Der persistente Cache
+    bleibt erhalten - unveränderte Spreadsheets werden danach aus dem
+    Disk-Cache bedient statt neu geladen.
+    """
+    SHEETS_DISK_CACHE.forget_versions()
+    with _day_store_lock:
+        _day_stores.clear()
+    for reader in _CACHED_READERS:
+        reader.clear()
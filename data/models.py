@@ -2,11 +2,13 @@
 Datenmodelle für Match-Analysen
 """
 
-from dataclasses import dataclass
-from typing import List, Tuple
+from dataclasses import dataclass, fields
+from typing import Iterable, List, Sequence, Tuple, Union
 
+import numpy as np
 
-@dataclass
+
+@dataclass(slots=True)
 class TeamStats:
     """Statistiken für ein Team"""
     name: str
@@ -49,7 +51,7 @@ class TeamStats:
     possession: float
 
 
-@dataclass
+@dataclass(slots=True)
 class H2HResult:
     """Head-to-Head Ergebnis"""
     date: str
@@ -59,7 +61,7 @@ class H2HResult:
     away_goals: int
 
 
-@dataclass
+@dataclass(slots=True)
 class MatchData:
     """Vollständige Match-Daten für Analyse"""
     home_team: TeamStats
@@ -73,6 +75,120 @@ class MatchData:
     odds_btts: Tuple[float, float]
 
 
+# Numerische TeamStats-Felder als Spalten eines strukturierten Arrays
+TEAM_STATS_NUMERIC_FIELDS = tuple(f.name for f in fields(TeamStats) if f.name != "name")
+TEAM_STATS_DTYPE = np.dtype(
+    [
+        (f.name, np.int32 if f.type is int else np.float64)
+        for f in fields(TeamStats)
+        if f.name != "name"
+    ]
+)
+
+
+class TeamStatsBatch:
+    """
+    Spaltenweise TeamStats-Sammlung (NumPy structured array + Namensliste)
+
+    Für viele Teams (z.B. historische Matches) statt je eines TeamStats
+    Objekts pro Team: column() liefert eine Spalte als View ohne Kopie,
+    batch[i] eine leichte Zeilen-Ansicht mit TeamStats-Attributen.
+    """
+
+    __slots__ = ("names", "data")
+
+    def __init__(self, names: Sequence[str], data: np.ndarray):
+        if data.dtype != TEAM_STATS_DTYPE or len(names) != len(data):
+            raise ValueError("names/data passen nicht zu TEAM_STATS_DTYPE")
+        self.names = list(names)
+        self.data = data
+
+    @classmethod
+    def from_columns(cls, names: Sequence[str], **columns: Iterable) -> "TeamStatsBatch":
+        """Baut einen Batch aus Spalten; fehlende Spalten sind 0"""
+        unknown = set(columns) - set(TEAM_STATS_NUMERIC_FIELDS)
+        if unknown:
+            raise ValueError(f"Unbekannte TeamStats-Felder: {sorted(unknown)}")
+        data = np.zeros(len(names), dtype=TEAM_STATS_DTYPE)
+        for field_name, values in columns.items():
+            data[field_name] = np.asarray(values)
+        return cls(names, data)
+
+    @classmethod
+    def from_teams(cls, teams: Sequence[Union[TeamStats, "TeamStatsRow"]]) -> "TeamStatsBatch":
+        """Baut einen Batch aus TeamStats (oder Zeilen-Ansichten)"""
+        data = np.array(
+            [
+                tuple(getattr(team, name) for name in TEAM_STATS_NUMERIC_FIELDS)
+                for team in teams
+            ],
+            dtype=TEAM_STATS_DTYPE,
+        )
+        return cls([team.name for team in teams], data)
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return TeamStatsBatch(self.names[index], self.data[index])
+        if index < 0:
+            index += len(self.data)
+        if not 0 <= index < len(self.data):
+            raise IndexError(index)
+        return TeamStatsRow(self, index)
+
+    def __iter__(self):
+        return (TeamStatsRow(self, i) for i in range(len(self.data)))
+
+    def column(self, field_name: str) -> np.ndarray:
+        """Eine numerische Spalte als View (keine Kopie)"""
+        return self.data[field_name]
+
+    def to_teams(self) -> List[TeamStats]:
+        return [row.to_team_stats() for row in self]
+
+    @property
+    def nbytes(self) -> int:
+        return self.data.nbytes
+
+
+class TeamStatsRow:
+    """
+    Zeilen-Ansicht in einen TeamStatsBatch
+
+    Verhält sich beim Lesen wie TeamStats (gleiche Attribute, Python-Skalare),
+    hält aber nur Batch-Referenz und Index.
+    """
+
+    __slots__ = ("batch", "index")
+
+    def __init__(self, batch: TeamStatsBatch, index: int):
+        self.batch = batch
+        self.index = index
+
+    def __getattr__(self, name: str):
+        if name == "name":
+            return self.batch.names[self.index]
+        if name in TEAM_STATS_DTYPE.names:
+            return self.batch.data[name][self.index].item()
+        raise AttributeError(name)
+
+    def to_team_stats(self) -> TeamStats:
+        values = self.batch.data[self.index].item()
+        return TeamStats(self.name, *values)
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (TeamStats, TeamStatsRow)):
+            if isinstance(other, TeamStatsRow):
+                other = other.to_team_stats()
+            return self.to_team_stats() == other
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return repr(self.to_team_stats())
+
+
 @dataclass
 class ExtendedMatchData:
     """Erweiterte Match-Daten für ML-Training (Phase 4)"""
@@ -3,19 +3,51 @@ Parser für Google Sheets Match-Daten
 """
 
 import re
-from typing import Tuple, List, Dict
+from bisect import bisect_left
+from itertools import accumulate
+from typing import Tuple, List, Dict, Optional
 from data.models import TeamStats, H2HResult, MatchData
 
+# Vorkompilierte Regexe (einmal pro Prozess statt pro Aufruf)
+_MULTI_SPACE_RE = re.compile(r"\s{2,}")
+_SCORE_RE = re.compile(r"\d+:\d+")
+_H2H_MATCH_RE = re.compile(r"(.+?)\s+(\d+):(\d+)\s+(.+)")
+_ODDS_3_RE = re.compile(r"([\d.]+)\s*/\s*([\d.]+)\s*/\s*([\d.]+)")
+_ODDS_2_RE = re.compile(r"([\d.]+)\s*/\s*([\d.]+)")
+
+# Abschnitts-Grenzen
+_H2H_STOP_MARKERS = ("statistische", "wettquoten", "1x2", "points per game")
+_STATS_STOP_MARKERS = ("wettquoten", "1x2")
+
+# Feste Abschnitts-Marker (klein geschrieben); ihre Zeilen werden einmal
+# pro Dokument in _build_index gesucht
+_SECTION_MARKERS = tuple(
+    dict.fromkeys(
+        ("heimteam", "datum:", "wettbewerb:", "anstoß:", "ergebnisse",
+         "points per game overall", "over/under 2", "btts")
+        + _H2H_STOP_MARKERS
+        + _STATS_STOP_MARKERS
+    )
+)
+
 
 class DataParser:
     """Parser für Match-Daten aus Google Sheets"""
     
     def __init__(self):
         self.lines = []
+        self._lower_doc = ""
+        self._lower = []
+        self._line_ends = []
+        self._parts = []
+        self._sections = {}
 
     def parse(self, text: str) -> MatchData:
         """
         Parst Text-Daten zu MatchData Objekt
+
+        Dünner Adapter für Text-Exporte: zerlegt den Text in Zeilen und
+        parst dann wie parse_grid().
         
         Args:
             text: Tab-separierter Text aus Google Sheets
@@ -23,7 +55,54 @@ class DataParser:
         Returns:
             MatchData Objekt
         """
-        self.lines = [line.strip() for line in text.split("\n") if line.strip()]
+        self.lines = [line for line in map(str.strip, text.split("\n")) if line]
+        self._build_index()
+        return self._parse_lines()
+
+    def parse_grid(self, values: List[List[str]]) -> MatchData:
+        """
+        Parst das Zellen-Raster aus values().get / batchGet direkt
+
+        Spart den Umweg über Tab-Text: die Felder jeder Zeile kommen direkt
+        aus den Zellen (nicht-leere Zellen in Spaltenreihenfolge, wie beim
+        Text-Split). Zellen mit Zeilenumbruch oder Tab werden wie im
+        Text-Pfad aufgeteilt.
+
+        Args:
+            values: Zeilen als Liste von Zellen-Strings
+
+        Returns:
+            MatchData Objekt (identisch zu parse() auf dem Text-Export)
+        """
+        lines = []
+        parts = []
+        for row in values:
+            joined = "\t".join(row)
+            if "\n" in joined or joined.count("\t") >= len(row):
+                # Umbruch/Tab in einer Zelle: Felder wie im Text-Pfad splitten
+                for line in map(str.strip, joined.split("\n")):
+                    if line:
+                        lines.append(line)
+                        parts.append(None)
+                continue
+            cells = [cell for cell in map(str.strip, row) if cell]
+            if cells:
+                lines.append(joined.strip())
+                parts.append(cells)
+        self.lines = lines
+        self._build_index(parts)
+        return self._parse_lines()
+
+    def _parse_lines(self) -> MatchData:
+        """
+        Parst die indizierten Zeilen zu MatchData
+
+        Der Zeilen-Index (Zeilen, klein geschriebenes Gesamtdokument,
+        Zeilen-Offsets, Zeilen der festen Abschnitts-Marker) steht bereits.
+        Abschnitte werden dort nachgeschlagen, teamabhängige Suchen laufen
+        als str.find über das Gesamtdokument statt als Python-Schleife mit
+        lower() pro Zeile; jede Zeile wird höchstens einmal in Felder zerlegt.
+        """
         home_name, away_name = self._parse_match_details()
         date, competition, kickoff = self._parse_date_competition()
         home_overall = self._parse_team_overall(home_name)
@@ -53,37 +132,96 @@ class DataParser:
             odds_btts=odds_btts,
         )
 
+    def _build_index(self, parts: Optional[List[Optional[List[str]]]] = None) -> None:
+        """
+        Zeilen-Index: klein geschriebenes Gesamtdokument, Zeilen, Zeilenenden
+        und die Zeilen aller festen Abschnitts-Marker
+
+        Args:
+            parts: Bereits bekannte Felder pro Zeile (None = bei Bedarf splitten)
+        """
+        self._lower_doc = "\n".join(self.lines).lower()
+        self._lower = self._lower_doc.split("\n")
+        self._line_ends = list(accumulate(map(len, self._lower)))
+        self._parts = parts if parts is not None else [None] * len(self.lines)
+        self._sections = {marker: self._lines_with(marker) for marker in _SECTION_MARKERS}
+
+    def _line_offset(self, i: int) -> int:
+        """Zeichen-Offset des Zeilenanfangs von Zeile i im Gesamtdokument"""
+        return 0 if i == 0 else self._line_ends[i - 1] + i
+
+    def _line_parts(self, i: int) -> List[str]:
+        """Tab-getrennte, nicht-leere Felder einer Zeile (einmal pro Zeile)"""
+        parts = self._parts[i]
+        if parts is None:
+            parts = [p for p in map(str.strip, self.lines[i].split("\t")) if p]
+            self._parts[i] = parts
+        return parts
+
     def _find_line_with(self, text: str, start_from: int = 0) -> int:
         """Findet Index der ersten Zeile die text enthält"""
-        for i in range(start_from, len(self.lines)):
-            if text.lower() in self.lines[i].lower():
-                return i
-        return -1
+        if start_from >= len(self.lines):
+            return -1
+        pos = self._lower_doc.find(text.lower(), self._line_offset(start_from))
+        if pos == -1:
+            return -1
+        return start_from + self._lower_doc.count("\n", self._line_offset(start_from), pos)
+
+    def _lines_with(self, text: str) -> List[int]:
+        """Indizes aller Zeilen, die text (klein geschrieben) enthalten"""
+        doc = self._lower_doc
+        lines = []
+        line = 0
+        scanned = 0
+        pos = doc.find(text)
+        while pos != -1:
+            line += doc.count("\n", scanned, pos)
+            lines.append(line)
+            scanned = doc.find("\n", pos)
+            if scanned == -1:
+                break
+            pos = doc.find(text, scanned)
+        return lines
+
+    def _section(self, marker: str) -> int:
+        """Erste Zeile mit einem festen Abschnitts-Marker (-1 = fehlt)"""
+        lines = self._sections[marker]
+        return lines[0] if lines else -1
+
+    def _section_end(self, start: int, markers: Tuple[str, ...]) -> int:
+        """Erste Zeile ab start, die einen der Marker enthält (sonst Dokumentende)"""
+        end = len(self.lines)
+        for marker in markers:
+            lines = self._sections[marker]
+            pos = bisect_left(lines, start)
+            if pos < len(lines) and lines[pos] < end:
+                end = lines[pos]
+        return end
 
     def _parse_match_details(self) -> Tuple[str, str]:
         """Parst Heimteam und Auswärtsteam"""
-        idx = self._find_line_with("heimteam")
+        idx = self._section("heimteam")
         if idx == -1:
             raise ValueError("Heimteam nicht gefunden")
         idx += 1
         while idx < len(self.lines) and not self.lines[idx]:
             idx += 1
         teams_line = self.lines[idx]
-        teams = [t.strip() for t in teams_line.split("\t") if t.strip()]
+        teams = self._line_parts(idx)
         if len(teams) >= 2:
             return teams[0], teams[1]
-        teams = [t.strip() for t in re.split(r"\s{2,}", teams_line) if t.strip()]
+        teams = [t.strip() for t in _MULTI_SPACE_RE.split(teams_line) if t.strip()]
         return teams[0], teams[1]
 
     def _parse_date_competition(self) -> Tuple[str, str, str]:
         """Parst Datum, Wettbewerb und Anstoßzeit"""
-        date_idx = self._find_line_with("datum:")
+        date_idx = self._section("datum:")
         date = self.lines[date_idx].split(":", 1)[1].strip() if date_idx != -1 else ""
-        comp_idx = self._find_line_with("wettbewerb:")
+        comp_idx = self._section("wettbewerb:")
         competition = (
             self.lines[comp_idx].split(":", 1)[1].strip() if comp_idx != -1 else ""
         )
-        kick_idx = self._find_line_with("anstoß:")
+        kick_idx = self._section("anstoß:")
         kickoff = (
             self.lines[kick_idx].split(":", 1)[1].strip() if kick_idx != -1 else ""
         )
@@ -91,13 +229,13 @@ class DataParser:
 
     def _parse_team_overall(self, team_name: str) -> Dict:
         """Parst Overall-Statistiken für ein Team"""
-        for i, line in enumerate(self.lines):
-            if (
-                team_name in line
-                and "tabellenposition" not in line.lower()
-                and "letzte 5" not in line.lower()
-            ):
-                parts = [p.strip() for p in line.split("\t") if p.strip()]
+        # Kandidaten per str.find über das Gesamtdokument statt Zeilen-Schleife
+        for i in self._lines_with(team_name.lower()):
+            if team_name not in self.lines[i]:
+                continue
+            low = self._lower[i]
+            if "tabellenposition" not in low and "letzte 5" not in low:
+                parts = self._line_parts(i)
                 if len(parts) >= 9:
                     goals = parts[6].split(":")
                     return {
@@ -118,8 +256,7 @@ class DataParser:
         idx = self._find_line_with(f"{team_name} letzte 5 spiele")
         if idx == -1:
             return {}
-        line = self.lines[idx]
-        parts = [p.strip() for p in line.split("\t") if p.strip()]
+        parts = self._line_parts(idx)
         if len(parts) >= 8:
             goals = parts[6].split(":")
             return {
@@ -135,13 +272,12 @@ class DataParser:
         idx = self._find_line_with(f"{team_name} letzte 5 {search_term}")
         if idx == -1:
             return {}
-        line = self.lines[idx]
-        parts = [p.strip() for p in line.split("\t") if p.strip()]
+        parts = self._line_parts(idx)
         goals_for = 0
         goals_against = 0
         points = 0
         for part in parts:
-            if ":" in part and re.match(r"\d+:\d+", part):
+            if ":" in part and _SCORE_RE.match(part):
                 goals = part.split(":")
                 goals_for = int(goals[0])
                 goals_against = int(goals[1])
@@ -156,23 +292,16 @@ class DataParser:
     def _parse_h2h(self, home_name: str, away_name: str) -> List[H2HResult]:
         """Parst Head-to-Head Ergebnisse"""
         results = []
-        idx = self._find_line_with("ergebnisse")
+        idx = self._section("ergebnisse")
         if idx == -1:
             return results
-        idx += 1
-        while idx < len(self.lines):
-            line = self.lines[idx]
-            if any(
-                marker in line.lower()
-                for marker in ["statistische", "wettquoten", "1x2", "points per game"]
-            ):
-                break
-            if re.search(r"\d+:\d+", line):
-                parts = [p.strip() for p in line.split("\t") if p.strip()]
+        for i in range(idx + 1, self._section_end(idx + 1, _H2H_STOP_MARKERS)):
+            if _SCORE_RE.search(self.lines[i]):
+                parts = self._line_parts(i)
                 if len(parts) >= 2:
                     date = parts[0]
                     match_str = parts[1]
-                    match = re.search(r"(.+?)\s+(\d+):(\d+)\s+(.+)", match_str)
+                    match = _H2H_MATCH_RE.search(match_str)
                     if match:
                         team1 = match.group(1).strip()
                         goals1 = int(match.group(2))
@@ -187,27 +316,20 @@ class DataParser:
                                 away_goals=goals2,
                             )
                         )
-            idx += 1
         return results
 
     def _parse_statistics(self) -> Tuple[Dict, Dict]:
         """Parst erweiterte Statistiken für beide Teams"""
         home_stats = {}
         away_stats = {}
-        idx = self._find_line_with("points per game overall")
+        idx = self._section("points per game overall")
         if idx == -1:
             return home_stats, away_stats
-        stat_lines = []
-        i = idx
-        while i < len(self.lines):
-            line = self.lines[i]
-            if "wettquoten" in line.lower() or "1x2" in line.lower():
-                break
-            if line and not line.startswith("*"):
-                stat_lines.append(line)
-            i += 1
-        for line in stat_lines:
-            parts = [p.strip() for p in line.split("\t") if p.strip()]
+        stop = self._section_end(idx, _STATS_STOP_MARKERS)
+        for i in range(idx, stop):
+            if self.lines[i].startswith("*"):
+                continue
+            parts = self._line_parts(i)
             if len(parts) >= 3:
                 stat_name = parts[0].lower()
                 try:
@@ -285,24 +407,33 @@ class DataParser:
         odds_1x2 = (1.0, 1.0, 1.0)
         odds_ou25 = (1.0, 1.0)
         odds_btts = (1.0, 1.0)
-        for line in self.lines:
-            line_lower = line.lower()
-            if "1x2" in line_lower:
-                match = re.search(r"([\d.]+)\s*/\s*([\d.]+)\s*/\s*([\d.]+)", line)
-                if match:
-                    odds_1x2 = (
-                        float(match.group(1)),
-                        float(match.group(2)),
-                        float(match.group(3)),
-                    )
-            elif "over/under 2" in line_lower:
-                match = re.search(r"([\d.]+)\s*/\s*([\d.]+)", line)
-                if match:
-                    odds_ou25 = (float(match.group(1)), float(match.group(2)))
-            elif "btts" in line_lower and "ja/nein" in line_lower:
-                match = re.search(r"([\d.]+)\s*/\s*([\d.]+)", line)
-                if match:
-                    odds_btts = (float(match.group(1)), float(match.group(2)))
+        # Letzte passende Zeile gewinnt; Vorrang pro Zeile 1x2 > Über/Unter > BTTS
+        lines_1x2 = self._sections["1x2"]
+        lines_ou = self._sections["over/under 2"]
+        for i in reversed(lines_1x2):
+            match = _ODDS_3_RE.search(self.lines[i])
+            if match:
+                odds_1x2 = (
+                    float(match.group(1)),
+                    float(match.group(2)),
+                    float(match.group(3)),
+                )
+                break
+        for i in reversed(lines_ou):
+            if "1x2" in self._lower[i]:
+                continue
+            match = _ODDS_2_RE.search(self.lines[i])
+            if match:
+                odds_ou25 = (float(match.group(1)), float(match.group(2)))
+                break
+        for i in reversed(self._sections["btts"]):
+            low = self._lower[i]
+            if "ja/nein" not in low or "1x2" in low or "over/under 2" in low:
+                continue
+            match = _ODDS_2_RE.search(self.lines[i])
+            if match:
+                odds_btts = (float(match.group(1)), float(match.group(2)))
+                break
         return odds_1x2, odds_ou25, odds_btts
 
     def _create_team_stats(
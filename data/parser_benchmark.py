@@ -0,0 +1,132 @@
+"""
+Benchmark für den DataParser
+
+Misst die Parse-Zeit pro Tab über gespeicherte Fixtures (ein Tab-Export
+pro .txt-Datei, Format wie read_worksheet_text_by_id) oder - ohne
+Verzeichnis - über ein eingebautes Beispiel-Tab.
+
+Mit --grid werden die Tabs vorab in Zellen-Raster zerlegt und über
+DataParser.parse_grid() geparst (Format von read_worksheet_grid_by_id).
+
+Aufruf:
+    python -m data.parser_benchmark [fixtures_verzeichnis] [--repeat N] [--grid]
+"""
+
+import argparse
+import time
+from pathlib import Path
+from typing import Dict, List
+
+from data.parser import DataParser
+
+SAMPLE_TAB = "\n".join(
+    [
+        "Match Details",
+        "Heimteam\tAuswärtsteam",
+        "FC Alpha\tSV Beta",
+        "Datum: 15.12.2025",
+        "Wettbewerb: Bundesliga",
+        "Anstoß: 15:30",
+        "Tabellenposition",
+        "Team\tPos\tSp\tS\tU\tN\tTore\tDiff\tPkt",
+        "FC Alpha\t3.\t15\t9\t3\t3\t30:15\t15\t30",
+        "SV Beta\t10.\t15\t5\t4\t6\t20:22\t-2\t19",
+        "FC Alpha Letzte 5 Spiele\tS\tS\tU\tN\tS\t9:5\t10",
+        "SV Beta Letzte 5 Spiele\tN\tU\tS\tN\tU\t5:7\t5",
+        "FC Alpha Letzte 5 Heimspiele\tS\tS\tS\tU\tS\t11:3\t13",
+        "SV Beta Letzte 5 Auswärtsspiele\tN\tN\tU\tS\tN\t4:9\t4",
+        "Direkte Vergleiche",
+        "Ergebnisse",
+        "12.04.2025\tSV Beta 1:2 FC Alpha",
+        "03.11.2024\tFC Alpha 3:0 SV Beta",
+        "Statistische Daten",
+        "Points per Game Overall\t2.00\t1.27",
+        "Points per Game Home/Away\t2.40\t0.90",
+        "Average Goals Scored/Conceded per Match Overall\t2.00\t1.00\t1.33\t1.47",
+        "Average Goals Scored/Conceded per Match Home/Away\t2.30\t0.80\t1.10\t1.80",
+        "xG Overall\t1.85\t1.10\t1.25\t1.55",
+        "xG Home/Away\t2.10\t0.95\t1.05\t1.70",
+        "Clean Sheet Yes/No Overall\t40%\t60%\t20%\t80%",
+        "Clean Sheet Yes/No Home/Away\t50%\t50%\t10%\t90%",
+        "Failed to Score Yes/No Home/Away\t10%\t90%\t30%\t70%",
+        "Conversion Rate\t14%\t10%",
+        "Wettquoten",
+        "1X2\t1.65 / 3.90 / 5.00",
+        "Over/Under 2.5\t1.75 / 2.05",
+        "BTTS Ja/Nein\t1.80 / 1.95",
+    ]
+)
+
+
+def load_fixtures(directory: str) -> List[str]:
+    """Liest alle .txt Tab-Exporte eines Verzeichnisses"""
+    return [
+        path.read_text(encoding="utf-8")
+        for path in sorted(Path(directory).glob("*.txt"))
+    ]
+
+
+def text_to_grid(text: str) -> List[List[str]]:
+    """Zerlegt einen Tab-Export in das Zellen-Raster der Sheets API"""
+    return [line.split("\t") for line in text.split("\n")]
+
+
+def benchmark_parser(texts: List[str], repeat: int = 10, grid: bool = False) -> Dict[str, float]:
+    """
+    Parst alle Texte repeat-mal und gibt die beste Runde zurück
+
+    Args:
+        texts: Tab-Exporte
+        repeat: Anzahl Messrunden
+        grid: True = Zellen-Raster über parse_grid() statt parse()
+
+    Returns:
+        Dictionary mit tabs, errors, best_seconds, us_per_tab, tabs_per_second
+    """
+    if grid:
+        inputs = [text_to_grid(text) for text in texts]
+        parse = DataParser.parse_grid
+    else:
+        inputs = texts
+        parse = DataParser.parse
+
+    errors = 0
+    for item in inputs:
+        try:
+            parse(DataParser(), item)
+        except Exception:
+            errors += 1
+
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for item in inputs:
+            try:
+                parse(DataParser(), item)
+            except Exception:
+                pass
+        best = min(best, time.perf_counter() - start)
+
+    n = max(len(texts), 1)
+    return {
+        "tabs": len(texts),
+        "errors": errors,
+        "best_seconds": best,
+        "us_per_tab": best / n * 1e6,
+        "tabs_per_second": n / best if best > 0 else 0.0,
+    }
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="DataParser Benchmark")
+    arg_parser.add_argument("fixtures", nargs="?", help="Verzeichnis mit .txt Tab-Exporten")
+    arg_parser.add_argument("--repeat", type=int, default=10)
+    arg_parser.add_argument("--grid", action="store_true", help="parse_grid() statt parse()")
+    args = arg_parser.parse_args()
+
+    texts = load_fixtures(args.fixtures) if args.fixtures else [SAMPLE_TAB] * 100
+    stats = benchmark_parser(texts, args.repeat, grid=args.grid)
+    print(
+        f"{stats['tabs']} Tabs ({stats['errors']} Fehler): "
+        f"{stats['us_per_tab']:.1f} µs/Tab, {stats['tabs_per_second']:.0f} Tabs/s"
+    )
@@ -0,0 +1,181 @@
+"""
+Persistenter Cache für Google Sheets Lesezugriffe
+
+SQLite-Datei mit Spreadsheet-Metadaten und Tab-Werten. Jeder Eintrag trägt
+die Drive-Version (modifiedTime + version) des Spreadsheets, aus dem er
+gelesen wurde; solange Drive dieselbe Version meldet, wird nichts neu
+heruntergeladen - auch nicht nach einem Neustart von Streamlit.
+
+Die Drive-Version wird pro Spreadsheet höchstens alle
+VERSION_CHECK_INTERVAL Sekunden abgefragt (files().get ist deutlich
+günstiger als values().get/batchGet für alle Tabs).
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_PATH = Path(
+    os.environ.get(
+        "SHEETS_CACHE_PATH",
+        Path.home() / ".cache" / "sportwetten" / "sheets_cache.sqlite3",
+    )
+)
+VERSION_CHECK_INTERVAL = 60.0  # Sekunden
+MAX_AGE_DAYS = 14  # ältere Einträge werden beim Öffnen entfernt
+
+
+class SheetsDiskCache:
+    """
+    Thread-sicherer, versionierter Key-Value-Cache pro Spreadsheet
+
+    Args:
+        path: SQLite-Datei (None = nur Versions-Gedächtnis, kein Disk-Cache)
+        version_check_interval: Sekunden, die eine Drive-Version gültig bleibt
+    """
+
+    def __init__(
+        self,
+        path: Optional[Path] = DEFAULT_CACHE_PATH,
+        version_check_interval: float = VERSION_CHECK_INTERVAL,
+    ):
+        self.path = path
+        self.version_check_interval = version_check_interval
+        self._versions: Dict[str, tuple] = {}
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self.hits = 0
+        self.misses = 0
+        if path is not None:
+            self._open(Path(path))
+
+    def _open(self, path: Path) -> None:
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(path), check_same_thread=False, timeout=5)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                " spreadsheet_id TEXT NOT NULL,"
+                " key TEXT NOT NULL,"
+                " version TEXT NOT NULL,"
+                " payload TEXT NOT NULL,"
+                " stored_at REAL NOT NULL,"
+                " PRIMARY KEY (spreadsheet_id, key))"
+            )
+            conn.execute(
+                "DELETE FROM entries WHERE stored_at < ?",
+                (time.time() - MAX_AGE_DAYS * 86400,),
+            )
+            conn.commit()
+            self._conn = conn
+        except (OSError, sqlite3.Error) as e:
+            logger.warning("Sheets Disk-Cache deaktiviert (%s): %s", path, e)
+            self._conn = None
+
+    @property
+    def enabled(self) -> bool:
+        return self._conn is not None
+
+    # ── Versionen ────────────────────────────────────────────
+
+    def note_version(self, spreadsheet_id: str, version: Optional[str]) -> None:
+        """Merkt eine bekannte Drive-Version (z.B. aus files().list)"""
+        if version:
+            with self._lock:
+                self._versions[spreadsheet_id] = (version, time.monotonic())
+
+    def version(
+        self, spreadsheet_id: str, fetch: Callable[[str], Optional[str]]
+    ) -> Optional[str]:
+        """
+        Aktuelle Version eines Spreadsheets (gemerkt oder über fetch geholt)
+
+        Args:
+            spreadsheet_id: Spreadsheet-ID
+            fetch: Holt die Version von Drive (None bei Fehler)
+        """
+        with self._lock:
+            known = self._versions.get(spreadsheet_id)
+        if known and time.monotonic() - known[1] < self.version_check_interval:
+            return known[0]
+        version = fetch(spreadsheet_id)
+        self.note_version(spreadsheet_id, version)
+        return version
+
+    def forget_versions(self) -> None:
+        """Erzwingt eine neue Versions-Prüfung bei allen Spreadsheets"""
+        with self._lock:
+            self._versions.clear()
+
+    # ── Einträge ─────────────────────────────────────────────
+
+    def get(self, spreadsheet_id: str, key: str, version: str) -> Optional[Any]:
+        """Eintrag, falls mit derselben Version gespeichert (sonst None)"""
+        if self._conn is None:
+            return None
+        with self._lock:
+            try:
+                row = self._conn.execute(
+                    "SELECT version, payload FROM entries"
+                    " WHERE spreadsheet_id = ? AND key = ?",
+                    (spreadsheet_id, key),
+                ).fetchone()
+            except sqlite3.Error as e:
+                logger.warning("Sheets Disk-Cache Lesefehler: %s", e)
+                row = None
+            if row is None or row[0] != version:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return json.loads(row[1])
+
+    def put(self, spreadsheet_id: str, key: str, version: str, value: Any) -> None:
+        if self._conn is None:
+            return
+        payload = json.dumps(value, ensure_ascii=False)
+        with self._lock:
+            try:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO entries"
+                    " (spreadsheet_id, key, version, payload, stored_at)"
+                    " VALUES (?, ?, ?, ?, ?)",
+                    (spreadsheet_id, key, version, payload, time.time()),
+                )
+                self._conn.commit()
+            except sqlite3.Error as e:
+                logger.warning("Sheets Disk-Cache Schreibfehler: %s", e)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._versions.clear()
+            if self._conn is not None:
+                self._conn.execute("DELETE FROM entries")
+                self._conn.commit()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict:
+        with self._lock:
+            size = 0
+            if self._conn is not None:
+                size = self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+            total = self.hits + self.misses
+            return {
+                "enabled": self._conn is not None,
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": size,
+                "hit_rate": round(self.hits / total, 3) if total else 0.0,
+            }
+
+
+# Eine Instanz pro Prozess (App-Sessions + Telegram-Bot-Thread)
+SHEETS_DISK_CACHE = SheetsDiskCache()
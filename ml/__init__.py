@@ -6,6 +6,14 @@ from .features import (
     create_position_features,
     encode_position_features,
     create_extended_features,
+    POSITION_FEATURE_NAMES,
+    EXTENDED_FEATURE_NAMES,
+    COMBINED_FEATURE_NAMES,
+    position_feature_matrix,
+    build_position_feature_matrix,
+    extended_feature_matrix,
+    combined_feature_matrix,
+    build_combined_feature_matrix,
 )
 from .position_ml import TablePositionML
 from .extended_ml import ExtendedMatchML
@@ -15,6 +23,14 @@ __all__ = [
     "create_position_features",
     "encode_position_features",
     "create_extended_features",
+    "POSITION_FEATURE_NAMES",
+    "EXTENDED_FEATURE_NAMES",
+    "COMBINED_FEATURE_NAMES",
+    "position_feature_matrix",
+    "build_position_feature_matrix",
+    "extended_feature_matrix",
+    "combined_feature_matrix",
+    "build_combined_feature_matrix",
     # ML Models
     "TablePositionML",
     "ExtendedMatchML",
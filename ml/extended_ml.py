@@ -4,7 +4,18 @@ Erweitertes ML-Modell mit In-Game Features
 
 import streamlit as st
 import numpy as np
-from typing import Dict, List
+from typing import Dict, List, Optional
+from data.models import ExtendedMatchData, TeamStats
+from ml.features import (
+    build_combined_feature_matrix,
+    COMBINED_EXTENDED_KEYS,
+    COMBINED_FEATURE_NAMES,
+    COMBINED_POSITION_KEYS,
+    MATCH_TYPE_EXTENDED_KEYS,
+    combined_feature_matrix,
+    feature_dict_columns,
+    float_column,
+)
 
 
 class ExtendedMatchML:
@@ -153,49 +164,85 @@ class ExtendedMatchML:
         else:
             return 0
 
+    def combined_feature_matrix(
+        self, position_features: List[Dict], extended_features: List[Dict]
+    ) -> np.ndarray:
+        """
+        Kombinierte Features vieler Matches als Matrix (Spalten in
+        COMBINED_FEATURE_NAMES, Werte wie create_combined_features)
+
+        Args:
+            position_features: Position-Features pro Match
+            extended_features: Extended-Features pro Match
+
+        Returns:
+            float64-Matrix (n_matches x len(COMBINED_FEATURE_NAMES))
+        """
+        return combined_feature_matrix(
+            feature_dict_columns(position_features, COMBINED_POSITION_KEYS),
+            feature_dict_columns(
+                extended_features, COMBINED_EXTENDED_KEYS + MATCH_TYPE_EXTENDED_KEYS
+            ),
+        )
+
     def prepare_extended_training_data(self, historical_matches_with_extended: List[Dict]):
         """
         Bereitet erweiterte Trainingsdaten vor
-        
+
+        Matches mit Rohdaten ("home_team", "away_team", "date",
+        "extended_data" als ExtendedMatchData, optional "actual_score")
+        laufen spaltenweise über build_combined_feature_matrix; Matches mit
+        fertigen "position_features"/"extended_features" Dictionaries über
+        deren Spalten. Matches ohne gültige Teams/Extended-Daten entfallen.
+
         Args:
             historical_matches_with_extended: Historische Matches mit Extended Data
             
         Returns:
             Tuple (X_train, y_train) als numpy arrays
         """
-        X_train = []
-        y_train = []
-
-        for match in historical_matches_with_extended:
-            try:
-                position_features = match.get("position_features", {})
-                extended_features = match.get("extended_features", {})
+        matches = historical_matches_with_extended
+        predicted_mu_home = float_column(matches, "predicted_mu_home", 1.5)
+        predicted_mu_away = float_column(matches, "predicted_mu_away", 1.5)
+        actual_mu_home = float_column(matches, "actual_mu_home", 1.5)
+        actual_mu_away = float_column(matches, "actual_mu_away", 1.5)
+        valid = (predicted_mu_home > 0) & (predicted_mu_away > 0)
+        valid &= np.isfinite(actual_mu_home) & np.isfinite(actual_mu_away)
+
+        X = np.zeros((len(matches), len(COMBINED_FEATURE_NAMES)), dtype=np.float64)
+        raw = np.fromiter(
+            ("extended_data" in match for match in matches), dtype=bool, count=len(matches)
+        )
+        rows = np.flatnonzero(raw)
+        if len(rows):
+            raw_matches = [matches[i] for i in rows]
+            X[rows], raw_valid = build_combined_feature_matrix(
+                [match.get("home_team", {}) for match in raw_matches],
+                [match.get("away_team", {}) for match in raw_matches],
+                [match.get("date", "") for match in raw_matches],
+                [match["extended_data"] for match in raw_matches],
+                [match.get("actual_score") for match in raw_matches],
+            )
+            valid[rows] &= raw_valid
+        rows = np.flatnonzero(~raw)
+        if len(rows):
+            X[rows] = self.combined_feature_matrix(
+                [matches[i].get("position_features", {}) for i in rows],
+                [matches[i].get("extended_features", {}) for i in rows],
+            )
 
-                combined_features = self.create_combined_features(
-                    position_features, extended_features
+        X_train = X[valid]
+        y_train = np.clip(
+            np.column_stack(
+                (
+                    actual_mu_home[valid] / predicted_mu_home[valid],
+                    actual_mu_away[valid] / predicted_mu_away[valid],
                 )
-
-                feature_vector = list(combined_features.values())
-
-                predicted_mu_home = match.get("predicted_mu_home", 1.5)
-                predicted_mu_away = match.get("predicted_mu_away", 1.5)
-                actual_mu_home = match.get("actual_mu_home", 1.5)
-                actual_mu_away = match.get("actual_mu_away", 1.5)
-
-                if predicted_mu_home > 0 and predicted_mu_away > 0:
-                    home_correction = actual_mu_home / predicted_mu_home
-                    away_correction = actual_mu_away / predicted_mu_away
-
-                    home_correction = max(0.5, min(2.0, home_correction))
-                    away_correction = max(0.5, min(2.0, away_correction))
-
-                    X_train.append(feature_vector)
-                    y_train.append([home_correction, away_correction])
-
-            except Exception as e:
-                continue
-
-        return np.array(X_train), np.array(y_train)
+            ),
+            0.5,
+            2.0,
+        )
+        return X_train, y_train
 
     def train(self, historical_matches_with_extended: List[Dict], min_matches: int = 20) -> Dict:
         """
@@ -266,12 +313,55 @@ class ExtendedMatchML:
                 "message": "Erweitertes Modell nicht trainiert",
             }
 
-        try:
-            combined_features = self.create_combined_features(
-                position_features, extended_features
-            )
+        return self._predict_matrix(
+            self.combined_feature_matrix([position_features], [extended_features])
+        )
+
+    def predict_with_match_data(
+        self,
+        home_team: TeamStats,
+        away_team: TeamStats,
+        match_date: str,
+        extended_data: ExtendedMatchData,
+        actual_score: Optional[str] = None,
+    ) -> Dict:
+        """
+        Wie predict_with_extended_data, aber direkt aus Teams und
+        ExtendedMatchData (build_combined_feature_matrix, ohne Feature-Dictionaries)
 
-            X_pred = np.array([list(combined_features.values())])
+        Args:
+            home_team: Heimteam Statistics
+            away_team: Auswärtsteam Statistics
+            match_date: Match-Datum
+            extended_data: Erweiterte Match-Daten
+            actual_score: Endstand "h:a" (optional)
+
+        Returns:
+            Dictionary mit Korrektur-Faktoren
+        """
+        if not self.is_trained:
+            return {
+                "home_correction": 1.0,
+                "away_correction": 1.0,
+                "confidence": 0.0,
+                "message": "Erweitertes Modell nicht trainiert",
+            }
+
+        X_pred, valid = build_combined_feature_matrix(
+            [home_team], [away_team], [match_date], [extended_data], [actual_score]
+        )
+        if not valid[0]:
+            return {
+                "home_correction": 1.0,
+                "away_correction": 1.0,
+                "confidence": 0.0,
+                "message": "Vorhersagefehler: Ungültige Team- oder Extended-Daten",
+            }
+        return self._predict_matrix(X_pred)
+
+    def _predict_matrix(self, X_pred: np.ndarray) -> Dict:
+        """Korrektur-Faktoren für eine Zeile von combined_feature_matrix"""
+        try:
             prediction = self.extended_model.predict(X_pred)[0]
 
             home_correction = float(prediction[0])
@@ -286,8 +376,8 @@ class ExtendedMatchML:
                 "home_correction": home_correction,
                 "away_correction": away_correction,
                 "confidence": confidence,
-                "features_used": len(combined_features),
-                "match_type": combined_features.get("match_type", 0),
+                "features_used": len(COMBINED_FEATURE_NAMES),
+                "match_type": int(X_pred[0, -1]),
             }
 
         except Exception as e:
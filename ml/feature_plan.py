@@ -0,0 +1,184 @@
+"""
+Kompilierter Feature-Plan für die Football ML-Models
+
+Statt pro Match ein Feature-Dictionary und daraus einen einzeiligen DataFrame (prepare_features) zu bauen, wird die
+Feature-Liste aus models/feature_config.json einmal in einen Plan übersetzt:
+jedes Feature bekommt einen festen Spaltenindex und eine Quelle auf
+MatchData/TeamStats. fill_row/build_matrix schreiben damit direkt in eine
+vorab angelegte float32-Zeile bzw. -Matrix.
+
+Features ohne Quelle werden nicht stillschweigend 0, sondern in
+FeaturePlan.missing aufgeführt (und beim Kompilieren einmal gemeldet).
+"""
+
+import logging
+from operator import attrgetter
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+FEATURE_DTYPE = np.float32
+
+# Feature-Suffix (nach "home_"/"away_") -> TeamStats-Attribut
+TEAM_FEATURE_SOURCES: Dict[str, str] = {
+    "position": "position",
+    "points": "points",
+    "goals_for": "goals_for",
+    "goals_against": "goals_against",
+    "wins": "wins",
+    "draws": "draws",
+    "losses": "losses",
+    "ppg_overall": "ppg_overall",
+    "goal_diff": "goal_diff",
+    "total_goals_for_ha": "ha_goals_for",
+    "total_goals_against_ha": "ha_goals_against",
+    "ppg_ha": "ppg_ha",
+    "last5_points": "form_points",
+    "last5_goals_for": "form_goals_for",
+    "last5_goals_against": "form_goals_against",
+    "avg_goals_scored_overall": "goals_scored_per_match",
+    "avg_goals_conceded_overall": "goals_conceded_per_match",
+}
+
+# Abgeleitete Team-Features: Suffix -> (Attribut a, Attribut b) mit Wert a - b
+TEAM_DERIVED_SOURCES: Dict[str, Tuple[str, str]] = {
+    "last5_goal_diff": ("form_goals_for", "form_goals_against"),
+}
+
+# Quoten-Features -> (MatchData-Attribut, Index im Tupel)
+ODDS_FEATURE_SOURCES: Dict[str, Tuple[str, int]] = {
+    "odds_home": ("odds_1x2", 0),
+    "odds_draw": ("odds_1x2", 1),
+    "odds_away": ("odds_1x2", 2),
+    "odds_over25": ("odds_ou25", 0),
+    "odds_under25": ("odds_ou25", 1),
+    "odds_btts_yes": ("odds_btts", 0),
+    "odds_btts_no": ("odds_btts", 1),
+}
+
+SIDES = ("home", "away")
+
+
+class _TeamBlock:
+    """Alle direkten Spalten einer Team-Seite: ein attrgetter, ein Fancy-Index-Store"""
+
+    __slots__ = ("side", "columns", "getter", "derived")
+
+    def __init__(self, side: str, columns: List[int], attrs: List[str], derived: List[Tuple[int, str, str]]):
+        self.side = side
+        self.columns = np.asarray(columns, dtype=np.intp)
+        self.getter = attrgetter(*attrs) if attrs else None
+        if len(attrs) == 1:
+            single = self.getter
+            self.getter = lambda team: (single(team),)
+        self.derived = derived
+
+
+class FeaturePlan:
+    """
+    Feste Abbildung Feature-Liste -> Spalten + Quellen auf MatchData
+
+    Args:
+        features: Feature-Namen in Model-Reihenfolge
+    """
+
+    def __init__(self, features: Sequence[str]):
+        self.features: Tuple[str, ...] = tuple(features)
+        self.index: Dict[str, int] = {name: i for i, name in enumerate(self.features)}
+
+        missing = []
+        team_columns = {side: ([], [], []) for side in SIDES}
+        odds: Dict[str, List[Tuple[int, int]]] = {}
+
+        for col, name in enumerate(self.features):
+            side, _, suffix = name.partition("_")
+            if side in SIDES and suffix in TEAM_FEATURE_SOURCES:
+                team_columns[side][0].append(col)
+                team_columns[side][1].append(TEAM_FEATURE_SOURCES[suffix])
+            elif side in SIDES and suffix in TEAM_DERIVED_SOURCES:
+                a, b = TEAM_DERIVED_SOURCES[suffix]
+                team_columns[side][2].append((col, a, b))
+            elif name in ODDS_FEATURE_SOURCES:
+                attr, pos = ODDS_FEATURE_SOURCES[name]
+                odds.setdefault(attr, []).append((col, pos))
+            else:
+                missing.append(name)
+
+        self._teams = [
+            _TeamBlock(side, cols, attrs, derived)
+            for side, (cols, attrs, derived) in team_columns.items()
+            if cols or derived
+        ]
+        self._odds = [
+            (attr, np.asarray([c for c, _ in pairs], dtype=np.intp), [p for _, p in pairs])
+            for attr, pairs in odds.items()
+        ]
+        self.missing: Tuple[str, ...] = tuple(missing)
+
+    @classmethod
+    def from_feature_list(cls, features: Sequence[str], label: str = "") -> "FeaturePlan":
+        """Kompiliert den Plan und meldet Features ohne Quelle einmalig"""
+        plan = cls(features)
+        if plan.missing:
+            logger.warning(
+                "Feature-Plan%s: %d von %d Features ohne Quelle in MatchData (Wert 0): %s",
+                f" ({label})" if label else "",
+                len(plan.missing),
+                len(plan.features),
+                ", ".join(plan.missing),
+            )
+        return plan
+
+    def __len__(self) -> int:
+        return len(self.features)
+
+    # ── Füllen ───────────────────────────────────────────────
+
+    def fill_row(self, match_data, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Schreibt die Features eines Matches in out (Länge len(plan))
+
+        Spalten ohne Quelle bzw. ohne Daten (Team fehlt, keine Quoten) sind 0.
+        """
+        if out is None:
+            out = np.zeros(len(self.features), dtype=FEATURE_DTYPE)
+        else:
+            out.fill(0)
+
+        for block in self._teams:
+            team = getattr(match_data, f"{block.side}_team", None)
+            if not team:
+                continue
+            if block.getter is not None:
+                out[block.columns] = block.getter(team)
+            for col, a, b in block.derived:
+                out[col] = getattr(team, a) - getattr(team, b)
+
+        for attr, columns, positions in self._odds:
+            values = getattr(match_data, attr, None)
+            if values:
+                out[columns] = [values[p] for p in positions]
+        return out
+
+    def build_matrix(self, matches: Iterable, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """Feature-Matrix (n_matches x len(plan)) für viele Matches"""
+        matches = list(matches)
+        if out is None:
+            out = np.zeros((len(matches), len(self.features)), dtype=FEATURE_DTYPE)
+        for i, match_data in enumerate(matches):
+            self.fill_row(match_data, out[i])
+        return out
+
+    def row_missing(self, match_data) -> List[str]:
+        """Features, die für dieses Match 0 bleiben (ohne Quelle oder ohne Daten)"""
+        missing = list(self.missing)
+        for block in self._teams:
+            if not getattr(match_data, f"{block.side}_team", None):
+                missing.extend(self.features[c] for c in block.columns)
+                missing.extend(self.features[c] for c, _, _ in block.derived)
+        for attr, columns, _ in self._odds:
+            if not getattr(match_data, attr, None):
+                missing.extend(self.features[c] for c in columns)
+        return missing
@@ -1,10 +1,23 @@
 """
 Feature Engineering für ML-Modelle
+
+Zwei Varianten mit identischen Werten:
+
+- create_position_features / encode_position_features / create_extended_features:
+  ein Dictionary pro Match (Einzel-Vorhersage, UI)
+- position_feature_matrix / extended_feature_matrix / combined_feature_matrix:
+  spaltenweise über viele Matches, Ergebnis ist eine 2D-Matrix mit fester
+  Spaltenreihenfolge (POSITION_FEATURE_NAMES, EXTENDED_FEATURE_NAMES,
+  COMBINED_FEATURE_NAMES) - für Trainingsdaten und Batch-Vorhersagen
 """
 
-from typing import Dict
+from operator import attrgetter
+from typing import Dict, Iterable, Mapping, Optional, Sequence, Tuple
 from datetime import datetime
-from data.models import TeamStats, ExtendedMatchData
+
+import numpy as np
+
+from data.models import TeamStats, TeamStatsRow, ExtendedMatchData
 
 
 def create_position_features(
@@ -350,3 +363,628 @@ def create_extended_features(extended_data: ExtendedMatchData, match_info: Dict)
         features["offensive_efficiency_away"] = 0
 
     return features
+
+
+# ─────────────────────────────────────────────
+# SPALTENWEISE FEATURES (viele Matches)
+# ─────────────────────────────────────────────
+
+TABLE_ZONES = (
+    "champions_league",
+    "europa_league",
+    "midfield",
+    "relegation_threat",
+    "direct_relegation",
+)
+
+# Reihenfolge wie encode_position_features
+POSITION_FEATURE_NAMES: Tuple[str, ...] = (
+    "home_position",
+    "away_position",
+    "position_diff",
+    "position_diff_abs",
+    "home_pos_norm",
+    "away_pos_norm",
+    "home_ppg",
+    "away_ppg",
+    "ppg_diff",
+    "ppg_diff_abs",
+    "season_progress",
+    "home_pressure",
+    "away_pressure",
+    "is_top_vs_bottom",
+    "is_midfield_clash",
+    "is_relegation_battle",
+    "month",
+    "is_second_half",
+    "is_final_month",
+) + tuple(f"{side}_zone_{i}" for side in ("home", "away") for i in range(len(TABLE_ZONES)))
+
+# TeamStats-Felder, die position_feature_matrix braucht
+POSITION_TEAM_FIELDS = ("position", "games", "points")
+
+# Reihenfolge wie create_extended_features (bei gültigem Halbzeit- und Endstand)
+EXTENDED_FEATURE_NAMES: Tuple[str, ...] = (
+    "halftime_home_goals",
+    "halftime_away_goals",
+    "halftime_total",
+    "halftime_lead",
+    "home_leading_at_ht",
+    "away_leading_at_ht",
+    "draw_at_halftime",
+    "second_half_goals_home",
+    "second_half_goals_away",
+    "comeback_occurred",
+    "possession_home",
+    "possession_away",
+    "possession_dominance",
+    "possession_category",
+    "shots_total_home",
+    "shots_total_away",
+    "shots_total",
+    "shots_on_target_home",
+    "shots_on_target_away",
+    "shots_on_target_total",
+    "shot_accuracy_home",
+    "shot_accuracy_away",
+    "shot_dominance",
+    "shot_on_target_dominance",
+    "shots_per_minute_home",
+    "shots_per_minute_away",
+    "corners_home",
+    "corners_away",
+    "corners_total",
+    "corner_dominance",
+    "corners_per_minute",
+    "corner_ratio_home",
+    "fouls_home",
+    "fouls_away",
+    "fouls_total",
+    "fouls_per_minute",
+    "yellow_cards_total",
+    "red_cards_total",
+    "cards_total",
+    "aggression_index_home",
+    "aggression_index_away",
+    "substitutions_home",
+    "substitutions_away",
+    "substitutions_total",
+    "expected_win_ratio_home",
+    "control_score",
+    "defensive_stability_home",
+    "defensive_stability_away",
+    "offensive_efficiency_home",
+    "offensive_efficiency_away",
+)
+
+# Numerische ExtendedMatchData-Felder
+EXTENDED_DATA_FIELDS = (
+    "possession_home",
+    "possession_away",
+    "shots_home",
+    "shots_away",
+    "shots_on_target_home",
+    "shots_on_target_away",
+    "corners_home",
+    "corners_away",
+    "fouls_home",
+    "fouls_away",
+    "yellow_cards_home",
+    "yellow_cards_away",
+    "red_cards_home",
+    "red_cards_away",
+    "substitutions_home",
+    "substitutions_away",
+)
+
+# Eingänge von ExtendedMatchML.create_combined_features
+COMBINED_POSITION_KEYS = (
+    "home_position",
+    "away_position",
+    "position_diff",
+    "position_diff_abs",
+    "home_ppg",
+    "away_ppg",
+    "ppg_diff",
+    "ppg_diff_abs",
+    "season_progress",
+    "home_pressure",
+    "away_pressure",
+)
+COMBINED_EXTENDED_KEYS = (
+    "halftime_lead",
+    "home_leading_at_ht",
+    "possession_dominance",
+    "shot_dominance",
+    "shot_on_target_dominance",
+    "corner_dominance",
+    "control_score",
+    "defensive_stability_home",
+    "defensive_stability_away",
+    "offensive_efficiency_home",
+    "offensive_efficiency_away",
+)
+# zusätzlich von classify_match_type gelesen
+MATCH_TYPE_EXTENDED_KEYS = ("fouls_total", "shots_total")
+
+COMBINED_FEATURE_NAMES: Tuple[str, ...] = (
+    tuple(f"pos_{key}" for key in COMBINED_POSITION_KEYS)
+    + tuple(f"ext_{key}" for key in COMBINED_EXTENDED_KEYS)
+    + ("interaction_top_possession", "interaction_pressure_halftime", "match_type")
+)
+
+
+def team_stat_columns(
+    teams: Sequence, fields: Sequence[str] = POSITION_TEAM_FIELDS
+) -> Tuple[Dict[str, np.ndarray], np.ndarray]:
+    """
+    Sammelt TeamStats-Felder vieler Teams als Spalten
+
+    Zeilen-Ansichten (TeamStatsRow) in einen gemeinsamen TeamStatsBatch (wie
+    aus load_historical_matches_from_sheets) werden per Fancy-Index direkt aus
+    dem Batch gelesen, alles andere per Attribut.
+
+    Args:
+        teams: TeamStats / TeamStatsRow (ungültige Einträge wie None oder {} erlaubt)
+        fields: TeamStats-Felder
+
+    Returns:
+        Tuple (Feld -> Spalte, Maske gültiger Teams); ungültige Zeilen sind 0
+    """
+    teams = list(teams)
+    n = len(teams)
+    values = np.zeros((n, len(fields)), dtype=np.float64)
+    valid = np.zeros(n, dtype=bool)
+
+    batch = next((team.batch for team in teams if type(team) is TeamStatsRow), None)
+    in_batch = np.fromiter(
+        (type(team) is TeamStatsRow and team.batch is batch for team in teams), dtype=bool, count=n
+    )
+    if in_batch.any():
+        rows = np.flatnonzero(in_batch)
+        data = batch.data[np.fromiter((teams[i].index for i in rows), np.intp, len(rows))]
+        for j, name in enumerate(fields):
+            values[rows, j] = data[name]
+        valid[rows] = True
+
+    getter = attrgetter(*fields)
+    single = len(fields) == 1
+    for i in np.flatnonzero(~in_batch):
+        try:
+            values[i] = (getter(teams[i]),) if single else getter(teams[i])
+        except (AttributeError, TypeError, ValueError):
+            values[i] = 0
+            continue
+        valid[i] = True
+    return {name: values[:, j] for j, name in enumerate(fields)}, valid
+
+
+def _date_months(match_dates: Iterable) -> np.ndarray:
+    """Monat pro Datum (YYYY-MM-DD), 0 wenn nicht lesbar - jedes Datum nur einmal geparst"""
+    cache: Dict[str, int] = {}
+
+    def month(match_date) -> int:
+        try:
+            return cache[match_date]
+        except KeyError:
+            pass
+        except TypeError:  # nicht hashbar
+            return 0
+        try:
+            value = datetime.strptime(match_date, "%Y-%m-%d").month
+        except Exception:
+            value = 0
+        cache[match_date] = value
+        return value
+
+    return np.fromiter((month(d) for d in match_dates), dtype=np.int64)
+
+
+def _pressure(position: np.ndarray, late_season: np.ndarray, total_teams: int) -> np.ndarray:
+    """calculate_pressure aus create_position_features, spaltenweise"""
+    pressure = np.where(
+        position >= total_teams - 2, 0.8, np.where(position >= total_teams - 4, 0.5, 0.0)
+    )
+    pressure = np.where(position <= 3, pressure + 0.4, pressure)
+    pressure = np.where(late_season, pressure * 1.3, pressure)
+    return np.minimum(1.0, pressure)
+
+
+def _table_zone(position: np.ndarray, total_teams: int) -> np.ndarray:
+    """Index in TABLE_ZONES (get_table_zone aus create_position_features)"""
+    return np.select(
+        [position <= 3, position <= 6, position <= total_teams - 4, position <= total_teams - 2],
+        [0, 1, 2, 3],
+        default=4,
+    )
+
+
+def position_feature_matrix(
+    home: Mapping[str, np.ndarray],
+    away: Mapping[str, np.ndarray],
+    match_dates: Sequence[str],
+    total_teams: int = 18,
+) -> np.ndarray:
+    """
+    Encodierte Position-Features vieler Matches als Matrix
+
+    Gleiche Werte wie encode_position_features(create_position_features(...)),
+    Spalten in POSITION_FEATURE_NAMES.
+
+    Args:
+        home: Heimteam-Spalten position, games, points (z.B. aus
+            team_stat_columns oder TeamStatsBatch.data)
+        away: Auswärtsteam-Spalten
+        match_dates: Datum pro Match (YYYY-MM-DD)
+        total_teams: Anzahl Teams in der Liga
+
+    Returns:
+        float64-Matrix (n_matches x len(POSITION_FEATURE_NAMES))
+    """
+    home_pos = np.asarray(home["position"], dtype=np.float64)
+    away_pos = np.asarray(away["position"], dtype=np.float64)
+    home_games = np.asarray(home["games"], dtype=np.float64)
+    away_games = np.asarray(away["games"], dtype=np.float64)
+
+    n = len(home_pos)
+    out = np.zeros((n, len(POSITION_FEATURE_NAMES)), dtype=np.float64)
+    col = {name: i for i, name in enumerate(POSITION_FEATURE_NAMES)}
+
+    out[:, col["home_position"]] = home_pos
+    out[:, col["away_position"]] = away_pos
+    position_diff = home_pos - away_pos
+    out[:, col["position_diff"]] = position_diff
+    out[:, col["position_diff_abs"]] = np.abs(position_diff)
+
+    out[:, col["home_pos_norm"]] = (home_pos - 1) / (total_teams - 1)
+    out[:, col["away_pos_norm"]] = (away_pos - 1) / (total_teams - 1)
+
+    home_ppg = np.asarray(home["points"], dtype=np.float64) / np.maximum(home_games, 1)
+    away_ppg = np.asarray(away["points"], dtype=np.float64) / np.maximum(away_games, 1)
+    out[:, col["home_ppg"]] = home_ppg
+    out[:, col["away_ppg"]] = away_ppg
+    ppg_diff = home_ppg - away_ppg
+    out[:, col["ppg_diff"]] = ppg_diff
+    out[:, col["ppg_diff_abs"]] = np.abs(ppg_diff)
+
+    season_progress = home_games / 34
+    out[:, col["season_progress"]] = season_progress
+    late_season = season_progress > 0.75
+    out[:, col["home_pressure"]] = _pressure(home_pos, late_season, total_teams)
+    out[:, col["away_pressure"]] = _pressure(away_pos, late_season, total_teams)
+
+    out[:, col["is_top_vs_bottom"]] = (home_pos <= 3) & (away_pos >= total_teams - 3)
+    out[:, col["is_midfield_clash"]] = (
+        (home_pos >= 6) & (home_pos <= 12) & (away_pos >= 6) & (away_pos <= 12)
+    )
+    out[:, col["is_relegation_battle"]] = (home_pos >= total_teams - 4) & (
+        away_pos >= total_teams - 4
+    )
+
+    month = _date_months(match_dates)
+    out[:, col["month"]] = month
+    out[:, col["is_second_half"]] = month >= 1
+    out[:, col["is_final_month"]] = month == 5
+
+    rows = np.arange(n)
+    out[rows, col["home_zone_0"] + _table_zone(home_pos, total_teams)] = 1
+    out[rows, col["away_zone_0"] + _table_zone(away_pos, total_teams)] = 1
+    return out
+
+
+def build_position_feature_matrix(
+    home_teams: Sequence,
+    away_teams: Sequence,
+    match_dates: Sequence[str],
+    total_teams: int = 18,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    position_feature_matrix direkt aus TeamStats / TeamStatsRow
+
+    Returns:
+        Tuple (Matrix, Maske der Matches mit gültigen Teams); Zeilen ohne
+        gültige Teams sind nicht aussagekräftig
+    """
+    home, home_valid = team_stat_columns(home_teams)
+    away, away_valid = team_stat_columns(away_teams)
+    return position_feature_matrix(home, away, match_dates, total_teams), home_valid & away_valid
+
+
+def extended_data_columns(
+    extended_data: Sequence[ExtendedMatchData],
+) -> Tuple[Dict[str, np.ndarray], np.ndarray]:
+    """
+    Numerische ExtendedMatchData-Felder vieler Matches als Spalten
+
+    Returns:
+        Tuple (Feld -> Spalte, Maske gültiger Einträge); ungültige Zeilen
+        (None, fehlende/nicht numerische Felder) sind 0
+    """
+    getter = attrgetter(*EXTENDED_DATA_FIELDS)
+    zeros = (0,) * len(EXTENDED_DATA_FIELDS)
+    rows = []
+    valid = np.zeros(len(extended_data), dtype=bool)
+    for i, data in enumerate(extended_data):
+        try:
+            row = tuple(map(float, getter(data)))
+        except (AttributeError, TypeError, ValueError):
+            rows.append(zeros)
+            continue
+        rows.append(row)
+        valid[i] = True
+    values = np.array(rows, dtype=np.float64).reshape(len(rows), len(EXTENDED_DATA_FIELDS))
+    return {name: values[:, j] for j, name in enumerate(EXTENDED_DATA_FIELDS)}, valid
+
+
+def _score_columns(scores: Iterable) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Spielstände "h:a" -> (Heimtore, Auswärtstore, lesbar) - jeder Stand nur einmal geparst"""
+    cache: Dict[str, Tuple[int, int, bool]] = {}
+
+    def parse(score) -> Tuple[int, int, bool]:
+        try:
+            return cache[score]
+        except KeyError:
+            pass
+        except TypeError:
+            return 0, 0, False
+        try:
+            home_goals, away_goals = map(int, score.split(":"))
+            value = (home_goals, away_goals, True)
+        except Exception:
+            value = (0, 0, False)
+        cache[score] = value
+        return value
+
+    parsed = [parse(score) for score in scores]
+    if not parsed:
+        return np.zeros(0), np.zeros(0), np.zeros(0, dtype=bool)
+    home_goals, away_goals, ok = zip(*parsed)
+    return (
+        np.asarray(home_goals, dtype=np.float64),
+        np.asarray(away_goals, dtype=np.float64),
+        np.asarray(ok, dtype=bool),
+    )
+
+
+def extended_feature_matrix(
+    columns: Mapping[str, np.ndarray],
+    halftime_scores: Sequence[str],
+    actual_scores: Optional[Sequence[Optional[str]]] = None,
+) -> np.ndarray:
+    """
+    Extended Features vieler Matches als Matrix
+
+    Gleiche Werte wie create_extended_features, Spalten in
+    EXTENDED_FEATURE_NAMES. Features, die das Dictionary weglässt
+    (second_half_goals_*, comeback_occurred ohne lesbaren Halbzeit- bzw.
+    Endstand), sind hier 0.
+
+    Args:
+        columns: Spalten EXTENDED_DATA_FIELDS (z.B. aus extended_data_columns)
+        halftime_scores: Halbzeitstand "h:a" pro Match
+        actual_scores: Endstand "h:a" pro Match (None = nicht vorhanden)
+
+    Returns:
+        float64-Matrix (n_matches x len(EXTENDED_FEATURE_NAMES))
+    """
+    c = {name: np.asarray(columns[name], dtype=np.float64) for name in EXTENDED_DATA_FIELDS}
+    n = len(halftime_scores)
+    out = np.zeros((n, len(EXTENDED_FEATURE_NAMES)), dtype=np.float64)
+    f = {}
+
+    ht_home, ht_away, ht_ok = _score_columns(halftime_scores)
+    f["halftime_home_goals"] = ht_home
+    f["halftime_away_goals"] = ht_away
+    f["halftime_total"] = ht_home + ht_away
+    f["halftime_lead"] = ht_home - ht_away
+    f["home_leading_at_ht"] = ht_ok & (ht_home > ht_away)
+    f["away_leading_at_ht"] = ht_ok & (ht_away > ht_home)
+    f["draw_at_halftime"] = ht_ok & (ht_home == ht_away)
+
+    if actual_scores is not None:
+        ft_home, ft_away, ft_ok = _score_columns(actual_scores)
+        second_half = ht_ok & ft_ok
+        f["second_half_goals_home"] = np.where(second_half, ft_home - ht_home, 0.0)
+        f["second_half_goals_away"] = np.where(second_half, ft_away - ht_away, 0.0)
+        f["comeback_occurred"] = second_half & (
+            ((ht_home < ht_away) & (ft_home > ft_away))
+            | ((ht_home > ht_away) & (ft_home < ft_away))
+        )
+        goals_home = ht_home + f["second_half_goals_home"]
+        goals_away = ht_away + f["second_half_goals_away"]
+    else:
+        goals_home, goals_away = ht_home, ht_away
+
+    possession_home = c["possession_home"]
+    f["possession_home"] = possession_home
+    f["possession_away"] = c["possession_away"]
+    f["possession_dominance"] = possession_home - c["possession_away"]
+    f["possession_category"] = np.select(
+        [possession_home > 60, possession_home > 55, possession_home > 45, possession_home > 40],
+        [2, 1, 0, -1],
+        default=-2,
+    )
+
+    shots_home, shots_away = c["shots_home"], c["shots_away"]
+    on_target_home, on_target_away = c["shots_on_target_home"], c["shots_on_target_away"]
+    f["shots_total_home"] = shots_home
+    f["shots_total_away"] = shots_away
+    f["shots_total"] = shots_home + shots_away
+    f["shots_on_target_home"] = on_target_home
+    f["shots_on_target_away"] = on_target_away
+    on_target_total = on_target_home + on_target_away
+    f["shots_on_target_total"] = on_target_total
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        f["shot_accuracy_home"] = np.where(shots_home > 0, on_target_home / shots_home, 0.0)
+        f["shot_accuracy_away"] = np.where(shots_away > 0, on_target_away / shots_away, 0.0)
+    f["shot_dominance"] = shots_home - shots_away
+    f["shot_on_target_dominance"] = on_target_home - on_target_away
+    f["shots_per_minute_home"] = shots_home / 90
+    f["shots_per_minute_away"] = shots_away / 90
+
+    corners_home, corners_away = c["corners_home"], c["corners_away"]
+    corners_total = corners_home + corners_away
+    f["corners_home"] = corners_home
+    f["corners_away"] = corners_away
+    f["corners_total"] = corners_total
+    f["corner_dominance"] = corners_home - corners_away
+    f["corners_per_minute"] = corners_total / 90
+    with np.errstate(divide="ignore", invalid="ignore"):
+        f["corner_ratio_home"] = np.where(corners_total > 0, corners_home / corners_total, 0.5)
+
+    f["fouls_home"] = c["fouls_home"]
+    f["fouls_away"] = c["fouls_away"]
+    fouls_total = c["fouls_home"] + c["fouls_away"]
+    f["fouls_total"] = fouls_total
+    f["fouls_per_minute"] = fouls_total / 90
+    f["yellow_cards_total"] = c["yellow_cards_home"] + c["yellow_cards_away"]
+    f["red_cards_total"] = c["red_cards_home"] + c["red_cards_away"]
+    f["cards_total"] = f["yellow_cards_total"] + f["red_cards_total"]
+    f["aggression_index_home"] = (
+        c["fouls_home"] + c["yellow_cards_home"] * 2 + c["red_cards_home"] * 5
+    ) / 90
+    f["aggression_index_away"] = (
+        c["fouls_away"] + c["yellow_cards_away"] * 2 + c["red_cards_away"] * 5
+    ) / 90
+
+    f["substitutions_home"] = c["substitutions_home"]
+    f["substitutions_away"] = c["substitutions_away"]
+    f["substitutions_total"] = c["substitutions_home"] + c["substitutions_away"]
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        f["expected_win_ratio_home"] = np.where(
+            on_target_total > 0, on_target_home / on_target_total, 0.5
+        )
+    f["control_score"] = (
+        f["possession_dominance"] * 0.3
+        + f["shot_dominance"] * 0.3
+        + f["corner_dominance"] * 0.2
+        + f["halftime_lead"] * 0.2
+    ) / 10
+    f["defensive_stability_home"] = 1 / (on_target_away + 1) * 100
+    f["defensive_stability_away"] = 1 / (on_target_home + 1) * 100
+    with np.errstate(divide="ignore", invalid="ignore"):
+        f["offensive_efficiency_home"] = np.where(
+            shots_home > 0, goals_home / shots_home * 100, 0.0
+        )
+        f["offensive_efficiency_away"] = np.where(
+            shots_away > 0, goals_away / shots_away * 100, 0.0
+        )
+
+    for j, name in enumerate(EXTENDED_FEATURE_NAMES):
+        if name in f:
+            out[:, j] = f[name]
+    return out
+
+
+def feature_dict_columns(
+    feature_dicts: Sequence[Mapping], names: Sequence[str]
+) -> Dict[str, np.ndarray]:
+    """Ausgewählte Features aus Feature-Dictionaries als Spalten (fehlende Keys = 0)"""
+    n = len(feature_dicts)
+    return {
+        name: np.fromiter((d.get(name, 0) for d in feature_dicts), dtype=np.float64, count=n)
+        for name in names
+    }
+
+
+def float_column(records: Sequence[Mapping], key: str, default: float) -> np.ndarray:
+    """Zahlenwert key aller Dictionaries als Spalte; Unlesbares wird NaN"""
+    raw = [record.get(key, default) for record in records]
+    try:
+        return np.array(raw, dtype=np.float64).reshape(len(raw))
+    except (TypeError, ValueError):
+        pass
+
+    def value(item) -> float:
+        try:
+            return float(item)
+        except (TypeError, ValueError):
+            return float("nan")
+
+    return np.fromiter((value(item) for item in raw), dtype=np.float64, count=len(raw))
+
+
+def feature_matrix_columns(matrix: np.ndarray, names: Sequence[str]) -> Dict[str, np.ndarray]:
+    """Matrix mit Spalten names als Dictionary Name -> Spalte (Views)"""
+    return {name: matrix[:, j] for j, name in enumerate(names)}
+
+
+def combined_feature_matrix(
+    position: Mapping[str, np.ndarray], extended: Mapping[str, np.ndarray]
+) -> np.ndarray:
+    """
+    Kombinierte Features von ExtendedMatchML als Matrix
+
+    Gleiche Werte wie ExtendedMatchML.create_combined_features (bei
+    vollständigen Feature-Dictionaries), Spalten in COMBINED_FEATURE_NAMES.
+
+    Args:
+        position: Spalten COMBINED_POSITION_KEYS (z.B. feature_matrix_columns
+            über position_feature_matrix)
+        extended: Spalten COMBINED_EXTENDED_KEYS + MATCH_TYPE_EXTENDED_KEYS
+
+    Returns:
+        float64-Matrix (n_matches x len(COMBINED_FEATURE_NAMES))
+    """
+    n = len(position[COMBINED_POSITION_KEYS[0]])
+    out = np.empty((n, len(COMBINED_FEATURE_NAMES)), dtype=np.float64)
+    j = 0
+    for key in COMBINED_POSITION_KEYS:
+        out[:, j] = position[key]
+        j += 1
+    for key in COMBINED_EXTENDED_KEYS:
+        out[:, j] = extended[key]
+        j += 1
+
+    home_position = np.asarray(position["home_position"], dtype=np.float64)
+    possession = np.asarray(extended["possession_dominance"], dtype=np.float64)
+    halftime_lead = np.asarray(extended["halftime_lead"], dtype=np.float64)
+    shots_diff = np.asarray(extended["shot_dominance"], dtype=np.float64)
+
+    out[:, j] = (home_position <= 3) & (possession > 10)
+    out[:, j + 1] = np.asarray(position["home_pressure"], dtype=np.float64) * (halftime_lead > 0)
+    # classify_match_type
+    out[:, j + 2] = np.select(
+        [
+            (np.abs(possession) > 15) & (np.abs(shots_diff) > 8),
+            np.asarray(extended["fouls_total"], dtype=np.float64) > 25,
+            np.asarray(extended["shots_total"], dtype=np.float64) > 30,
+            np.abs(halftime_lead) > 2,
+        ],
+        [1, 2, 3, 4],
+        default=0,
+    )
+    return out
+
+
+def build_combined_feature_matrix(
+    home_teams: Sequence,
+    away_teams: Sequence,
+    match_dates: Sequence[str],
+    extended_data: Sequence[ExtendedMatchData],
+    actual_scores: Optional[Sequence[Optional[str]]] = None,
+    total_teams: int = 18,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    combined_feature_matrix direkt aus Teams + ExtendedMatchData, ohne
+    Feature-Dictionaries (position_feature_matrix + extended_feature_matrix)
+
+    Returns:
+        Tuple (Matrix, Maske der Matches mit gültigen Teams und Extended-Daten)
+    """
+    position, valid = build_position_feature_matrix(
+        home_teams, away_teams, match_dates, total_teams
+    )
+    columns, extended_valid = extended_data_columns(extended_data)
+    extended = extended_feature_matrix(
+        columns,
+        [getattr(data, "halftime_score", None) for data in extended_data],
+        actual_scores,
+    )
+    combined = combined_feature_matrix(
+        feature_matrix_columns(position, POSITION_FEATURE_NAMES),
+        feature_matrix_columns(extended, EXTENDED_FEATURE_NAMES),
+    )
+    return combined, valid & extended_valid
@@ -3,12 +3,19 @@ Football ML Models Integration
 Lädt und nutzt trainierte XGBoost/RandomForest Models
 """
 
-import pickle
 import json
+import threading
 import pandas as pd
 import numpy as np
 from pathlib import Path
-from typing import Dict, Tuple, Optional
+from typing import Dict, List, Tuple, Optional
+
+from ml.feature_plan import FeaturePlan
+from ml.model_store import MODEL_NAMES, VARIANTS, LazyModels, find_model_file
+from ml.tree_engine import FlatTreeEnsemble, build_engine
+
+# Batch-/MatchData-Predictions über die NumPy Tree-Engine (validiert gegen predict_proba)
+USE_TREE_ENGINE = True
 
 
 class FootballMLModels:
@@ -32,9 +39,20 @@ class FootballMLModels:
         # Config
         self.feature_config = {}
         
-    def load_models(self) -> bool:
+        self._warm_up_thread = None
+        self._feature_plans: Dict[bool, FeaturePlan] = {}
+        self._engines: Dict[int, Tuple[object, Optional[FlatTreeEnsemble]]] = {}
+        
+    def load_models(self, lazy: bool = True) -> bool:
         """
-        Lädt alle gespeicherten Models und Konfigurationen
+        Lädt Konfiguration und registriert alle vorhandenen Models
+        
+        Models werden standardmäßig erst beim ersten Zugriff geladen (siehe
+        ml.model_store.LazyModels); native Formate (.ubj/.json/.npz) haben
+        Vorrang vor .pkl.
+        
+        Args:
+            lazy: False = alle Models sofort laden
         
         Returns:
             True wenn erfolgreich, False bei Fehler
@@ -48,29 +66,20 @@ class FootballMLModels:
                     self.features_with_odds = self.feature_config.get('features_with_odds', [])
                     self.features_no_odds = self.feature_config.get('features_no_odds', [])
             
-            # Lade Models MIT Quoten
-            models_with = {
-                'over_under': self.models_dir / 'over_under_with_odds.pkl',
-                '1x2': self.models_dir / '1x2_with_odds.pkl',
-                'btts': self.models_dir / 'btts_with_odds.pkl'
-            }
-            
-            for name, path in models_with.items():
-                if path.exists():
-                    with open(path, 'rb') as f:
-                        self.models_with_odds[name] = pickle.load(f)
-            
-            # Lade Models OHNE Quoten
-            models_no = {
-                'over_under': self.models_dir / 'over_under_no_odds.pkl',
-                '1x2': self.models_dir / '1x2_no_odds.pkl',
-                'btts': self.models_dir / 'btts_no_odds.pkl'
-            }
-            
-            for name, path in models_no.items():
-                if path.exists():
-                    with open(path, 'rb') as f:
-                        self.models_no_odds[name] = pickle.load(f)
+            # Models MIT / OHNE Quoten
+            for variant in VARIANTS:
+                paths = {}
+                for name in MODEL_NAMES:
+                    path = find_model_file(self.models_dir, name, variant)
+                    if path is not None:
+                        paths[name] = path
+                models = LazyModels(paths)
+                if not lazy:
+                    models.load_all()
+                if variant == 'with_odds':
+                    self.models_with_odds = models
+                else:
+                    self.models_no_odds = models
             
             self.models_loaded = (
                 len(self.models_with_odds) > 0 or 
@@ -83,6 +92,38 @@ class FootballMLModels:
             print(f"Fehler beim Laden der Models: {e}")
             return False
     
+    def warm_up(self, background: bool = True) -> Optional[threading.Thread]:
+        """
+        Lädt alle registrierten Models und ihre Tree-Engines vorab (z.B. direkt
+        nach dem App-Start)
+        
+        Args:
+            background: True = in einem Daemon-Thread, False = blockierend
+        
+        Returns:
+            Der (einmalig gestartete) Warm-up Thread, None wenn blockierend
+        """
+        def _load():
+            for models in (self.models_with_odds, self.models_no_odds):
+                if isinstance(models, LazyModels):
+                    models.load_all()
+                for name in list(models):
+                    model = models.get(name)
+                    if model is not None:
+                        self._engine_for(model)
+        
+        if not background:
+            _load()
+            return None
+        
+        with _warm_up_lock:
+            if self._warm_up_thread is None:
+                self._warm_up_thread = threading.Thread(
+                    target=_load, daemon=True, name="MLWarmUp"
+                )
+                self._warm_up_thread.start()
+        return self._warm_up_thread
+    
     def prepare_features(self, match_data: Dict, use_odds: bool = True) -> Optional[pd.DataFrame]:
         """
         Bereitet Features für Prediction vor
@@ -120,6 +161,39 @@ class FootballMLModels:
             print(f"Fehler bei Feature-Vorbereitung: {e}")
             return None
     
+    @staticmethod
+    def _over_under_result(prediction, probabilities) -> Dict:
+        return {
+            'prediction': 'OVER 2.5' if prediction == 1 else 'UNDER 2.5',
+            'prediction_value': int(prediction),
+            'confidence': float(probabilities[prediction]) * 100,
+            'prob_under': float(probabilities[0]) * 100,
+            'prob_over': float(probabilities[1]) * 100,
+        }
+    
+    @staticmethod
+    def _1x2_result(prediction, probabilities) -> Dict:
+        labels = {0: 'DRAW', 1: 'HOME WIN', 2: 'AWAY WIN'}
+        
+        return {
+            'prediction': labels[prediction],
+            'prediction_value': int(prediction),
+            'confidence': float(probabilities[prediction]) * 100,
+            'prob_draw': float(probabilities[0]) * 100,
+            'prob_home': float(probabilities[1]) * 100,
+            'prob_away': float(probabilities[2]) * 100,
+        }
+    
+    @staticmethod
+    def _btts_result(prediction, probabilities) -> Dict:
+        return {
+            'prediction': 'BTTS YES' if prediction == 1 else 'BTTS NO',
+            'prediction_value': int(prediction),
+            'confidence': float(probabilities[prediction]) * 100,
+            'prob_no': float(probabilities[0]) * 100,
+            'prob_yes': float(probabilities[1]) * 100,
+        }
+    
     def predict_over_under(
         self, 
         match_data: Dict, 
@@ -151,15 +225,7 @@ class FootballMLModels:
             prediction = model.predict(X)[0]
             probabilities = model.predict_proba(X)[0]
             
-            result = {
-                'prediction': 'OVER 2.5' if prediction == 1 else 'UNDER 2.5',
-                'prediction_value': int(prediction),
-                'confidence': float(probabilities[prediction]) * 100,
-                'prob_under': float(probabilities[0]) * 100,
-                'prob_over': float(probabilities[1]) * 100,
-            }
-            
-            return result
+            return self._over_under_result(prediction, probabilities)
             
         except Exception as e:
             print(f"Fehler bei Over/Under Prediction: {e}")
@@ -196,18 +262,7 @@ class FootballMLModels:
             prediction = model.predict(X)[0]
             probabilities = model.predict_proba(X)[0]
             
-            labels = {0: 'DRAW', 1: 'HOME WIN', 2: 'AWAY WIN'}
-            
-            result = {
-                'prediction': labels[prediction],
-                'prediction_value': int(prediction),
-                'confidence': float(probabilities[prediction]) * 100,
-                'prob_draw': float(probabilities[0]) * 100,
-                'prob_home': float(probabilities[1]) * 100,
-                'prob_away': float(probabilities[2]) * 100,
-            }
-            
-            return result
+            return self._1x2_result(prediction, probabilities)
             
         except Exception as e:
             print(f"Fehler bei 1X2 Prediction: {e}")
@@ -244,15 +299,7 @@ class FootballMLModels:
             prediction = model.predict(X)[0]
             probabilities = model.predict_proba(X)[0]
             
-            result = {
-                'prediction': 'BTTS YES' if prediction == 1 else 'BTTS NO',
-                'prediction_value': int(prediction),
-                'confidence': float(probabilities[prediction]) * 100,
-                'prob_no': float(probabilities[0]) * 100,
-                'prob_yes': float(probabilities[1]) * 100,
-            }
-            
-            return result
+            return self._btts_result(prediction, probabilities)
             
         except Exception as e:
             print(f"Fehler bei BTTS Prediction: {e}")
@@ -280,6 +327,161 @@ class FootballMLModels:
             'version': 'MIT Quoten' if use_odds else 'OHNE Quoten (Echter Edge)'
         }
     
+    def prepare_feature_matrix(
+        self,
+        matches: List[Dict],
+        use_odds: bool = True
+    ) -> Optional[np.ndarray]:
+        """
+        Feature-Matrix (n_matches x n_features) für viele Matches auf einmal
+        
+        Gleiche Feature-Reihenfolge und Defaults (0) wie prepare_features.
+        
+        Args:
+            matches: Liste von Match-Dictionaries
+            use_odds: True = mit Quoten, False = ohne Quoten
+            
+        Returns:
+            float64-Matrix oder None (keine Feature-Liste / nicht numerisch)
+        """
+        features = self.features_with_odds if use_odds else self.features_no_odds
+        if not features:
+            return None
+        
+        try:
+            X = np.zeros((len(matches), len(features)), dtype=np.float64)
+            for i, match_data in enumerate(matches):
+                X[i] = [match_data.get(feature, 0) for feature in features]
+            return X
+        except (TypeError, ValueError) as e:
+            print(f"Fehler bei Feature-Matrix: {e}")
+            return None
+    
+    def _engine_for(self, model) -> Optional[FlatTreeEnsemble]:
+        """Geprüfte NumPy-Inferenz für ein Model (einmal pro Model gebaut, None = Original nutzen)"""
+        if not USE_TREE_ENGINE:
+            return None
+        entry = self._engines.get(id(model))
+        if entry is None or entry[0] is not model:
+            entry = (model, build_engine(model))
+            self._engines[id(model)] = entry
+        return entry[1]
+    
+    def _batch_proba(self, model, X: np.ndarray, features: List[str]) -> np.ndarray:
+        """
+        predict_proba für die ganze Matrix - über die Tree-Engine, sonst das
+        Model selbst (mit Spaltennamen, falls es mit Namen trainiert wurde)
+        """
+        engine = self._engine_for(model)
+        if engine is not None:
+            return engine.predict_proba(X)
+        if hasattr(model, 'feature_names_in_'):
+            X = pd.DataFrame(X, columns=features, copy=False)
+        return np.asarray(model.predict_proba(X))
+    
+    def predict_all_batch(
+        self,
+        matches: List[Dict],
+        use_odds: bool = True
+    ) -> List[Dict]:
+        """
+        predict_all für viele Matches: eine Feature-Matrix und genau ein
+        predict_proba pro Model (Labels per argmax statt extra predict)
+        
+        Args:
+            matches: Liste von Match-Daten (wie bei predict_all)
+            use_odds: Mit oder ohne Quoten
+            
+        Returns:
+            Liste von Prediction-Dicts in der Reihenfolge von matches
+        """
+        if not matches:
+            return []
+        
+        X = self.prepare_feature_matrix(matches, use_odds)
+        if X is None:
+            # Nicht-numerische Features o.ä. -> Einzel-Pfad mit dessen Fehlerbehandlung
+            return [self.predict_all(match_data, use_odds) for match_data in matches]
+        
+        return self._predict_matrix(X, use_odds)
+    
+    def _predict_matrix(self, X: np.ndarray, use_odds: bool) -> List[Dict]:
+        """Ein predict_proba pro Model über die ganze Feature-Matrix"""
+        version = 'MIT Quoten' if use_odds else 'OHNE Quoten (Echter Edge)'
+        results = [
+            {'over_under': None, '1x2': None, 'btts': None, 'version': version}
+            for _ in range(len(X))
+        ]
+        if not len(X):
+            return results
+        
+        models = self.models_with_odds if use_odds else self.models_no_odds
+        features = self.features_with_odds if use_odds else self.features_no_odds
+        builders = {
+            'over_under': self._over_under_result,
+            '1x2': self._1x2_result,
+            'btts': self._btts_result,
+        }
+        
+        for name, build_result in builders.items():
+            model = models.get(name)
+            if model is None:
+                continue
+            try:
+                proba = self._batch_proba(model, X, features)
+                classes = np.asarray(getattr(model, 'classes_', np.arange(proba.shape[1])))
+                predictions = classes[proba.argmax(axis=1)]
+                for result, prediction, probabilities in zip(results, predictions, proba):
+                    result[name] = build_result(prediction, probabilities)
+            except Exception as e:
+                print(f"Fehler bei Batch-Prediction ({name}): {e}")
+        
+        return results
+    
+    def feature_plan(self, use_odds: bool = True) -> Optional[FeaturePlan]:
+        """Kompilierter Feature-Plan (einmal pro Feature-Liste)"""
+        features = self.features_with_odds if use_odds else self.features_no_odds
+        if not features:
+            return None
+        plan = self._feature_plans.get(use_odds)
+        if plan is None or plan.features != tuple(features):
+            plan = FeaturePlan.from_feature_list(
+                features, 'mit Quoten' if use_odds else 'ohne Quoten'
+            )
+            self._feature_plans[use_odds] = plan
+        return plan
+    
+    def predict_match_data_batch(
+        self,
+        matches: List,
+        use_odds: bool = True
+    ) -> List[Dict]:
+        """
+        Wie predict_all_batch, aber direkt aus MatchData-Objekten: der
+        Feature-Plan füllt eine float32-Matrix ohne Dictionaries/DataFrames.
+        'missing_features' listet je Match die Features, die mangels Quelle
+        oder Daten mit 0 ins Model gehen.
+        
+        Args:
+            matches: Liste von MatchData (Parser-Ergebnis)
+            use_odds: Mit oder ohne Quoten
+        """
+        plan = self.feature_plan(use_odds)
+        if plan is None:
+            version = 'MIT Quoten' if use_odds else 'OHNE Quoten (Echter Edge)'
+            return [
+                {'over_under': None, '1x2': None, 'btts': None, 'version': version}
+                for _ in matches
+            ]
+        results = self._predict_matrix(plan.build_matrix(matches), use_odds)
+        for result, match_data in zip(results, matches):
+            result['missing_features'] = plan.row_missing(match_data)
+        return results
+    
+    def predict_match_data(self, match_data, use_odds: bool = True) -> Dict:
+        """predict_all für ein MatchData-Objekt (über den Feature-Plan)"""
+        return self.predict_match_data_batch([match_data], use_odds)[0]
+    
     def analyze_value(
         self, 
         prediction: Dict, 
@@ -318,11 +520,16 @@ class FootballMLModels:
 
 # Singleton Instance
 _ml_models_instance = None
+_warm_up_lock = threading.Lock()
 
 
-def get_ml_models(models_dir: str = "models") -> FootballMLModels:
+def get_ml_models(models_dir: str = "models", warm_up: bool = False) -> FootballMLModels:
     """
     Gibt Singleton-Instanz der ML-Models zurück
+    
+    Args:
+        models_dir: Verzeichnis mit feature_config.json und Model-Dateien
+        warm_up: True = Models im Hintergrund vorladen
     """
     global _ml_models_instance
     
@@ -330,4 +537,7 @@ def get_ml_models(models_dir: str = "models") -> FootballMLModels:
         _ml_models_instance = FootballMLModels(models_dir)
         _ml_models_instance.load_models()
     
+    if warm_up:
+        _ml_models_instance.warm_up(background=True)
+    
     return _ml_models_instance
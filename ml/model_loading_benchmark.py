@@ -0,0 +1,116 @@
+"""
+Startup-Benchmark für die Football ML-Models
+
+Misst pro Model und vorhandenem Dateiformat die Kaltstart-Zeit in einem
+frischen Python-Prozess (formatabhängige Imports wie xgboost/sklearn +
+Laden) sowie die Zeit von get_ml_models() mit Lazy Loading. Der Import des
+ml-Pakets selbst (zieht u.a. streamlit, in App/Bot ohnehin geladen) wird
+separat als Basis ausgewiesen und nicht mitgezählt.
+
+Usage:
+    python -m ml.model_loading_benchmark [--models-dir models] [--export] [--repeat 3]
+"""
+
+import argparse
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List
+
+from ml.model_store import (
+    MODEL_NAMES,
+    MODEL_SUFFIXES,
+    VARIANTS,
+    export_native_models,
+    model_stem,
+)
+
+_ROOT = Path(__file__).resolve().parent.parent
+
+_BASE_SNIPPET = """
+import time
+start = time.perf_counter()
+import ml.football_ml_models
+print(time.perf_counter() - start)
+"""
+
+_LOAD_SNIPPET = """
+import time
+from ml.model_store import load_model_file
+start = time.perf_counter()
+load_model_file({path!r})
+print(time.perf_counter() - start)
+"""
+
+_LAZY_SNIPPET = """
+import time
+from ml.football_ml_models import FootballMLModels
+start = time.perf_counter()
+FootballMLModels({models_dir!r}).load_models()
+print(time.perf_counter() - start)
+"""
+
+
+def _cold_seconds(snippet: str, repeat: int) -> float:
+    """Beste Zeit aus repeat frischen Prozessen"""
+    best = float("inf")
+    for _ in range(repeat):
+        out = subprocess.run(
+            [sys.executable, "-c", snippet],
+            cwd=_ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        best = min(best, float(out.stdout.strip().splitlines()[-1]))
+    return best
+
+
+def benchmark_startup(models_dir: Path, repeat: int = 3) -> List[Dict]:
+    """
+    Returns:
+        Liste von Dicts mit model, format, size_kb, cold_ms
+    """
+    models_dir = Path(models_dir).resolve()
+    rows = [{
+        "model": "ml-Paket Import (Basis)",
+        "format": "-",
+        "size_kb": 0.0,
+        "cold_ms": _cold_seconds(_BASE_SNIPPET, repeat) * 1000,
+    }]
+    for name in MODEL_NAMES:
+        for variant in VARIANTS:
+            stem = model_stem(name, variant)
+            for suffix in MODEL_SUFFIXES:
+                path = models_dir / f"{stem}{suffix}"
+                if not path.exists():
+                    continue
+                seconds = _cold_seconds(_LOAD_SNIPPET.format(path=str(path)), repeat)
+                rows.append({
+                    "model": stem,
+                    "format": suffix,
+                    "size_kb": path.stat().st_size / 1024,
+                    "cold_ms": seconds * 1000,
+                })
+
+    seconds = _cold_seconds(_LAZY_SNIPPET.format(models_dir=str(models_dir)), repeat)
+    rows.append({"model": "get_ml_models (lazy)", "format": "-", "size_kb": 0.0, "cold_ms": seconds * 1000})
+    return rows
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="ML model startup benchmark")
+    arg_parser.add_argument("--models-dir", default=str(_ROOT / "models"))
+    arg_parser.add_argument("--export", action="store_true", help="native Formate aus den .pkl schreiben")
+    arg_parser.add_argument("--repeat", type=int, default=3)
+    args = arg_parser.parse_args()
+
+    if args.export:
+        for stem, path in export_native_models(Path(args.models_dir)).items():
+            print(f"exportiert: {stem} -> {path.name}")
+
+    for row in benchmark_startup(Path(args.models_dir), args.repeat):
+        print(
+            f"{row['model']:<24} {row['format']:<5} "
+            f"{row['size_kb']:>8.0f} KB  {row['cold_ms']:>8.1f} ms"
+        )
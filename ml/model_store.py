@@ -0,0 +1,312 @@
+"""
+Laden und Speichern der Football ML-Models
+
+Die Pickles in models/ brauchen beim Laden sklearn bzw. xgboost - der
+Import dieser Pakete (~1.5-2 s) dominiert den Kaltstart von App und Bot,
+nicht das Unpickling selbst. Deshalb:
+
+- LazyModels: ein Model wird erst beim ersten Zugriff geladen
+- Native Formate mit Vorrang vor .pkl (gleicher Dateiname, andere Endung):
+    .ubj / .json  XGBoost-Booster (XGBClassifier.load_model)
+    .npz          CompactForest - RandomForest als flache Knoten-Arrays,
+                  Vorhersage nur mit NumPy (kein sklearn-Import, kein Pickle)
+- export_native_models schreibt beide Formate aus den vorhandenen Pickles
+  (plus native_models.json, damit veraltete Exporte ignoriert werden)
+"""
+
+import json
+import pickle
+import threading
+import time
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+import numpy as np
+
+from ml.tree_engine import VALIDATION_ATOL, FlatTreeEnsemble
+
+MODEL_NAMES = ("over_under", "1x2", "btts")
+VARIANTS = ("with_odds", "no_odds")
+
+# Reihenfolge = Vorrang beim Laden
+MODEL_SUFFIXES = (".ubj", ".json", ".npz", ".pkl")
+
+COMPACT_FOREST_FORMAT = 1
+NATIVE_MANIFEST = "native_models.json"  # Export-Quelle pro Model (siehe find_model_file)
+
+
+class CompactForest:
+    """
+    RandomForestClassifier als flache Knoten-Arrays (alle Bäume hintereinander)
+
+    predict_proba entspricht sklearn: Mittel der normierten Blatt-Verteilungen,
+    Vergleich X (float32) <= threshold, fehlende Werte gemäß missing_go_to_left
+    (ausgewertet über ml.tree_engine.FlatTreeEnsemble).
+    """
+
+    def __init__(
+        self,
+        roots: np.ndarray,
+        left: np.ndarray,
+        right: np.ndarray,
+        feature: np.ndarray,
+        threshold: np.ndarray,
+        missing_left: np.ndarray,
+        value: np.ndarray,
+        classes: np.ndarray,
+        feature_names: Optional[np.ndarray] = None,
+    ):
+        self.roots = roots
+        self.left = left
+        self.right = right
+        self.feature = feature
+        self.threshold = threshold
+        self.missing_left = missing_left
+        self.value = value
+        self.classes_ = classes
+        self._flat: Optional[FlatTreeEnsemble] = None
+        self.n_features_in_ = int(feature.max()) + 1 if feature.size else 0
+        if feature_names is not None:
+            self.feature_names_in_ = feature_names
+            self.n_features_in_ = len(feature_names)
+
+    @classmethod
+    def from_sklearn(cls, model) -> "CompactForest":
+        """Flacht einen trainierten RandomForestClassifier ab"""
+        roots, left, right, feature, threshold, missing_left, value = [], [], [], [], [], [], []
+        offset = 0
+        for estimator in model.estimators_:
+            tree = estimator.tree_
+            n = tree.node_count
+            is_leaf = tree.children_left == -1
+            roots.append(offset)
+            left.append(np.where(is_leaf, -1, tree.children_left + offset))
+            right.append(np.where(is_leaf, -1, tree.children_right + offset))
+            feature.append(np.where(is_leaf, 0, tree.feature))
+            threshold.append(tree.threshold)
+            mgl = getattr(tree, "missing_go_to_left", None)
+            missing_left.append(np.zeros(n, dtype=bool) if mgl is None else mgl.astype(bool))
+            leaf_value = tree.value[:, 0, :].astype(np.float64)
+            totals = leaf_value.sum(axis=1, keepdims=True)
+            totals[totals == 0] = 1.0
+            value.append(leaf_value / totals)
+            offset += n
+
+        return cls(
+            roots=np.asarray(roots, dtype=np.int32),
+            left=np.concatenate(left).astype(np.int32),
+            right=np.concatenate(right).astype(np.int32),
+            feature=np.concatenate(feature).astype(np.int32),
+            threshold=np.concatenate(threshold).astype(np.float64),
+            missing_left=np.concatenate(missing_left),
+            value=np.concatenate(value),
+            classes=np.asarray(model.classes_),
+            feature_names=getattr(model, "feature_names_in_", None),
+        )
+
+    # ── Speichern / Laden ────────────────────────────────────
+
+    def save(self, path: Path) -> None:
+        arrays = dict(
+            format=np.int32(COMPACT_FOREST_FORMAT),
+            roots=self.roots,
+            left=self.left,
+            right=self.right,
+            feature=self.feature,
+            threshold=self.threshold,
+            missing_left=self.missing_left,
+            value=self.value,
+            classes=self.classes_,
+        )
+        if hasattr(self, "feature_names_in_"):
+            arrays["feature_names"] = np.asarray(self.feature_names_in_, dtype=str)
+        with open(path, "wb") as f:
+            np.savez_compressed(f, **arrays)
+
+    @classmethod
+    def load(cls, path: Path) -> "CompactForest":
+        with np.load(path, allow_pickle=False) as data:
+            if int(data["format"]) != COMPACT_FOREST_FORMAT:
+                raise ValueError(f"Unbekanntes CompactForest-Format in {path}")
+            return cls(
+                roots=data["roots"],
+                left=data["left"],
+                right=data["right"],
+                feature=data["feature"],
+                threshold=data["threshold"],
+                missing_left=data["missing_left"],
+                value=data["value"],
+                classes=data["classes"],
+                feature_names=data["feature_names"].astype(object) if "feature_names" in data else None,
+            )
+
+    # ── Vorhersage ───────────────────────────────────────────
+
+    def _engine(self) -> FlatTreeEnsemble:
+        if self._flat is None:
+            self._flat = FlatTreeEnsemble.from_compact_forest(self)
+        return self._flat
+
+    def apply(self, X) -> np.ndarray:
+        """Blatt-Index (global) pro Zeile und Baum, Form (n_rows, n_trees)"""
+        return self._engine().apply(X)
+
+    def predict_proba(self, X) -> np.ndarray:
+        return self._engine().predict_proba(X)
+
+    def predict(self, X) -> np.ndarray:
+        return self.classes_[self.predict_proba(X).argmax(axis=1)]
+
+
+# ─────────────────────────────────────────────
+# DATEIEN
+# ─────────────────────────────────────────────
+
+def model_stem(name: str, variant: str) -> str:
+    """z.B. ('1x2', 'with_odds') -> '1x2_with_odds'"""
+    return f"{name}_{variant}"
+
+
+def _read_manifest(models_dir: Path) -> Dict[str, Dict]:
+    path = Path(models_dir) / NATIVE_MANIFEST
+    if not path.exists():
+        return {}
+    try:
+        with open(path, "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def find_model_file(models_dir: Path, name: str, variant: str) -> Optional[Path]:
+    """
+    Bevorzugte vorhandene Datei eines Models (native Formate vor .pkl)
+
+    Ein natives Format wird nur genommen, wenn es laut NATIVE_MANIFEST aus
+    der aktuellen .pkl exportiert wurde (gleiche Dateigröße) - nach neuem
+    Training ohne erneuten Export bleibt es bei der .pkl.
+    """
+    stem = model_stem(name, variant)
+    pkl = Path(models_dir) / f"{stem}.pkl"
+    source = _read_manifest(models_dir).get(stem, {})
+    for suffix in MODEL_SUFFIXES:
+        path = Path(models_dir) / f"{stem}{suffix}"
+        if not path.exists():
+            continue
+        if suffix != ".pkl" and pkl.exists():
+            if source.get("file") != path.name or source.get("source_size") != pkl.stat().st_size:
+                continue
+        return path
+    return None
+
+
+def load_model_file(path: Path):
+    """Lädt ein Model je nach Dateiendung"""
+    path = Path(path)
+    if path.suffix in (".ubj", ".json"):
+        import xgboost as xgb
+
+        model = xgb.XGBClassifier()
+        model.load_model(str(path))
+        return model
+    if path.suffix == ".npz":
+        return CompactForest.load(path)
+    with open(path, "rb") as f:
+        return pickle.load(f)
+
+
+def export_native_models(models_dir: Path, xgb_format: str = "ubj") -> Dict[str, Path]:
+    """
+    Schreibt aus den .pkl-Dateien native Formate daneben
+
+    XGBoost -> .ubj (oder .json), RandomForest -> .npz (CompactForest).
+    Andere Model-Typen bleiben Pickle.
+
+    Returns:
+        Dictionary Dateistamm -> geschriebene Datei
+    """
+    written = {}
+    manifest = _read_manifest(models_dir)
+    for name in MODEL_NAMES:
+        for variant in VARIANTS:
+            stem = model_stem(name, variant)
+            pkl = Path(models_dir) / f"{stem}.pkl"
+            if not pkl.exists():
+                continue
+            model = load_model_file(pkl)
+            if hasattr(model, "get_booster"):
+                target = pkl.with_suffix(f".{xgb_format}")
+                model.save_model(str(target))
+            elif hasattr(model, "estimators_") and hasattr(model, "classes_"):
+                forest = CompactForest.from_sklearn(model)
+                deviation = forest._engine().max_deviation(model)
+                if deviation > VALIDATION_ATOL:
+                    raise ValueError(f"{stem}: CompactForest weicht um {deviation:.2e} ab")
+                target = pkl.with_suffix(".npz")
+                forest.save(target)
+            else:
+                continue
+            written[stem] = target
+            manifest[stem] = {"file": target.name, "source_size": pkl.stat().st_size}
+
+    with open(Path(models_dir) / NATIVE_MANIFEST, "w") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    return written
+
+
+class LazyModels(Mapping):
+    """
+    Read-only Mapping Model-Name -> Model, das jedes Model erst beim ersten
+    Zugriff lädt (thread-sicher). `in`, len() und Iteration laden nichts.
+
+    Args:
+        paths: Model-Name -> Datei
+    """
+
+    def __init__(self, paths: Dict[str, Path]):
+        self._paths = dict(paths)
+        self._models: Dict[str, object] = {}
+        self._lock = threading.Lock()
+        self.load_seconds: Dict[str, float] = {}
+
+    def __getitem__(self, name: str):
+        model = self._models.get(name)
+        if model is not None:
+            return model
+        with self._lock:
+            model = self._models.get(name)
+            if model is None:
+                path = self._paths[name]
+                start = time.perf_counter()
+                try:
+                    model = load_model_file(path)
+                except Exception as e:
+                    print(f"Fehler beim Laden von {path.name}: {e}")
+                    del self._paths[name]
+                    raise KeyError(name) from e
+                self.load_seconds[name] = time.perf_counter() - start
+                self._models[name] = model
+        return model
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(self._paths))
+
+    def __len__(self) -> int:
+        return len(self._paths)
+
+    def __contains__(self, name) -> bool:
+        return name in self._paths
+
+    def paths(self) -> Dict[str, Path]:
+        return dict(self._paths)
+
+    def loaded(self) -> List[str]:
+        return list(self._models)
+
+    def load_all(self) -> None:
+        for name in list(self._paths):
+            try:
+                self[name]
+            except KeyError:
+                pass
@@ -3,10 +3,16 @@ ML-Modell für Tabellenpositions-basierte Korrekturen
 """
 
 import streamlit as st
+import numpy as np
 from datetime import datetime
-from typing import Dict, List
+from typing import Dict, List, Sequence
 from data.models import TeamStats
-from ml.features import create_position_features, encode_position_features
+from ml.features import (
+    POSITION_FEATURE_NAMES,
+    build_position_feature_matrix,
+    create_position_features,
+    float_column,
+)
 
 
 class TablePositionML:
@@ -78,43 +84,38 @@ class TablePositionML:
     def prepare_training_data(self, historical_matches: List[Dict]):
         """
         Bereitet Trainingsdaten vor
-        
+
+        Die Features werden spaltenweise über alle Matches berechnet
+        (build_position_feature_matrix, Spalten in POSITION_FEATURE_NAMES).
+        Matches ohne gültige Teams, mit predicted_mu <= 0 oder ohne lesbares
+        actual_mu entfallen.
+
         Args:
             historical_matches: Liste von historischen Matches
-            
+
         Returns:
-            Tuple (X_train, y_train)
+            Tuple (X_train, y_train) als numpy arrays
         """
-        X_train = []
-        y_train = []
-
-        for match in historical_matches:
-            try:
-                home_team_data = match.get("home_team", {})
-                away_team_data = match.get("away_team", {})
-                match_date = match.get("date", "")
-
-                features = self.create_features(
-                    home_team_data, away_team_data, match_date
-                )
-                encoded_features = encode_position_features(features)
-
-                predicted_mu_home = match.get("predicted_mu_home", 1.0)
-                predicted_mu_away = match.get("predicted_mu_away", 1.0)
-                actual_mu_home = match.get("actual_mu_home", 1.0)
-                actual_mu_away = match.get("actual_mu_away", 1.0)
-
-                if predicted_mu_home > 0 and predicted_mu_away > 0:
-                    correction_home = actual_mu_home / predicted_mu_home
-                    correction_away = actual_mu_away / predicted_mu_away
-
-                    X_train.append(list(encoded_features.values()))
-                    y_train.append([correction_home, correction_away])
-
-            except Exception as e:
-                continue
-
-        return X_train, y_train
+        X, valid = build_position_feature_matrix(
+            [match.get("home_team", {}) for match in historical_matches],
+            [match.get("away_team", {}) for match in historical_matches],
+            [match.get("date", "") for match in historical_matches],
+        )
+
+        predicted_mu_home = float_column(historical_matches, "predicted_mu_home", 1.0)
+        predicted_mu_away = float_column(historical_matches, "predicted_mu_away", 1.0)
+        actual_mu_home = float_column(historical_matches, "actual_mu_home", 1.0)
+        actual_mu_away = float_column(historical_matches, "actual_mu_away", 1.0)
+        valid &= (predicted_mu_home > 0) & (predicted_mu_away > 0)
+        valid &= np.isfinite(actual_mu_home) & np.isfinite(actual_mu_away)
+
+        y = np.column_stack(
+            (
+                actual_mu_home[valid] / predicted_mu_home[valid],
+                actual_mu_away[valid] / predicted_mu_away[valid],
+            )
+        )
+        return X[valid], y
 
     def train(self, historical_matches: List[Dict], min_matches: int = 30) -> Dict:
         """
@@ -157,47 +158,7 @@ class TablePositionML:
             self.last_trained = datetime.now()
 
             if hasattr(self.model, "feature_importances_"):
-                dummy_team = TeamStats(
-                    "",
-                    1,
-                    1,
-                    0,
-                    0,
-                    0,
-                    0,
-                    0,
-                    0,
-                    0,
-                    0,
-                    0,
-                    0,
-                    0,
-                    0,
-                    0,
-                    0,
-                    0,
-                    0,
-                    0,
-                    0,
-                    0,
-                    0,
-                    0,
-                    0,
-                    0,
-                    0,
-                    0,
-                    0,
-                    0,
-                    0,
-                    0,
-                    0,
-                    0,
-                    0,
-                    0,
-                )
-                features = self.create_features(dummy_team, dummy_team, "2024-01-01")
-                encoded = encode_position_features(features)
-                feature_names = list(encoded.keys())
+                feature_names = list(POSITION_FEATURE_NAMES)
 
                 if len(feature_names) == len(self.model.feature_importances_):
                     self.feature_importance = dict(
@@ -229,47 +190,79 @@ class TablePositionML:
         Returns:
             Dictionary mit Korrektur-Faktoren
         """
-        if not self.is_trained or self.model is None:
-            return {
-                "home_correction": 1.0,
-                "away_correction": 1.0,
-                "confidence": 0.0,
-                "is_trained": False,
-                "message": "Modell nicht trainiert",
-            }
-
-        try:
-            features = self.create_features(home_team, away_team, match_date)
-            encoded_features = encode_position_features(features)
+        return self.predict_corrections([home_team], [away_team], [match_date])[0]
+
+    def predict_corrections(
+        self,
+        home_teams: Sequence[TeamStats],
+        away_teams: Sequence[TeamStats],
+        match_dates: Sequence[str],
+    ) -> List[Dict]:
+        """
+        Korrektur-Faktoren für viele Matches mit einem model.predict
 
-            X_pred = [list(encoded_features.values())]
-            prediction = self.model.predict(X_pred)[0]
+        Args:
+            home_teams: Heimteams (TeamStats oder TeamStatsRow)
+            away_teams: Auswärtsteams
+            match_dates: Match-Daten
 
-            home_correction = float(prediction[0])
-            away_correction = float(prediction[1])
+        Returns:
+            Liste von Dictionaries wie predict_correction (gleiche Reihenfolge)
+        """
+        if not self.is_trained or self.model is None:
+            return [
+                {
+                    "home_correction": 1.0,
+                    "away_correction": 1.0,
+                    "confidence": 0.0,
+                    "is_trained": False,
+                    "message": "Modell nicht trainiert",
+                }
+                for _ in home_teams
+            ]
 
-            home_correction = max(0.5, min(1.5, home_correction))
-            away_correction = max(0.5, min(1.5, away_correction))
+        try:
+            X_pred, valid = build_position_feature_matrix(home_teams, away_teams, match_dates)
+            if not valid.all():
+                raise ValueError("Ungültige Team-Daten")
+            predictions = np.asarray(self.model.predict(X_pred)) if len(X_pred) else []
 
             confidence = min(0.9, self.training_data_size / 100)
-
-            return {
-                "home_correction": home_correction,
-                "away_correction": away_correction,
-                "confidence": confidence,
-                "is_trained": True,
-                "features_used": list(encoded_features.keys()),
-                "message": f"ML-Korrektur basierend auf {self.training_data_size} Trainings-Matches",
-            }
+            message = f"ML-Korrektur basierend auf {self.training_data_size} Trainings-Matches"
+
+            results = []
+            for prediction in predictions:
+                home_correction = max(0.5, min(1.5, float(prediction[0])))
+                away_correction = max(0.5, min(1.5, float(prediction[1])))
+                results.append(
+                    {
+                        "home_correction": home_correction,
+                        "away_correction": away_correction,
+                        "confidence": confidence,
+                        "is_trained": True,
+                        "features_used": list(POSITION_FEATURE_NAMES),
+                        "message": message,
+                    }
+                )
+            return results
 
         except Exception as e:
-            return {
-                "home_correction": 1.0,
-                "away_correction": 1.0,
-                "confidence": 0.0,
-                "is_trained": False,
-                "message": f"Vorhersagefehler: {str(e)}",
-            }
+            if len(home_teams) > 1:
+                # einzeln, damit ein fehlerhaftes Match nicht alle anderen mitnimmt
+                return [
+                    self.predict_corrections([home], [away], [date])[0]
+                    for home, away, date in zip(home_teams, away_teams, match_dates)
+                ]
+            return [
+                {
+                    "home_correction": 1.0,
+                    "away_correction": 1.0,
+                    "confidence": 0.0,
+                    "is_trained": False,
+                    "message": f"Vorhersagefehler: {str(e)}",
+                }
+                for _ in home_teams
+            ]
 
     def get_model_info(self) -> Dict:
         """
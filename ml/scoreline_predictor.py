@@ -5,7 +5,8 @@ Erstellt konsistente Predictions über alle Märkte
 
 import numpy as np
 from typing import Dict, List, Tuple
-from scipy.stats import poisson
+
+from utils.math_helpers import poisson_pmf_array
 
 
 class ScorelinePredictor:
@@ -35,13 +36,15 @@ class ScorelinePredictor:
         """
         scorelines = []
         
+        # Poisson-PMF beider Teams einmal vektorisiert berechnen
+        pmf_home = poisson_pmf_array(home_xg, self.max_goals).tolist()
+        pmf_away = poisson_pmf_array(away_xg, self.max_goals).tolist()
+        
         # Berechne alle Kombinationen
         for home_goals in range(self.max_goals + 1):
             for away_goals in range(self.max_goals + 1):
                 # Poisson Wahrscheinlichkeit
-                prob_home = poisson.pmf(home_goals, home_xg)
-                prob_away = poisson.pmf(away_goals, away_xg)
-                prob_combined = prob_home * prob_away
+                prob_combined = pmf_home[home_goals] * pmf_away[away_goals]
                 
                 # Bestimme Märkte
                 result = self._determine_result(home_goals, away_goals)
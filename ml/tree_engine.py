@@ -0,0 +1,340 @@
+"""
+NumPy-Inferenz für Baum-Ensembles (RandomForest / XGBoost)
+
+Für einzelne Matches dominiert bei sklearn/XGBoost der Aufruf-Overhead
+(Validierung, DMatrix, Thread-Pool) die eigentliche Baum-Traversierung.
+FlatTreeEnsemble legt alle Bäume eines Models in gemeinsame Knoten-Arrays
+(Blätter zeigen auf sich selbst) und traversiert alle Zeilen und Bäume
+gleichzeitig in max_depth vektorisierten Schritten.
+
+Unterstützt:
+    - sklearn RandomForestClassifier und ml.model_store.CompactForest
+      (Mittel der Blatt-Verteilungen, Split: x <= threshold)
+    - XGBClassifier mit binary:logistic oder multi:softprob/softmax
+      (Summe der Blatt-Werte + base_score, Split: x < threshold)
+
+build_engine() exportiert ein Model und prüft es gegen predict_proba; bei
+Abweichung (oder unbekanntem Model-Typ) wird None zurückgegeben und der
+Aufrufer bleibt beim Original-Model.
+"""
+
+import json
+import logging
+from typing import Optional, Sequence
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+VALIDATION_ROWS = 256
+VALIDATION_ATOL = 1e-5  # XGBoost summiert in float32
+
+
+def _self_loop_children(left: np.ndarray, right: np.ndarray):
+    """Blätter (-1) zeigen auf sich selbst, damit jede Tiefe gleich behandelt wird"""
+    nodes = np.arange(len(left), dtype=np.int32)
+    is_leaf = left < 0
+    return (
+        np.where(is_leaf, nodes, left).astype(np.int32),
+        np.where(is_leaf, nodes, right).astype(np.int32),
+    )
+
+
+def _tree_depth(roots: np.ndarray, left: np.ndarray, right: np.ndarray) -> int:
+    """Maximale Tiefe über alle Bäume (Kinder-Arrays mit -1 für Blätter)"""
+    depth = 0
+    level = np.asarray(roots, dtype=np.int64)
+    while level.size:
+        inner = level[left[level] >= 0]
+        if not inner.size:
+            break
+        level = np.concatenate([left[inner], right[inner]])
+        depth += 1
+    return depth
+
+
+class FlatTreeEnsemble:
+    """
+    Alle Bäume eines Models als flache Knoten-Arrays
+
+    Args:
+        roots: Wurzel-Index pro Baum
+        left/right: Kind-Indizes (Blätter auf sich selbst)
+        feature/threshold: Split pro Knoten
+        missing_left: Richtung für fehlende Werte (NaN)
+        value: Blatt-Werte - (n_nodes, n_classes) Verteilungen bei "forest",
+            (n_nodes,) Margins bei "xgb_binary"/"xgb_multi"
+        kind: "forest", "xgb_binary" oder "xgb_multi"
+        classes: Klassen-Labels (wie model.classes_)
+        max_depth: Anzahl Traversierungs-Schritte
+        strict: True = x < threshold geht links (XGBoost), sonst x <= threshold
+        base_margin: Start-Margin pro Ausgabe (XGBoost)
+        tree_group: Ausgabe-Index pro Baum (xgb_multi)
+        feature_names: Spaltennamen des Trainings (optional)
+    """
+
+    def __init__(
+        self,
+        roots: np.ndarray,
+        left: np.ndarray,
+        right: np.ndarray,
+        feature: np.ndarray,
+        threshold: np.ndarray,
+        missing_left: np.ndarray,
+        value: np.ndarray,
+        kind: str,
+        classes: np.ndarray,
+        max_depth: int,
+        strict: bool = False,
+        base_margin: Optional[np.ndarray] = None,
+        tree_group: Optional[np.ndarray] = None,
+        feature_names: Optional[Sequence[str]] = None,
+    ):
+        self.roots = np.asarray(roots, dtype=np.int32)
+        self.left = left
+        self.right = right
+        self.feature = feature
+        self.threshold = threshold
+        self.missing_left = missing_left
+        self.value = value
+        self.kind = kind
+        self.classes_ = np.asarray(classes)
+        self.max_depth = max_depth
+        self.strict = strict
+        self.base_margin = base_margin
+        self.tree_group = tree_group
+        self.n_features_in_ = int(feature.max()) + 1 if feature.size else 0
+        if feature_names is not None:
+            self.feature_names_in_ = np.asarray(feature_names, dtype=object)
+            self.n_features_in_ = len(feature_names)
+
+    # ── Export ───────────────────────────────────────────────
+
+    @classmethod
+    def from_forest_arrays(
+        cls, roots, left, right, feature, threshold, missing_left, value, classes, feature_names=None
+    ) -> "FlatTreeEnsemble":
+        """Aus CompactForest-Arrays (Kinder -1 für Blätter, value normiert)"""
+        loop_left, loop_right = _self_loop_children(left, right)
+        return cls(
+            roots=roots,
+            left=loop_left,
+            right=loop_right,
+            feature=feature.astype(np.int32),
+            threshold=threshold.astype(np.float64),
+            missing_left=missing_left.astype(bool),
+            value=value.astype(np.float64),
+            kind="forest",
+            classes=classes,
+            max_depth=_tree_depth(roots, left, right),
+            feature_names=feature_names,
+        )
+
+    @classmethod
+    def from_sklearn_forest(cls, model) -> "FlatTreeEnsemble":
+        from ml.model_store import CompactForest
+
+        return cls.from_compact_forest(CompactForest.from_sklearn(model))
+
+    @classmethod
+    def from_compact_forest(cls, forest) -> "FlatTreeEnsemble":
+        return cls.from_forest_arrays(
+            forest.roots,
+            forest.left,
+            forest.right,
+            forest.feature,
+            forest.threshold,
+            forest.missing_left,
+            forest.value,
+            forest.classes_,
+            getattr(forest, "feature_names_in_", None),
+        )
+
+    @classmethod
+    def from_xgboost(cls, model) -> "FlatTreeEnsemble":
+        """Aus einem XGBClassifier (JSON-Dump des Boosters)"""
+        booster = model.get_booster()
+        learner = json.loads(booster.save_raw("json"))["learner"]
+        objective = learner["objective"]["name"]
+        params = learner["learner_model_param"]
+        gbm = learner["gradient_booster"]
+        if gbm.get("name") != "gbtree":
+            raise ValueError(f"Nicht unterstützter Booster: {gbm.get('name')}")
+        trees = gbm["model"]["trees"]
+        tree_info = np.asarray(gbm["model"]["tree_info"], dtype=np.int32)
+
+        best = getattr(model, "best_iteration", None)
+        if best is not None:
+            n_groups = max(1, int(params.get("num_class", "0") or 0))
+            per_round = n_groups * int(gbm["model"]["gbtree_model_param"].get("num_parallel_tree", "1"))
+            trees = trees[: (best + 1) * per_round]
+            tree_info = tree_info[: len(trees)]
+
+        base = np.asarray(
+            [float(v) for v in str(params["base_score"]).strip("[]").split(",")],
+            dtype=np.float64,
+        )
+        if objective == "binary:logistic":
+            kind = "xgb_binary"
+            p = np.clip(base[:1], 1e-16, 1 - 1e-16)
+            base_margin = np.log(p / (1 - p))
+            n_outputs = 1
+        elif objective in ("multi:softprob", "multi:softmax"):
+            kind = "xgb_multi"
+            n_outputs = int(params["num_class"])
+            base_margin = np.resize(base, n_outputs)
+        else:
+            raise ValueError(f"Nicht unterstütztes Objective: {objective}")
+
+        roots, left, right, feature, threshold, missing_left, value = [], [], [], [], [], [], []
+        offset = 0
+        for tree in trees:
+            if any(tree.get("split_type", [])):
+                raise ValueError("Kategorische Splits werden nicht unterstützt")
+            lc = np.asarray(tree["left_children"], dtype=np.int64)
+            rc = np.asarray(tree["right_children"], dtype=np.int64)
+            is_leaf = lc == -1
+            cond = np.asarray(tree["split_conditions"], dtype=np.float32).astype(np.float64)
+            roots.append(offset)
+            left.append(np.where(is_leaf, -1, lc + offset))
+            right.append(np.where(is_leaf, -1, rc + offset))
+            feature.append(np.where(is_leaf, 0, tree["split_indices"]))
+            threshold.append(np.where(is_leaf, np.inf, cond))
+            missing_left.append(np.asarray(tree["default_left"], dtype=bool))
+            value.append(np.where(is_leaf, cond, 0.0))
+            offset += len(lc)
+
+        roots = np.asarray(roots, dtype=np.int32)
+        left = np.concatenate(left).astype(np.int32)
+        right = np.concatenate(right).astype(np.int32)
+        loop_left, loop_right = _self_loop_children(left, right)
+        classes = getattr(model, "classes_", None)
+        if classes is None:
+            classes = np.arange(2 if kind == "xgb_binary" else n_outputs)
+        return cls(
+            roots=roots,
+            left=loop_left,
+            right=loop_right,
+            feature=np.concatenate(feature).astype(np.int32),
+            threshold=np.concatenate(threshold),
+            missing_left=np.concatenate(missing_left),
+            value=np.concatenate(value),
+            kind=kind,
+            classes=classes,
+            max_depth=_tree_depth(roots, left, right),
+            strict=True,
+            base_margin=base_margin,
+            tree_group=tree_info if kind == "xgb_multi" else None,
+            feature_names=booster.feature_names,
+        )
+
+    @classmethod
+    def from_model(cls, model) -> "FlatTreeEnsemble":
+        """Exportiert ein unterstütztes Model (sonst ValueError)"""
+        from ml.model_store import CompactForest
+
+        if isinstance(model, CompactForest):
+            return cls.from_compact_forest(model)
+        if hasattr(model, "get_booster"):
+            return cls.from_xgboost(model)
+        if hasattr(model, "estimators_") and hasattr(model, "classes_"):
+            return cls.from_sklearn_forest(model)
+        raise ValueError(f"Nicht unterstützter Model-Typ: {type(model).__name__}")
+
+    # ── Vorhersage ───────────────────────────────────────────
+
+    def _as_matrix(self, X) -> np.ndarray:
+        if hasattr(X, "columns") and hasattr(self, "feature_names_in_"):
+            X = X[list(self.feature_names_in_)]
+        X = np.asarray(X, dtype=np.float32)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+        return X
+
+    def apply(self, X) -> np.ndarray:
+        """Blatt-Index (global) pro Zeile und Baum, Form (n_rows, n_trees)"""
+        X = self._as_matrix(X)
+        rows = np.arange(X.shape[0])[:, None]
+        nodes = np.broadcast_to(self.roots, (X.shape[0], len(self.roots)))
+        has_nan = np.isnan(X).any()
+        for _ in range(self.max_depth):
+            x = X[rows, self.feature[nodes]]
+            thr = self.threshold[nodes]
+            go_left = x < thr if self.strict else x <= thr
+            if has_nan:
+                go_left |= np.isnan(x) & self.missing_left[nodes]
+            nodes = np.where(go_left, self.left[nodes], self.right[nodes])
+        return nodes
+
+    def predict_proba(self, X) -> np.ndarray:
+        leaves = self.apply(X)
+        if self.kind == "forest":
+            return self.value[leaves].mean(axis=1)
+        margins = self.value[leaves]
+        if self.kind == "xgb_binary":
+            p1 = 1.0 / (1.0 + np.exp(-(margins.sum(axis=1) + self.base_margin[0])))
+            return np.column_stack([1.0 - p1, p1])
+        n_outputs = len(self.base_margin)
+        scores = np.tile(self.base_margin, (margins.shape[0], 1))
+        for k in range(n_outputs):
+            scores[:, k] += margins[:, self.tree_group == k].sum(axis=1)
+        scores -= scores.max(axis=1, keepdims=True)
+        e = np.exp(scores)
+        return e / e.sum(axis=1, keepdims=True)
+
+    def predict(self, X) -> np.ndarray:
+        return self.classes_[self.predict_proba(X).argmax(axis=1)]
+
+    # ── Validierung ──────────────────────────────────────────
+
+    def validation_matrix(self, n_rows: int = VALIDATION_ROWS, seed: int = 0) -> np.ndarray:
+        """
+        Testzeilen aus den Split-Schwellen des Models (exakt auf, knapp unter
+        und knapp über Schwellen), damit beide Äste und die Gleichheitsfälle
+        aller Splits vorkommen
+        """
+        rng = np.random.default_rng(seed)
+        inner = self.left != np.arange(len(self.left))
+        X = np.zeros((n_rows, self.n_features_in_), dtype=np.float32)
+        for f in range(self.n_features_in_):
+            thresholds = np.unique(self.threshold[inner & (self.feature == f)]).astype(np.float32)
+            if not thresholds.size:
+                continue
+            picks = rng.choice(thresholds, size=n_rows)
+            shift = rng.choice([-1, 0, 1], size=n_rows)
+            direction = np.where(shift < 0, -np.inf, np.inf).astype(np.float32)
+            X[:, f] = np.where(shift == 0, picks, np.nextafter(picks, direction))
+        return X
+
+    def max_deviation(self, model, X=None) -> float:
+        """Größte Abweichung zu model.predict_proba auf X (Standard: validation_matrix)"""
+        import pandas as pd
+
+        X = self.validation_matrix() if X is None else self._as_matrix(X)
+        reference_input = X
+        if hasattr(model, "feature_names_in_") and hasattr(self, "feature_names_in_"):
+            reference_input = pd.DataFrame(X, columns=list(self.feature_names_in_))
+        reference = np.asarray(model.predict_proba(reference_input), dtype=np.float64)
+        return float(np.abs(reference - self.predict_proba(X)).max())
+
+
+def build_engine(model, atol: float = VALIDATION_ATOL) -> Optional[FlatTreeEnsemble]:
+    """
+    Exportiert model und prüft es gegen predict_proba
+
+    Returns:
+        FlatTreeEnsemble oder None (nicht unterstützt / Abweichung > atol)
+    """
+    try:
+        engine = FlatTreeEnsemble.from_model(model)
+        deviation = engine.max_deviation(model)
+    except Exception as e:
+        logger.info("Tree-Engine nicht verfügbar für %s: %s", type(model).__name__, e)
+        return None
+    if deviation > atol:
+        logger.warning(
+            "Tree-Engine für %s verworfen: Abweichung %.2e > %.0e",
+            type(model).__name__, deviation, atol,
+        )
+        return None
+    return engine
@@ -15,6 +15,11 @@ from .tracking import (
     save_historical_directly,
     load_historical_matches_from_sheets,
 )
+from .prediction_queue import (
+    PredictionWriteQueue,
+    enqueue_prediction,
+    flush_predictions,
+)
 from .export_to_sheets import export_analysis_to_sheets
 
 __all__ = [
@@ -29,6 +34,10 @@ __all__ = [
     "create_historical_sheet",
     "save_historical_directly",
     "load_historical_matches_from_sheets",
+    # Prediction Queue
+    "PredictionWriteQueue",
+    "enqueue_prediction",
+    "flush_predictions",
     # Export
     "export_analysis_to_sheets",
 ]
@@ -130,22 +130,20 @@ def export_analysis_to_sheets(result: dict, actual_score: str = None) -> bool:
         try:
             from ml.football_ml_models import get_ml_models
             from ml.scoreline_predictor import ScorelinePredictor
-            from ui.sheets_ml_integration import convert_match_data_to_features
-            from data import read_worksheet_text_by_id, DataParser
+            from data import read_worksheet_grid_by_id, DataParser
 
             sheet_id = result.get('_sheet_id')
             selected_tab = result.get('_selected_tab')
 
             if sheet_id and selected_tab:
-                match_text = read_worksheet_text_by_id(sheet_id, selected_tab)
-                if match_text:
+                match_grid = read_worksheet_grid_by_id(sheet_id, selected_tab)
+                if match_grid:
                     parser = DataParser()
-                    match_data = parser.parse(match_text)
-                    features = convert_match_data_to_features(match_data)
+                    match_data = parser.parse_grid(match_grid)
 
                     ml_models = get_ml_models()
                     if ml_models.models_loaded:
-                        predictions = ml_models.predict_all(features, use_odds=True)
+                        predictions = ml_models.predict_match_data(match_data, use_odds=True)
 
                         # 1X2
                         if '1x2' in predictions:
@@ -0,0 +1,182 @@
+"""
+Write-Behind-Queue für Vorhersagen (PREDICTIONS Sheet)
+
+Die Analyse legt fertige Vorhersage-Zeilen nur noch in eine Queue; ein
+Hintergrund-Thread schreibt alle offenen Zeilen gebündelt mit EINEM
+values().append pro Intervall bzw. voller Charge. Pro Match + Datum wird
+nur eine Zeile geschrieben (spätere Analysen desselben Matches ersetzen
+die noch offene Zeile; Matches, die gerade geschrieben werden oder schon
+geschrieben sind, werden übersprungen).
+"""
+
+import atexit
+import logging
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from data.google_sheets import connect_to_sheets, get_tracking_sheet_id
+from models.tracking import append_prediction_rows, build_prediction_row
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_FLUSH_INTERVAL = 5.0  # Sekunden
+DEFAULT_MAX_BATCH = 50  # Zeilen, ab denen sofort geschrieben wird
+MAX_REMEMBERED_KEYS = 10_000  # Dedupe-Gedächtnis für bereits geschriebene Matches
+
+
+class PredictionWriteQueue:
+    """
+    Bündelt Vorhersage-Zeilen und schreibt sie im Hintergrund-Thread.
+
+    Args:
+        flush_interval: Maximale Wartezeit bis zum Schreiben (Sekunden)
+        max_batch: Ab so vielen offenen Zeilen wird sofort geschrieben
+    """
+
+    def __init__(
+        self,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+        max_batch: int = DEFAULT_MAX_BATCH,
+    ):
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+        self._pending: "OrderedDict[Tuple[str, str], List[str]]" = OrderedDict()
+        self._inflight = set()  # Keys des laufenden append-Aufrufs
+        self._written: "OrderedDict[Tuple[str, str], None]" = OrderedDict()  # älteste zuerst
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def enqueue(self, key: Tuple[str, str], row: List[str]) -> None:
+        """Legt eine Zeile ab (ersetzt eine offene Zeile mit gleichem Key)"""
+        with self._lock:
+            if key in self._written or key in self._inflight:
+                return
+            self._pending[key] = row
+            full = len(self._pending) >= self.max_batch
+        self._ensure_worker()
+        if full:
+            self._wakeup.set()
+
+    def pending_count(self) -> int:
+        with self._lock:
+            return len(self._pending)
+
+    def flush(self) -> int:
+        """
+        Schreibt alle offenen Zeilen mit einem append-Aufruf.
+
+        Returns:
+            Anzahl geschriebener Zeilen (0 bei Fehler / nichts zu tun)
+        """
+        with self._flush_lock:
+            with self._lock:
+                if not self._pending:
+                    return 0
+                batch = list(self._pending.items())
+                self._pending.clear()
+                self._inflight.update(key for key, _ in batch)
+
+            try:
+                sheet_id = get_tracking_sheet_id()
+            except Exception:
+                sheet_id = None
+            if not sheet_id:
+                logger.debug("Tracking nicht konfiguriert - %d Vorhersagen verworfen", len(batch))
+                with self._lock:
+                    self._inflight.difference_update(key for key, _ in batch)
+                return 0
+
+            try:
+                service = connect_to_sheets(readonly=False)
+                if service is None:
+                    raise RuntimeError("Keine Verbindung zu Google Sheets")
+                append_prediction_rows(service, sheet_id, [row for _, row in batch])
+            except Exception as e:
+                logger.warning("Vorhersagen konnten nicht gespeichert werden: %s", e)
+                # Zurücklegen (neuere Zeilen mit gleichem Key haben Vorrang)
+                with self._lock:
+                    for key, row in batch:
+                        self._inflight.discard(key)
+                        self._pending.setdefault(key, row)
+                return 0
+
+            with self._lock:
+                for key, _ in batch:
+                    self._inflight.discard(key)
+                    self._written[key] = None
+                    self._written.move_to_end(key)
+                while len(self._written) > MAX_REMEMBERED_KEYS:
+                    self._written.popitem(last=False)
+            return len(batch)
+
+    def stop(self, flush: bool = True) -> None:
+        """Beendet den Worker (Standard: vorher alles schreiben)"""
+        self._stopped.set()
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.flush_interval + 5)
+        if flush:
+            self.flush()
+
+    def _ensure_worker(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stopped.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="prediction-write-queue", daemon=True
+            )
+            self._thread.start()
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self.flush()
+
+
+_queue: Optional[PredictionWriteQueue] = None
+_queue_lock = threading.Lock()
+
+
+def get_prediction_queue() -> PredictionWriteQueue:
+    """Prozessweite Queue (wird beim ersten Aufruf angelegt)"""
+    global _queue
+    if _queue is None:
+        with _queue_lock:
+            if _queue is None:
+                _queue = PredictionWriteQueue()
+                atexit.register(_queue.stop)
+    return _queue
+
+
+def enqueue_prediction(
+    match_info: Dict,
+    probabilities: Dict,
+    odds: Dict,
+    risk_score: Dict,
+    predicted_score: str,
+    mu_info: Dict,
+) -> None:
+    """
+    Wie save_prediction_to_sheets, aber nicht-blockierend: baut nur die
+    Zeile und legt sie in die Write-Behind-Queue (Dedupe über Match + Datum).
+    """
+    row = build_prediction_row(
+        match_info, probabilities, odds, risk_score, predicted_score, mu_info
+    )
+    key = (row[2], str(match_info.get("date", "")))
+    get_prediction_queue().enqueue(key, row)
+
+
+def flush_predictions() -> int:
+    """Schreibt alle offenen Vorhersagen sofort (z.B. vor dem Beenden)"""
+    if _queue is None:
+        return 0
+    return _queue.flush()
@@ -6,7 +6,103 @@ import streamlit as st
 from datetime import datetime
 from typing import Dict, List, Optional
 from data.google_sheets import connect_to_sheets, get_tracking_sheet_id
-from data.models import MatchData, ExtendedMatchData, TeamStats
+from data.models import MatchData, ExtendedMatchData, TeamStatsBatch
+
+
+PREDICTIONS_RANGE = "PREDICTIONS!A:W"
+PREDICTION_VERSION = "v6.0"  # Aktuelle Version
+
+
+def build_prediction_row(
+    match_info: Dict,
+    probabilities: Dict,
+    odds: Dict,
+    risk_score: Dict,
+    predicted_score: str,
+    mu_info: Dict,
+) -> List[str]:
+    """
+    Baut die PREDICTIONS-Zeile (Spalten A-W) für eine Vorhersage
+
+    Args: siehe save_prediction_to_sheets
+
+    Returns:
+        Liste der Zellwerte
+    """
+    best_over_under = (
+        "Over 2.5"
+        if probabilities["over_25"] >= (100 - probabilities["over_25"])
+        else "Under 2.5"
+    )
+    prob_over_under = max(probabilities["over_25"], 100 - probabilities["over_25"])
+    odds_over_under = (
+        odds["ou25"][0] if best_over_under == "Over 2.5" else odds["ou25"][1]
+    )
+
+    best_btts = (
+        "BTTS Yes"
+        if probabilities["btts_yes"] >= probabilities["btts_no"]
+        else "BTTS No"
+    )
+    prob_btts = max(probabilities["btts_yes"], probabilities["btts_no"])
+    odds_btts = odds["btts"][0] if best_btts == "BTTS Yes" else odds["btts"][1]
+
+    probs_1x2 = [
+        probabilities["home_win"],
+        probabilities["draw"],
+        probabilities["away_win"],
+    ]
+    markets_1x2 = ["Heimsieg", "Unentschieden", "Auswärtssieg"]
+    best_idx = probs_1x2.index(max(probs_1x2))
+    best_1x2 = markets_1x2[best_idx]
+    prob_1x2 = probs_1x2[best_idx]
+    odds_1x2_value = odds["1x2"][best_idx]
+
+    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    match_str = f"{match_info['home']} vs {match_info['away']}"
+    mu_total = mu_info.get("total", 0.0)
+
+    return [
+        timestamp,  # A: Timestamp
+        PREDICTION_VERSION,  # B: Version
+        match_str,  # C: Match
+        predicted_score,  # D: Predicted_Score
+        best_1x2,  # E: Predicted_1X2
+        f"{prob_1x2:.1f}%",  # F: Probability_1X2
+        best_over_under,  # G: Best_OverUnder
+        f"{prob_over_under:.1f}%",  # H: Probability_OverUnder
+        f"{odds_over_under:.2f}",  # I: Odds_OverUnder
+        best_btts,  # J: Best_BTTS
+        f"{prob_btts:.1f}%",  # K: Probability_BTTS
+        f"{odds_btts:.2f}",  # L: Odds_BTTS
+        f"{odds_1x2_value:.2f}",  # M: Odds_1X2
+        str(risk_score["score"]),  # N: Risk_Score (1-5)
+        risk_score["category"],  # O: Risk_Category
+        f"{mu_total:.2f}",  # P: μ_Total
+        "PENDING",  # Q: Status
+        "",  # R: Actual_Score
+        "",  # S: Actual_Home
+        "",  # T: Actual_Away
+        "",  # U: Goals_Total
+        "",  # V: BTTS_Actual
+        "",  # W: Over25_Actual
+    ]
+
+
+def append_prediction_rows(service, sheet_id: str, rows: List[List[str]]):
+    """Hängt mehrere PREDICTIONS-Zeilen mit EINEM append-Aufruf an"""
+    body = {"values": rows}
+    return (
+        service.spreadsheets()
+        .values()
+        .append(
+            spreadsheetId=sheet_id,
+            range=PREDICTIONS_RANGE,
+            valueInputOption="USER_ENTERED",
+            body=body,
+        )
+        .execute()
+    )
 
 
 def save_prediction_to_sheets(
@@ -18,7 +114,10 @@ def save_prediction_to_sheets(
     mu_info: Dict,
 ) -> bool:
     """
-    Speichert eine Vorhersage in PREDICTIONS Sheet
+    Speichert eine Vorhersage in PREDICTIONS Sheet (synchron)
+
+    Für den Analyse-Pfad siehe models.prediction_queue.enqueue_prediction
+    (gebündelt im Hintergrund).
 
     Args:
         match_info: Match-Informationen
@@ -45,83 +144,12 @@ def save_prediction_to_sheets(
         if service is None:
             return False
 
-        best_over_under = (
-            "Over 2.5"
-            if probabilities["over_25"] >= (100 - probabilities["over_25"])
-            else "Under 2.5"
-        )
-        prob_over_under = max(probabilities["over_25"], 100 - probabilities["over_25"])
-        odds_over_under = (
-            odds["ou25"][0] if best_over_under == "Over 2.5" else odds["ou25"][1]
-        )
-
-        best_btts = (
-            "BTTS Yes"
-            if probabilities["btts_yes"] >= probabilities["btts_no"]
-            else "BTTS No"
+        row = build_prediction_row(
+            match_info, probabilities, odds, risk_score, predicted_score, mu_info
         )
-        prob_btts = max(probabilities["btts_yes"], probabilities["btts_no"])
-        odds_btts = odds["btts"][0] if best_btts == "BTTS Yes" else odds["btts"][1]
+        append_prediction_rows(service, sheet_id, [row])
 
-        probs_1x2 = [
-            probabilities["home_win"],
-            probabilities["draw"],
-            probabilities["away_win"],
-        ]
-        markets_1x2 = ["Heimsieg", "Unentschieden", "Auswärtssieg"]
-        best_idx = probs_1x2.index(max(probs_1x2))
-        best_1x2 = markets_1x2[best_idx]
-        prob_1x2 = probs_1x2[best_idx]
-        odds_1x2_value = odds["1x2"][best_idx]
-
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        match_str = f"{match_info['home']} vs {match_info['away']}"
-        mu_total = mu_info.get("total", 0.0)
-
-        version = "v6.0"  # Aktuelle Version
-
-        values = [
-            [
-                timestamp,  # A: Timestamp
-                version,  # B: Version
-                match_str,  # C: Match
-                predicted_score,  # D: Predicted_Score
-                best_1x2,  # E: Predicted_1X2
-                f"{prob_1x2:.1f}%",  # F: Probability_1X2
-                best_over_under,  # G: Best_OverUnder
-                f"{prob_over_under:.1f}%",  # H: Probability_OverUnder
-                f"{odds_over_under:.2f}",  # I: Odds_OverUnder
-                best_btts,  # J: Best_BTTS
-                f"{prob_btts:.1f}%",  # K: Probability_BTTS
-                f"{odds_btts:.2f}",  # L: Odds_BTTS
-                f"{odds_1x2_value:.2f}",  # M: Odds_1X2
-                str(risk_score["score"]),  # N: Risk_Score (1-5)
-                risk_score["category"],  # O: Risk_Category
-                f"{mu_total:.2f}",  # P: μ_Total
-                "PENDING",  # Q: Status
-                "",  # R: Actual_Score
-                "",  # S: Actual_Home
-                "",  # T: Actual_Away
-                "",  # U: Goals_Total
-                "",  # V: BTTS_Actual
-                "",  # W: Over25_Actual
-            ]
-        ]
-
-        body = {"values": values}
-        result = (
-            service.spreadsheets()
-            .values()
-            .append(
-                spreadsheetId=sheet_id,
-                range="PREDICTIONS!A:W",
-                valueInputOption="USER_ENTERED",
-                body=body,
-            )
-            .execute()
-        )
-
-        st.success(f"✅ Vorhersage ({version}) gespeichert!")
+        st.success(f"✅ Vorhersage ({PREDICTION_VERSION}) gespeichert!")
         return True
 
     except Exception as e:
@@ -623,6 +651,13 @@ def load_historical_matches_from_sheets() -> List[Dict]:
         historical_matches = []
         headers = values[0] if values else []
 
+        # Team-Werte spaltenweise sammeln -> ein TeamStatsBatch pro Seite
+        # statt zwei 38-Feld TeamStats Objekten pro Zeile
+        team_columns = ("position", "games", "points", "ppg_overall")
+        home_names, away_names = [], []
+        home_columns = {name: [] for name in team_columns}
+        away_columns = {name: [] for name in team_columns}
+
         for i, row in enumerate(values):
             if i == 0:
                 continue
@@ -630,91 +665,12 @@ def load_historical_matches_from_sheets() -> List[Dict]:
             try:
                 if "HISTORICAL_DATA" in result.get("range", ""):
                     if len(row) >= 20:
-                        home_team = TeamStats(
-                            name=row[2],
-                            position=int(row[5]),
-                            games=int(row[7]),
-                            points=int(row[9]),
-                            wins=0,
-                            draws=0,
-                            losses=0,
-                            goals_for=0,
-                            goals_against=0,
-                            goal_diff=0,
-                            form_points=0,
-                            form_goals_for=0,
-                            form_goals_against=0,
-                            ha_points=0,
-                            ha_goals_for=0,
-                            ha_goals_against=0,
-                            ppg_overall=float(row[11]),
-                            ppg_ha=0,
-                            avg_goals_match=0,
-                            avg_goals_match_ha=0,
-                            goals_scored_per_match=0,
-                            goals_conceded_per_match=0,
-                            goals_scored_per_match_ha=0,
-                            goals_conceded_per_match_ha=0,
-                            btts_yes_overall=0,
-                            btts_yes_ha=0,
-                            cs_yes_overall=0,
-                            cs_yes_ha=0,
-                            fts_yes_overall=0,
-                            fts_yes_ha=0,
-                            xg_for=0,
-                            xg_against=0,
-                            xg_for_ha=0,
-                            xg_against_ha=0,
-                            shots_per_match=0,
-                            shots_on_target=0,
-                            conversion_rate=0,
-                            possession=0,
-                        )
-
-                        away_team = TeamStats(
-                            name=row[3],
-                            position=int(row[6]),
-                            games=int(row[8]),
-                            points=int(row[10]),
-                            wins=0,
-                            draws=0,
-                            losses=0,
-                            goals_for=0,
-                            goals_against=0,
-                            goal_diff=0,
-                            form_points=0,
-                            form_goals_for=0,
-                            form_goals_against=0,
-                            ha_points=0,
-                            ha_goals_for=0,
-                            ha_goals_against=0,
-                            ppg_overall=float(row[12]),
-                            ppg_ha=0,
-                            avg_goals_match=0,
-                            avg_goals_match_ha=0,
-                            goals_scored_per_match=0,
-                            goals_conceded_per_match=0,
-                            goals_scored_per_match_ha=0,
-                            goals_conceded_per_match_ha=0,
-                            btts_yes_overall=0,
-                            btts_yes_ha=0,
-                            cs_yes_overall=0,
-                            cs_yes_ha=0,
-                            fts_yes_overall=0,
-                            fts_yes_ha=0,
-                            xg_for=0,
-                            xg_against=0,
-                            xg_for_ha=0,
-                            xg_against_ha=0,
-                            shots_per_match=0,
-                            shots_on_target=0,
-                            conversion_rate=0,
-                            possession=0,
-                        )
+                        home_values = (int(row[5]), int(row[7]), int(row[9]), float(row[11]))
+                        away_values = (int(row[6]), int(row[8]), int(row[10]), float(row[12]))
 
                         match_data = {
-                            "home_team": home_team,
-                            "away_team": away_team,
+                            "home_team": None,  # Zeilen-Ansicht, s.u.
+                            "away_team": None,
                             "date": row[1],
                             "predicted_mu_home": float(row[13]),
                             "predicted_mu_away": float(row[14]),
@@ -725,11 +681,23 @@ def load_historical_matches_from_sheets() -> List[Dict]:
                             "actual_score": row[19] if len(row) > 19 else "",
                         }
 
+                        home_names.append(row[2])
+                        away_names.append(row[3])
+                        for name, value in zip(team_columns, home_values):
+                            home_columns[name].append(value)
+                        for name, value in zip(team_columns, away_values):
+                            away_columns[name].append(value)
                         historical_matches.append(match_data)
 
             except Exception as e:
                 continue
 
+        home_batch = TeamStatsBatch.from_columns(home_names, **home_columns)
+        away_batch = TeamStatsBatch.from_columns(away_names, **away_columns)
+        for k, match_data in enumerate(historical_matches):
+            match_data["home_team"] = home_batch[k]
+            match_data["away_team"] = away_batch[k]
+
         return historical_matches
 
     except Exception as e:
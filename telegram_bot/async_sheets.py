@@ -0,0 +1,113 @@
+"""
+Async-Schicht über sheets_service für die Telegram-Handler
+
+Die googleapiclient-Aufrufe blockieren. Direkt in einem async Handler
+aufgerufen, hält jeder Drive-/Sheets-Request die Event-Loop des Bots an -
+alle anderen Nutzer warten, bis z.B. /bet eines Nutzers fertig ist.
+
+Hier laufen die blockierenden Aufrufe deshalb in einem eigenen, begrenzten
+Thread-Pool (die Services aus data.google_clients sind thread-sicher):
+
+- höchstens MAX_CONCURRENT_REQUESTS Google-Requests gleichzeitig (Quota)
+- ein Aufruf von read_sheet_grids_async belegt höchstens
+  MAX_PARALLEL_CHUNKS davon, damit /bet andere Nutzer nicht aussperrt
+- CPU-lastige Analysen laufen in einem separaten, kleinen Pool, damit sie
+  keine I/O-Slots blockieren
+"""
+
+import asyncio
+import functools
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple, TypeVar
+
+from telegram_bot.sheets_service import (
+    get_todays_sheet_id,
+    list_available_dates,
+    list_tabs_in_sheet,
+    read_sheet_grid,
+    read_sheet_grids,
+)
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+MAX_CONCURRENT_REQUESTS = 8  # gleichzeitige Google API Requests des Bots
+MAX_PARALLEL_CHUNKS = 4  # parallele batchGets pro read_sheet_grids_async
+BATCH_CHUNK_SIZE = 20  # Tabs pro batchGet
+MAX_ANALYSIS_WORKERS = 2
+
+_io_executor = ThreadPoolExecutor(
+    max_workers=MAX_CONCURRENT_REQUESTS, thread_name_prefix="sheets-io"
+)
+_cpu_executor = ThreadPoolExecutor(
+    max_workers=MAX_ANALYSIS_WORKERS, thread_name_prefix="bot-analysis"
+)
+
+
+async def run_io(func: Callable[..., T], *args, **kwargs) -> T:
+    """Führt einen blockierenden Google-API-Aufruf im I/O-Pool aus"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_io_executor, functools.partial(func, *args, **kwargs))
+
+
+async def run_cpu(func: Callable[..., T], *args, **kwargs) -> T:
+    """Führt eine CPU-lastige Funktion (Parsing/Analyse) im Analyse-Pool aus"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_cpu_executor, functools.partial(func, *args, **kwargs))
+
+
+async def list_available_dates_async() -> Dict[str, str]:
+    return await run_io(list_available_dates)
+
+
+async def list_tabs_in_sheet_async(spreadsheet_id: str) -> List[str]:
+    return await run_io(list_tabs_in_sheet, spreadsheet_id)
+
+
+async def get_todays_sheet_id_async() -> Optional[Tuple[str, str]]:
+    return await run_io(get_todays_sheet_id)
+
+
+async def read_sheet_grid_async(spreadsheet_id: str, tab_name: str) -> List[List[str]]:
+    return await run_io(read_sheet_grid, spreadsheet_id, tab_name)
+
+
+async def read_sheet_grids_async(
+    spreadsheet_id: str,
+    tab_names: List[str],
+    chunk_size: int = BATCH_CHUNK_SIZE,
+    max_parallel: int = MAX_PARALLEL_CHUNKS,
+) -> Dict[str, List[List[str]]]:
+    """
+    Liest viele Tabs eines Spreadsheets mit parallelen batchGets
+
+    Args:
+        spreadsheet_id: Spreadsheet-ID
+        tab_names: Tab-Namen
+        chunk_size: Tabs pro batchGet
+        max_parallel: Gleichzeitig laufende batchGets dieses Aufrufs
+
+    Returns:
+        Dictionary Tab-Name -> Zellen-Raster (Reihenfolge wie tab_names)
+    """
+    tab_names = list(tab_names)
+    chunks = [
+        tab_names[start : start + chunk_size]
+        for start in range(0, len(tab_names), chunk_size)
+    ]
+    if not chunks:
+        return {}
+
+    limit = asyncio.Semaphore(max(1, max_parallel))
+
+    async def fetch(chunk: List[str]) -> Dict[str, List[List[str]]]:
+        async with limit:
+            return await run_io(read_sheet_grids, spreadsheet_id, chunk, len(chunk))
+
+    results = await asyncio.gather(*(fetch(chunk) for chunk in chunks))
+    grids: Dict[str, List[List[str]]] = {}
+    for result in results:
+        grids.update(result)
+    return {name: grids.get(name, []) for name in tab_names}
@@ -27,15 +27,14 @@ HEADERS_BETS   = [
 # ─────────────────────────────────────────────
 
 def _get_service():
-    from googleapiclient.discovery import build
-    from google.oauth2 import service_account
+    from data.google_clients import get_google_service
     import streamlit as st
 
-    creds = service_account.Credentials.from_service_account_info(
+    return get_google_service(
+        "sheets", "v4",
+        ["https://www.googleapis.com/auth/spreadsheets"],
         dict(st.secrets["gcp_service_account"]),
-        scopes=["https://www.googleapis.com/auth/spreadsheets"],
     )
-    return build("sheets", "v4", credentials=creds)
 
 
 def _get_sheet_id() -> Optional[str]:
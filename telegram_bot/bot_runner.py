@@ -14,6 +14,10 @@ logger = logging.getLogger(__name__)
 
 _bot_thread = None
 
+# Updates verschiedener Nutzer parallel bearbeiten (Sheets-Zugriffe laufen
+# über telegram_bot.async_sheets und blockieren die Event-Loop nicht)
+MAX_CONCURRENT_UPDATES = 32
+
 
 def _drop_webhook(token: str):
     try:
@@ -36,7 +40,12 @@ async def _poll(token: str):
         profil_handler,
     )
 
-    app = Application.builder().token(token).build()
+    app = (
+        Application.builder()
+        .token(token)
+        .concurrent_updates(MAX_CONCURRENT_UPDATES)
+        .build()
+    )
     app.add_handler(CommandHandler("start", start_handler))
     app.add_handler(CommandHandler("lang", lang_handler))
     app.add_handler(CommandHandler("bankroll", bankroll_handler))
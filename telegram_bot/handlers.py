@@ -12,11 +12,13 @@ from telegram.ext import ContextTypes
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from telegram_bot.sheets_service import (
-    list_available_dates,
-    list_tabs_in_sheet,
-    read_sheet_tab,
-    get_todays_sheet_id,
+from telegram_bot.async_sheets import (
+    get_todays_sheet_id_async,
+    list_available_dates_async,
+    list_tabs_in_sheet_async,
+    read_sheet_grid_async,
+    read_sheet_grids_async,
+    run_cpu,
 )
 from telegram_bot.translations import t, get_risk_label, get_bet_type
 
@@ -35,18 +37,18 @@ def get_lang(context: ContextTypes.DEFAULT_TYPE) -> str:
 # HILFSFUNKTIONEN
 # ─────────────────────────────────────────────
 
-def _run_analysis(spreadsheet_id: str, tab_name: str) -> Optional[dict]:
+def _analyze_grid(grid: list, tab_name: str) -> Optional[dict]:
+    """CPU-Teil der Einzelanalyse (Parsing + Analyse eines gelesenen Tabs)"""
     try:
         from data.parser import DataParser
         from analysis.match_analysis import analyze_match_v47_ml
         from app import choose_consistent_predicted_score
 
-        raw_text = read_sheet_tab(spreadsheet_id, tab_name)
-        if not raw_text.strip():
+        if not any(cell.strip() for row in grid for cell in row):
             return None
 
         parser = DataParser()
-        match_data = parser.parse(raw_text)
+        match_data = parser.parse_grid(grid)
         result = analyze_match_v47_ml(match_data)
         result = choose_consistent_predicted_score(result)
         return result
@@ -55,6 +57,90 @@ def _run_analysis(spreadsheet_id: str, tab_name: str) -> Optional[dict]:
         return None
 
 
+def _analyze_grids(tab_names: list, grids: dict) -> list:
+    """CPU-Teil der Batch-Analyse (Parsing + Analyse bereits gelesener Tabs)"""
+    from data.parser import DataParser
+    from analysis.match_analysis import analyze_matches_isolated
+    from app import choose_consistent_predicted_score
+
+    parsed_tabs = []
+    matches = []
+    for tab_name in tab_names:
+        try:
+            grid = grids.get(tab_name, [])
+            if not any(cell.strip() for row in grid for cell in row):
+                continue
+            matches.append(DataParser().parse_grid(grid))
+            parsed_tabs.append(tab_name)
+        except Exception as e:
+            logger.error(f"Analyse-Fehler für Tab '{tab_name}': {e}", exc_info=True)
+
+    # Schlägt der Batch fehl, wird Match für Match wiederholt
+    results = []
+    for tab_name, (result, error) in zip(parsed_tabs, analyze_matches_isolated(matches)):
+        if error is not None:
+            logger.error(f"Analyse-Fehler für Tab '{tab_name}': {error}", exc_info=error)
+            continue
+        results.append(choose_consistent_predicted_score(result))
+    return results
+
+
+async def _run_analysis_async(spreadsheet_id: str, tab_name: str) -> Optional[dict]:
+    """Analysiert einen Tab, ohne die Event-Loop zu blockieren"""
+    grid = await read_sheet_grid_async(spreadsheet_id, tab_name)
+    return await run_cpu(_analyze_grid, grid, tab_name)
+
+
+async def _run_analyses_async(spreadsheet_id: str, tab_names: list) -> list:
+    """
+    Analysiert mehrere Tabs in einem Batch-Durchlauf: Tabs parallel lesen,
+    danach Batch-Analyse im Analyse-Pool. Ergebnisse in Tab-Reihenfolge.
+    """
+    grids = await read_sheet_grids_async(spreadsheet_id, list(tab_names))
+    return await run_cpu(_analyze_grids, tab_names, grids)
+
+
+MULTI_BET_MAX_LEGS = 3
+
+
+def _price_multi_bet(recommendations: list) -> Optional[dict]:
+    """
+    Kombi aus den besten Empfehlungen (höchstens eine pro Match)
+
+    Die Legs liegen in verschiedenen Matches und gelten als unabhängig: die
+    Kombi-Wahrscheinlichkeit ist das Produkt der angezeigten Leg-
+    Wahrscheinlichkeiten (inkl. BTTS-Filter), damit sie zu den Tipps passt.
+
+    Returns:
+        Dictionary mit legs, probability (%), fair_odds, odds (Produkt der
+        Quoten) - None, wenn weniger als zwei Matches beteiligt sind
+    """
+    legs = []
+    seen = set()
+    for rec in recommendations:
+        match_key = (rec["home"], rec["away"])
+        if match_key in seen:
+            continue
+        seen.add(match_key)
+        legs.append(rec)
+        if len(legs) == MULTI_BET_MAX_LEGS:
+            break
+    if len(legs) < 2:
+        return None
+
+    probability = 1.0
+    odds = 1.0
+    for rec in legs:
+        probability *= float(rec["prob"]) / 100
+        odds *= float(rec["odd"])
+    return {
+        "legs": legs,
+        "probability": probability * 100,
+        "fair_odds": 1 / probability if probability > 0 else None,
+        "odds": odds,
+    }
+
+
 def _format_analysis(result: dict, lang: str = "de") -> str:
     info = result.get("match_info", {})
     probs = result.get("probabilities", {})
@@ -170,13 +256,13 @@ async def today_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
     msg = update.message or update.callback_query.message
     loading = await msg.reply_html(t("loading_today", lang))
 
-    result = get_todays_sheet_id()
+    result = await get_todays_sheet_id_async()
     if not result:
         await loading.edit_text(t("no_matches_today", lang))
         return
 
     date_str, sheet_id = result
-    tabs = list_tabs_in_sheet(sheet_id)
+    tabs = await list_tabs_in_sheet_async(sheet_id)
     skip = {"overview", "übersicht", "zusammenfassung", "tracking", "results"}
     match_tabs = [t_ for t_ in tabs if t_.lower() not in skip]
 
@@ -216,7 +302,7 @@ async def dates_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
     msg = update.message or update.callback_query.message
     loading = await msg.reply_html(t("loading_dates", lang))
 
-    dates = list_available_dates()
+    dates = await list_available_dates_async()
     if not dates:
         await loading.edit_text(t("no_dates", lang))
         return
@@ -248,13 +334,13 @@ async def date_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
     date_str = context.args[0]
     loading = await update.message.reply_html(t("loading_date", lang, date=date_str))
 
-    dates = list_available_dates()
+    dates = await list_available_dates_async()
     if date_str not in dates:
         await loading.edit_text(t("no_data_date", lang, date=date_str))
         return
 
     sheet_id = dates[date_str]
-    tabs = list_tabs_in_sheet(sheet_id)
+    tabs = await list_tabs_in_sheet_async(sheet_id)
     skip = {"overview", "übersicht", "zusammenfassung", "tracking", "results"}
     match_tabs = [t_ for t_ in tabs if t_.lower() not in skip]
 
@@ -294,13 +380,13 @@ async def bet_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
     msg = update.message or update.callback_query.message
     loading = await msg.reply_html(t("loading_bet", lang))
 
-    result = get_todays_sheet_id()
+    result = await get_todays_sheet_id_async()
     if not result:
         await loading.edit_text(t("no_matches_bet", lang))
         return
 
     date_str, sheet_id = result
-    tabs = list_tabs_in_sheet(sheet_id)
+    tabs = await list_tabs_in_sheet_async(sheet_id)
     skip = {"overview", "übersicht", "zusammenfassung", "tracking", "results"}
     match_tabs = [t_ for t_ in tabs if t_.lower() not in skip]
 
@@ -311,11 +397,7 @@ async def bet_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
     await loading.edit_text(t("analyzing", lang, count=len(match_tabs)))
 
     recommendations = []
-    for tab in match_tabs:
-        analysis = _run_analysis(sheet_id, tab)
-        if not analysis:
-            continue
-
+    for analysis in await _run_analyses_async(sheet_id, match_tabs):
         probs = analysis.get("probabilities", {})
         odds = analysis.get("odds", {})
         ext_risk = analysis.get("extended_risk", {})
@@ -377,6 +459,23 @@ async def bet_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
             f"   {t('bet_edge', lang)}: +{rec['edge']:.1f}%  {risk_emoji} {t('bet_risk', lang)} {rec['risk']}/5\n\n"
         )
 
+    # Kombi aus den Top-Empfehlungen (Produkt der angezeigten Wahrscheinlichkeiten)
+    multi_bet = _price_multi_bet(recommendations[:5])
+    if multi_bet:
+        legs = " + ".join(
+            f"{rec['home']}: {get_bet_type(rec['bet_type'], lang)}" for rec in multi_bet["legs"]
+        )
+        fair_odds = multi_bet["fair_odds"]
+        text += t(
+            "bet_multi",
+            lang,
+            count=len(multi_bet["legs"]),
+            legs=legs,
+            odds=f"{multi_bet['odds']:.2f}",
+            prob=f"{multi_bet['probability']:.1f}",
+            fair=f"{fair_odds:.2f}" if fair_odds else "–",
+        )
+
     await loading.edit_text(text, parse_mode="HTML")
 
 
@@ -426,7 +525,7 @@ async def button_callback_handler(update: Update, context: ContextTypes.DEFAULT_
                 t("analyzing_match", lang, home=match["home"], away=match["away"])
             )
 
-            result = _run_analysis(match["sheet_id"], match["tab"])
+            result = await _run_analysis_async(match["sheet_id"], match["tab"])
             if not result:
                 await query.edit_message_text(t("analysis_failed", lang))
                 return
@@ -53,13 +53,12 @@ def _build_sheets_service():
     if not creds_dict:
         return None
     try:
-        from google.oauth2.service_account import Credentials
-        from googleapiclient.discovery import build
-        creds = Credentials.from_service_account_info(
+        from data.google_clients import get_google_service
+        return get_google_service(
+            "sheets", "v4",
+            ["https://www.googleapis.com/auth/spreadsheets.readonly"],
             creds_dict,
-            scopes=["https://www.googleapis.com/auth/spreadsheets.readonly"]
         )
-        return build("sheets", "v4", credentials=creds)
     except Exception as e:
         logger.error(f"Sheets Service Fehler: {e}")
         return None
@@ -70,13 +69,12 @@ def _build_drive_service():
     if not creds_dict:
         return None
     try:
-        from google.oauth2.service_account import Credentials
-        from googleapiclient.discovery import build
-        creds = Credentials.from_service_account_info(
+        from data.google_clients import get_google_service
+        return get_google_service(
+            "drive", "v3",
+            ["https://www.googleapis.com/auth/drive.readonly"],
             creds_dict,
-            scopes=["https://www.googleapis.com/auth/drive.readonly"]
         )
-        return build("drive", "v3", credentials=creds)
     except Exception as e:
         logger.error(f"Drive Service Fehler: {e}")
         return None
@@ -130,11 +128,11 @@ def list_tabs_in_sheet(spreadsheet_id: str) -> List[str]:
         return []
 
 
-def read_sheet_tab(spreadsheet_id: str, tab_name: str) -> str:
-    """Liest einen Tab und gibt ihn als Text zurück (kompatibel mit DataParser)"""
+def read_sheet_grid(spreadsheet_id: str, tab_name: str) -> List[List[str]]:
+    """Liest einen Tab als Zellen-Raster (für DataParser.parse_grid)"""
     service = _build_sheets_service()
     if not service:
-        return ""
+        return []
     try:
         result = (
             service.spreadsheets()
@@ -142,11 +140,40 @@ def read_sheet_tab(spreadsheet_id: str, tab_name: str) -> str:
             .get(spreadsheetId=spreadsheet_id, range=tab_name)
             .execute()
         )
-        rows = result.get("values", [])
-        return "\n".join("\t".join(row) for row in rows)
+        return result.get("values", [])
     except Exception as e:
         logger.error(f"Read sheet error: {e}")
-        return ""
+        return []
+
+
+def read_sheet_grids(
+    spreadsheet_id: str, tab_names: List[str], chunk_size: int = 50
+) -> Dict[str, List[List[str]]]:
+    """
+    Wie read_sheet_grid, aber für viele Tabs: ein values().batchGet pro
+    chunk_size Tabs. Schlägt ein Block fehl, werden seine Tabs einzeln gelesen.
+    """
+    service = _build_sheets_service()
+    if not service:
+        return {name: [] for name in tab_names}
+
+    grids: Dict[str, List[List[str]]] = {}
+    for start in range(0, len(tab_names), chunk_size):
+        chunk = tab_names[start : start + chunk_size]
+        try:
+            result = (
+                service.spreadsheets()
+                .values()
+                .batchGet(spreadsheetId=spreadsheet_id, ranges=list(chunk))
+                .execute()
+            )
+            for name, value_range in zip(chunk, result.get("valueRanges", [])):
+                grids[name] = value_range.get("values", [])
+        except Exception as e:
+            logger.error(f"Batch read error: {e}")
+            for name in chunk:
+                grids[name] = read_sheet_grid(spreadsheet_id, name)
+    return grids
 
 
 def get_todays_sheet_id() -> Optional[Tuple[str, str]]:
@@ -42,6 +42,7 @@ TEXTS = {
         "bet_prob": "Prob",
         "bet_edge": "Edge",
         "bet_risk": "Risiko",
+        "bet_multi": "🔗 <b>Kombi ({count} Tipps)</b>\n   {legs}\n   Quote: {odds}  |  Prob: {prob}%  |  Faire Quote: {fair}\n",
 
         # Analysis
         "analyzing_match": "⏳ Analysiere {home} vs {away}...",
@@ -125,6 +126,7 @@ TEXTS = {
         "bet_prob": "Olasılık",
         "bet_edge": "Edge",
         "bet_risk": "Risk",
+        "bet_multi": "🔗 <b>Kombine ({count} tahmin)</b>\n   {legs}\n   Oran: {odds}  |  Olasılık: {prob}%  |  Adil oran: {fair}\n",
 
         "analyzing_match": "⏳ {home} vs {away} analiz ediliyor...",
         "analysis_failed": "❌ Analiz başarısız – Sekme verisi eksik?",
@@ -204,6 +206,7 @@ TEXTS = {
         "bet_prob": "Prob",
         "bet_edge": "Edge",
         "bet_risk": "Risk",
+        "bet_multi": "🔗 <b>Multi-bet ({count} tips)</b>\n   {legs}\n   Odds: {odds}  |  Prob: {prob}%  |  Fair odds: {fair}\n",
 
         "analyzing_match": "⏳ Analysing {home} vs {away}...",
         "analysis_failed": "❌ Analysis failed – Tab data incomplete?",
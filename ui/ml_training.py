@@ -8,6 +8,7 @@ import plotly.graph_objects as go
 from ml.position_ml import TablePositionML
 from ml.extended_ml import ExtendedMatchML
 from models.tracking import load_historical_matches_from_sheets
+from analysis.goal_models import GOAL_MODELS, fit_dixon_coles_rho_from_history
 
 
 def show_ml_training_ui():
@@ -240,3 +241,54 @@ def show_ml_training_ui():
 
                 else:
                     st.error(correction["message"])
+
+    # Tor-Modell (Ergebnismatrix)
+    st.markdown("---")
+    show_goal_model_ui(historical_matches)
+
+
+def show_goal_model_ui(historical_matches):
+    """
+    Auswahl des Tor-Modells für die Ergebnismatrix und Dixon-Coles-ρ-Fit
+    auf HISTORICAL_DATA
+    """
+    st.subheader("🎯 Tor-Modell (Ergebnismatrix)")
+
+    labels = {
+        "poisson": "Poisson (unabhängig)",
+        "dixon_coles": "Dixon-Coles (ρ-Korrektur)",
+        "bivariate": "Bivariates Poisson",
+        "negbin": "Negativ-Binomial",
+    }
+    current = st.session_state.get("goal_model", "poisson")
+    goal_model = st.selectbox(
+        "Modell",
+        options=list(GOAL_MODELS),
+        index=list(GOAL_MODELS).index(current),
+        format_func=lambda m: labels[m],
+        key="goal_model_select",
+    )
+    if goal_model != current:
+        st.session_state.goal_model = goal_model
+        st.session_state.goal_model_params = None
+
+    params = st.session_state.get("goal_model_params") or {}
+    if params:
+        st.caption(
+            "Parameter: " + ", ".join(f"{k} = {v:.4f}" for k, v in params.items())
+        )
+
+    if goal_model == "dixon_coles":
+        if st.button(
+            f"📐 ρ aus HISTORICAL_DATA fitten ({len(historical_matches)} Matches)",
+            use_container_width=True,
+        ):
+            fit = fit_dixon_coles_rho_from_history(historical_matches)
+            if fit["n_low_scores"] == 0:
+                st.warning("⚠️ Keine Ergebnisse mit 0/1 Toren - ρ nicht schätzbar")
+            else:
+                st.session_state.goal_model_params = {"rho": fit["rho"]}
+                st.success(
+                    f"✅ ρ = {fit['rho']:.4f} "
+                    f"({fit['n_matches']} Matches, {fit['n_low_scores']} Niedrig-Ergebnisse)"
+                )
@@ -23,8 +23,7 @@ def _display_ml_predictions_inline(result: Dict):
         # Importiere benötigte Module
         from ml.football_ml_models import get_ml_models
         from ml.scoreline_predictor import ScorelinePredictor
-        from ui.sheets_ml_integration import convert_match_data_to_features
-        from data import read_worksheet_text_by_id, DataParser
+        from data import read_worksheet_grid_by_id, DataParser
 
         st.subheader("🤖 Machine Learning Prognose")
 
@@ -51,15 +50,15 @@ def _display_ml_predictions_inline(result: Dict):
         # Lade Match-Daten DIREKT aus Sheets (wie Tab 6!)
         try:
             with st.spinner("Lade Match-Daten für ML..."):
-                match_text = read_worksheet_text_by_id(sheet_id, selected_tab)
+                match_grid = read_worksheet_grid_by_id(sheet_id, selected_tab)
 
-                if not match_text:
+                if not match_grid:
                     st.warning("⚠️ Konnte Match-Daten nicht laden")
                     return
 
                 # Parse Match-Daten
                 parser = DataParser()
-                match_data = parser.parse(match_text)
+                match_data = parser.parse_grid(match_grid)
 
         except Exception as e:
             st.info(f"""
@@ -71,11 +70,13 @@ def _display_ml_predictions_inline(result: Dict):
             """)
             return
 
-        # Konvertiere zu Features (GLEICHE Funktion wie Tab 6!)
-        features = convert_match_data_to_features(match_data)
+        # Quoten für die Anzeige direkt aus MatchData (fehlend = 0.0)
+        odds_1x2 = match_data.odds_1x2 or (0.0, 0.0, 0.0)
+        odds_ou25 = match_data.odds_ou25 or (0.0, 0.0)
+        odds_btts = match_data.odds_btts or (0.0, 0.0)
 
         # Hole Predictions (MIT Quoten)
-        predictions = ml_models.predict_all(features, use_odds=True)
+        predictions = ml_models.predict_match_data(match_data, use_odds=True)
 
         # Erstelle Scoreline Predictor
         scoreline_pred = ScorelinePredictor()
@@ -241,11 +242,11 @@ def _display_ml_predictions_inline(result: Dict):
 
                 # Hole Quote basierend auf Prediction
                 if pred_1x2["prediction"] == "HOME WIN":
-                    odds = features.get("odds_home", 0.0)
+                    odds = odds_1x2[0]
                 elif pred_1x2["prediction"] == "DRAW":
-                    odds = features.get("odds_draw", 0.0)
+                    odds = odds_1x2[1]
                 else:
-                    odds = features.get("odds_away", 0.0)
+                    odds = odds_1x2[2]
 
                 st.success(
                     f"### 🎯 1X2\n\n"
@@ -261,9 +262,9 @@ def _display_ml_predictions_inline(result: Dict):
 
                 # Hole Quote
                 if "OVER" in pred_ou["prediction"]:
-                    odds = features.get("odds_over25", 0.0)
+                    odds = odds_ou25[0]
                 else:
-                    odds = features.get("odds_under25", 0.0)
+                    odds = odds_ou25[1]
 
                 st.success(
                     f"### 📈 Over/Under 2.5\n\n"
@@ -283,9 +284,9 @@ def _display_ml_predictions_inline(result: Dict):
 
                 # Hole Quote
                 if pred_btts["prediction"] == "BTTS YES":
-                    odds = features.get("odds_btts_yes", 0.0)
+                    odds = odds_btts[0]
                 else:
-                    odds = features.get("odds_btts_no", 0.0)
+                    odds = odds_btts[1]
 
                 st.success(
                     f"### ⚽ BTTS\n\n"
@@ -548,30 +549,50 @@ def display_simulation_section(result: Dict):
     with col_a:
         n_sims = st.select_slider(
             "Anzahl Durchgänge",
-            options=[1_000, 10_000, 100_000, 1_000_000],
+            options=[1_000, 10_000, 100_000, 1_000_000, 10_000_000],
             value=10_000,
             format_func=lambda x: f"{x:,}".replace(",", "."),
             key=f"sim_n_{result['match_info']['home']}_{result['match_info']['away']}",
         )
     with col_b:
+        force_mc = st.checkbox(
+            "Monte-Carlo erzwingen",
+            value=False,
+            key=f"sim_mc_{result['match_info']['home']}_{result['match_info']['away']}",
+            help="Ohne Haken werden die Märkte exakt aus der Ergebnismatrix berechnet (sofort, ohne Stichprobenrauschen).",
+        )
         run_sim = st.button(
             "▶️ Simulation starten",
             key=f"sim_run_{result['match_info']['home']}_{result['match_info']['away']}",
         )
 
     if run_sim:
+        engine = "mc" if force_mc else "auto"
         with st.spinner(f"Simuliere {n_sims:,} Spiele...".replace(",", ".")):
-            sim_result = simulate_match(mu_home=mu_home, mu_away=mu_away, n_sims=n_sims)
+            sim_result = simulate_match(
+                mu_home=mu_home,
+                mu_away=mu_away,
+                n_sims=n_sims,
+                engine=engine,
+                goal_model=st.session_state.get("goal_model", "poisson"),
+                model_params=st.session_state.get("goal_model_params"),
+            )
 
         sp = sim_result["probabilities"]
         ci = sim_result["confidence_95"]
 
-        st.caption(
-            f"Basis: μ Heim={mu_home:.2f}, μ Auswärts={mu_away:.2f} · "
-            f"{sim_result['n_sims']:,} simulierte Spiele (95%-Konfidenzintervall in Klammern)".replace(
-                ",", "."
+        if sim_result.get("engine") == "exact":
+            st.caption(
+                f"Basis: μ Heim={mu_home:.2f}, μ Auswärts={mu_away:.2f} · "
+                "exakt aus der Ergebnismatrix berechnet (kein Stichprobenfehler)"
+            )
+        else:
+            st.caption(
+                f"Basis: μ Heim={mu_home:.2f}, μ Auswärts={mu_away:.2f} · "
+                f"{sim_result['n_sims']:,} simulierte Spiele (95%-Konfidenzintervall in Klammern)".replace(
+                    ",", "."
+                )
             )
-        )
 
         col1, col2, col3 = st.columns(3)
         col1.metric("Heimsieg", f"{sp['home_win']}%", f"±{ci['home_win']}pp")
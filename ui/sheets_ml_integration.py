@@ -5,100 +5,10 @@ Lädt Match-Daten direkt aus Google Sheets und erstellt Predictions
 
 import streamlit as st
 from typing import Dict, Optional
-from data import read_worksheet_text_by_id, DataParser
+from data import read_worksheet_grid_by_id, DataParser
 from ml.football_ml_models import get_ml_models
 from ml.scoreline_predictor import ScorelinePredictor
 
-
-def convert_match_data_to_features(match_data) -> Dict:
-    """
-    Konvertiert MatchData Objekt zu Feature Dictionary für ML Models
-    
-    Args:
-        match_data: MatchData Objekt vom Parser
-        
-    Returns:
-        Dictionary mit Features
-    """
-    features = {}
-    
-    # Home Team Features (direkt aus TeamStats, NICHT .overall!)
-    if match_data.home_team:
-        ht = match_data.home_team
-        
-        # Basic Stats
-        features['home_position'] = ht.position if hasattr(ht, 'position') else 10
-        features['home_points'] = ht.points if hasattr(ht, 'points') else 0
-        features['home_goals_for'] = ht.goals_for if hasattr(ht, 'goals_for') else 0
-        features['home_goals_against'] = ht.goals_against if hasattr(ht, 'goals_against') else 0
-        features['home_wins'] = ht.wins if hasattr(ht, 'wins') else 0
-        features['home_draws'] = ht.draws if hasattr(ht, 'draws') else 0
-        features['home_losses'] = ht.losses if hasattr(ht, 'losses') else 0
-        features['home_ppg_overall'] = ht.ppg_overall if hasattr(ht, 'ppg_overall') else 0
-        features['home_goal_diff'] = ht.goal_diff if hasattr(ht, 'goal_diff') else 0
-        
-        # Home/Away Stats
-        features['home_total_goals_for_ha'] = ht.ha_goals_for if hasattr(ht, 'ha_goals_for') else 0
-        features['home_total_goals_against_ha'] = ht.ha_goals_against if hasattr(ht, 'ha_goals_against') else 0
-        features['home_ppg_ha'] = ht.ppg_ha if hasattr(ht, 'ppg_ha') else 0
-        
-        # Form (Last 5)
-        features['home_last5_points'] = ht.form_points if hasattr(ht, 'form_points') else 0
-        features['home_last5_goals_for'] = ht.form_goals_for if hasattr(ht, 'form_goals_for') else 0
-        features['home_last5_goals_against'] = ht.form_goals_against if hasattr(ht, 'form_goals_against') else 0
-        features['home_last5_goal_diff'] = features['home_last5_goals_for'] - features['home_last5_goals_against']
-        
-        # Additional Stats
-        features['home_avg_goals_scored_overall'] = ht.goals_scored_per_match if hasattr(ht, 'goals_scored_per_match') else 0
-        features['home_avg_goals_conceded_overall'] = ht.goals_conceded_per_match if hasattr(ht, 'goals_conceded_per_match') else 0
-        
-    # Away Team Features (direkt aus TeamStats, NICHT .overall!)
-    if match_data.away_team:
-        at = match_data.away_team
-        
-        # Basic Stats
-        features['away_position'] = at.position if hasattr(at, 'position') else 10
-        features['away_points'] = at.points if hasattr(at, 'points') else 0
-        features['away_goals_for'] = at.goals_for if hasattr(at, 'goals_for') else 0
-        features['away_goals_against'] = at.goals_against if hasattr(at, 'goals_against') else 0
-        features['away_wins'] = at.wins if hasattr(at, 'wins') else 0
-        features['away_draws'] = at.draws if hasattr(at, 'draws') else 0
-        features['away_losses'] = at.losses if hasattr(at, 'losses') else 0
-        features['away_ppg_overall'] = at.ppg_overall if hasattr(at, 'ppg_overall') else 0
-        features['away_goal_diff'] = at.goal_diff if hasattr(at, 'goal_diff') else 0
-        
-        # Home/Away Stats
-        features['away_total_goals_for_ha'] = at.ha_goals_for if hasattr(at, 'ha_goals_for') else 0
-        features['away_total_goals_against_ha'] = at.ha_goals_against if hasattr(at, 'ha_goals_against') else 0
-        features['away_ppg_ha'] = at.ppg_ha if hasattr(at, 'ppg_ha') else 0
-        
-        # Form (Last 5)
-        features['away_last5_points'] = at.form_points if hasattr(at, 'form_points') else 0
-        features['away_last5_goals_for'] = at.form_goals_for if hasattr(at, 'form_goals_for') else 0
-        features['away_last5_goals_against'] = at.form_goals_against if hasattr(at, 'form_goals_against') else 0
-        features['away_last5_goal_diff'] = features['away_last5_goals_for'] - features['away_last5_goals_against']
-        
-        # Additional Stats
-        features['away_avg_goals_scored_overall'] = at.goals_scored_per_match if hasattr(at, 'goals_scored_per_match') else 0
-        features['away_avg_goals_conceded_overall'] = at.goals_conceded_per_match if hasattr(at, 'goals_conceded_per_match') else 0
-    
-    # Odds
-    if match_data.odds_1x2:
-        features['odds_home'] = match_data.odds_1x2[0]
-        features['odds_draw'] = match_data.odds_1x2[1]
-        features['odds_away'] = match_data.odds_1x2[2]
-    
-    if match_data.odds_ou25:
-        features['odds_over25'] = match_data.odds_ou25[0]
-        features['odds_under25'] = match_data.odds_ou25[1]
-    
-    if match_data.odds_btts:
-        features['odds_btts_yes'] = match_data.odds_btts[0]
-        features['odds_btts_no'] = match_data.odds_btts[1]
-    
-    return features
-
-
 def show_sheets_ml_predictions(sheet_id: str, selected_tab: str):
     """
     Zeigt ML Predictions basierend auf Google Sheets Daten
@@ -129,18 +39,15 @@ def show_sheets_ml_predictions(sheet_id: str, selected_tab: str):
     # Lade Match-Daten
     try:
         with st.spinner("Lade Match-Daten..."):
-            match_text = read_worksheet_text_by_id(sheet_id, selected_tab)
+            match_grid = read_worksheet_grid_by_id(sheet_id, selected_tab)
             
-            if not match_text:
+            if not match_grid:
                 st.error("❌ Konnte Match-Daten nicht laden")
                 return
             
             # Parse Match-Daten
             parser = DataParser()
-            match_data = parser.parse(match_text)
-            
-            # Konvertiere zu Features
-            features = convert_match_data_to_features(match_data)
+            match_data = parser.parse_grid(match_grid)
             
     except Exception as e:
         st.error(f"❌ Fehler beim Laden: {e}")
@@ -176,7 +83,7 @@ def show_sheets_ml_predictions(sheet_id: str, selected_tab: str):
         
         with col_with:
             st.markdown("### 🎲 MIT Quoten")
-            predictions_with = ml_models.predict_all(features, use_odds=True)
+            predictions_with = ml_models.predict_match_data(match_data, use_odds=True)
             display_compact_predictions(
                 predictions_with, 
                 match_data,
@@ -185,7 +92,7 @@ def show_sheets_ml_predictions(sheet_id: str, selected_tab: str):
         
         with col_no:
             st.markdown("### 💎 OHNE Quoten")
-            predictions_no = ml_models.predict_all(features, use_odds=False)
+            predictions_no = ml_models.predict_match_data(match_data, use_odds=False)
             display_compact_predictions(
                 predictions_no, 
                 match_data,
@@ -193,17 +100,27 @@ def show_sheets_ml_predictions(sheet_id: str, selected_tab: str):
             )
     
     elif version_choice == "🎲 MIT Quoten":
-        predictions = ml_models.predict_all(features, use_odds=True)
+        predictions = ml_models.predict_match_data(match_data, use_odds=True)
         display_full_predictions(predictions, match_data, ml_models)
     
     else:  # OHNE Quoten
-        predictions = ml_models.predict_all(features, use_odds=False)
+        predictions = ml_models.predict_match_data(match_data, use_odds=False)
         display_full_predictions(predictions, match_data, ml_models)
 
 
+def show_missing_features(predictions: Dict):
+    """Meldet Features, die für dieses Match mit 0 ins Model gingen"""
+    missing = predictions.get('missing_features')
+    if missing:
+        with st.expander(f"⚠️ {len(missing)} Features ohne Daten (mit 0 gerechnet)"):
+            st.caption(", ".join(missing))
+
+
 def display_compact_predictions(predictions: Dict, match_data, ml_models):
     """Kompakte Darstellung für Vergleich"""
     
+    show_missing_features(predictions)
+    
     # Over/Under
     if predictions.get('over_under'):
         ou = predictions['over_under']
@@ -311,6 +228,7 @@ def display_full_predictions(predictions: Dict, match_data, ml_models):
     
     # ML Model Predictions
     st.markdown("### 🤖 ML Model Predictions")
+    show_missing_features(predictions)
     
     # Over/Under
     if predictions.get('over_under'):
@@ -127,7 +127,9 @@ def show_sidebar(navigator: dict | None = None):
                 st.session_state.nav_view_mode = "search"
 
             match_index = navigator.get("match_index") or []
-            grouped = group_matches_by_country_league(match_index)
+            grouped = navigator.get("grouped")
+            if grouped is None:
+                grouped = group_matches_by_country_league(match_index)
 
             # Country / League expanders
             if match_index:
@@ -2,6 +2,6 @@
 Utility-Funktionen für die Sportwetten-Prognose App
 """
 
-from .math_helpers import poisson_probability
+from .math_helpers import poisson_probability, poisson_pmf_array
 
-__all__ = ["poisson_probability"]
+__all__ = ["poisson_probability", "poisson_pmf_array"]
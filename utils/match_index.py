@@ -7,11 +7,18 @@ Builds lightweight metadata for matches (country/league/teams) for fast navigati
 from __future__ import annotations
 
 import re
+import threading
+import unicodedata
+from functools import lru_cache
 from typing import Dict, List, Tuple, Optional
 
 import streamlit as st
 
-from data.google_sheets import batch_get_worksheet_values_ranges_by_id
+from data.google_sheets import (
+    batch_get_worksheet_values_ranges_by_id,
+    prefetched_tab_values,
+)
+from data.sheets_cache import SHEETS_DISK_CACHE
 
 
 _COUNTRY_FLAG_OVERRIDES: Dict[str, str] = {
@@ -165,19 +172,42 @@ _COUNTRY_TO_ISO2: Dict[str, str] = {
 }
 
 
+# UK nations without an ISO2 code of their own. League names ("Premier League",
+# "Serie A", "Bundesliga", ...) are used by several countries and are left to
+# fall through to 🌍.
+_UK_NATION_TO_ISO2: Dict[str, str] = {
+    "schottland": "GB",
+    "nordirland": "GB",
+    "northern ireland": "GB",
+}
+
+_NON_KEY_CHARS_RE = re.compile(r"[^a-z0-9\s\-]")
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=4096)
 def _normalize_country_key(s: str) -> str:
     s = (s or "").strip().lower()
     # German umlauts + ß
     s = s.replace("ä", "ae").replace("ö", "oe").replace("ü", "ue").replace("ß", "ss")
-    # Strip accents
-    import unicodedata
-    s = "".join(c for c in unicodedata.normalize("NFKD", s) if not unicodedata.combining(c))
+    # Strip accents (ASCII-only strings are already normalized)
+    if not s.isascii():
+        s = "".join(c for c in unicodedata.normalize("NFKD", s) if not unicodedata.combining(c))
     # Keep basic chars
-    s = re.sub(r"[^a-z0-9\s\-]", "", s)
-    s = re.sub(r"\s+", " ", s).strip()
+    s = _NON_KEY_CHARS_RE.sub("", s)
+    s = _WHITESPACE_RE.sub(" ", s).strip()
     return s
 
 
+# Reverse lookup on normalized keys, built once (table keys may contain
+# umlauts/case variants, e.g. "su Korea")
+_COUNTRY_KEY_TO_ISO2: Dict[str, str] = {
+    _normalize_country_key(name): iso2
+    for table in (_UK_NATION_TO_ISO2, _COUNTRY_TO_ISO2)
+    for name, iso2 in table.items()
+}
+
+
 def _iso2_to_flag(iso2: str) -> str:
     iso2 = (iso2 or "").strip().upper()
     if len(iso2) != 2 or not iso2.isalpha():
@@ -186,6 +216,7 @@ def _iso2_to_flag(iso2: str) -> str:
     return chr(ord("🇦") + (ord(iso2[0]) - ord("A"))) + chr(ord("🇦") + (ord(iso2[1]) - ord("A")))
 
 
+@lru_cache(maxsize=1024)
 def get_flag_emoji(country: str) -> str:
     country = (country or "").strip()
     if not country:
@@ -196,7 +227,7 @@ def get_flag_emoji(country: str) -> str:
         return _COUNTRY_FLAG_OVERRIDES[country]
 
     key = _normalize_country_key(country)
-    iso2 = _COUNTRY_TO_ISO2.get(key)
+    iso2 = _COUNTRY_KEY_TO_ISO2.get(key)
 
     # Also support when the sheet already provides ISO codes (e.g., "DE", "GB")
     if not iso2 and len(key) == 2 and key.isalpha():
@@ -205,6 +236,7 @@ def get_flag_emoji(country: str) -> str:
     return _iso2_to_flag(iso2) if iso2 else "🌍"
 
 
+@lru_cache(maxsize=4096)
 def extract_country_league(competition: str) -> Tuple[str, str]:
     """
     Expected format (from user): "Land - Liga - Spieltag"
@@ -267,78 +299,149 @@ def _extract_field(match_text: str, field: str) -> str:
     return ""
 
 
+def _first_non_empty(row: List[str]) -> str:
+    for v in row or []:
+        if isinstance(v, str) and v.strip():
+            return v.strip()
+    return ""
+
+
+def _last_non_empty(row: List[str]) -> str:
+    for v in reversed(row or []):
+        if isinstance(v, str) and v.strip():
+            return v.strip()
+    return ""
+
+
+def _index_entry(tab: str, vals: List[List[str]]) -> Dict:
+    """Navigator metadata for one tab from its B4:E7 header values."""
+    home = away = match_date = competition = kickoff = ""
+
+    if len(vals) >= 1:
+        row0 = vals[0] or []
+        # B4:C4 is home (merged), D4:E4 is away (merged)
+        # Depending on merge behavior, Google may return only one cell, or both.
+        home = _first_non_empty(row0[:2] if len(row0) >= 2 else row0)
+        away = _last_non_empty(row0[2:] if len(row0) >= 3 else row0)
+
+    if len(vals) >= 2:
+        match_date = _first_non_empty(vals[1] or [])
+
+    if len(vals) >= 3:
+        competition = _first_non_empty(vals[2] or [])
+
+    if len(vals) >= 4:
+        kickoff = _first_non_empty(vals[3] or [])
+
+    if not (home and away):
+        ph, pa = parse_tab_teams(tab)
+        home = home or ph
+        away = away or pa
+
+    country, league = extract_country_league(competition)
+
+    return {
+        "tab": tab,
+        "home": home,
+        "away": away,
+        "competition": competition,
+        "country": country,
+        "league": league,
+        "flag": get_flag_emoji(country),
+        "kickoff": kickoff,
+        "date": match_date,
+    }
+
+
+# Bump when _index_entry changes -> persisted entries are rebuilt
+MATCH_INDEX_VERSION = "2"
+_INDEX_CACHE_KEY = "match_index"
+
+_index_lock = threading.Lock()
+_index_entries: Dict[str, Dict[str, Dict]] = {}
+
+
+def _stored_entries(spreadsheet_id: str) -> Dict[str, Dict]:
+    """Per-tab entries of a spreadsheet (process memory, else disk cache)."""
+    with _index_lock:
+        entries = _index_entries.get(spreadsheet_id)
+    if entries is None:
+        entries = SHEETS_DISK_CACHE.get(spreadsheet_id, _INDEX_CACHE_KEY, MATCH_INDEX_VERSION) or {}
+    return entries
+
+
+def update_match_index(spreadsheet_id: str, match_tabs: Tuple[str, ...]) -> Tuple[List[Dict], int]:
+    """
+    Incremental index update: diffs match_tabs against the stored entries.
+
+    - prefetched tabs (prefetch_day_tabs) are re-derived for free
+    - known tabs are reused as-is
+    - only new/renamed tabs have their B4:E7 headers fetched (one batchGet)
+
+    Entries of tabs that disappeared are dropped.
+
+    Returns:
+        (index in match_tabs order, number of tabs fetched from the API)
+    """
+    stored = _stored_entries(spreadsheet_id)
+    entries: Dict[str, Dict] = {}
+    missing: List[str] = []
+    for tab in match_tabs:
+        values = prefetched_tab_values(spreadsheet_id, tab)
+        if values is not None:
+            entries[tab] = _index_entry(tab, [row[1:5] for row in values[3:7]])
+        elif tab in stored:
+            entries[tab] = stored[tab]
+        else:
+            missing.append(tab)
+
+    # Tabs whose header read failed are shown (tab-name fallback) but not
+    # stored, so the next update retries them
+    unresolved: Dict[str, Dict] = {}
+    if missing:
+        ranges = tuple([f"'{tab}'!B4:E7" for tab in missing])
+        range_map = batch_get_worksheet_values_ranges_by_id(spreadsheet_id, ranges)
+        for tab in missing:
+            vals = range_map.get(f"'{tab}'!B4:E7")
+            if vals is None:
+                unresolved[tab] = _index_entry(tab, [])
+            else:
+                entries[tab] = _index_entry(tab, vals)
+
+    with _index_lock:
+        _index_entries[spreadsheet_id] = entries
+    if entries != stored:
+        SHEETS_DISK_CACHE.put(spreadsheet_id, _INDEX_CACHE_KEY, MATCH_INDEX_VERSION, entries)
+
+    index = [entries[tab] if tab in entries else unresolved[tab] for tab in match_tabs]
+    return index, len(missing)
+
+
+def reset_match_index(spreadsheet_id: Optional[str] = None) -> None:
+    """Forgets stored index entries (one spreadsheet or all)."""
+    with _index_lock:
+        if spreadsheet_id is None:
+            _index_entries.clear()
+        else:
+            _index_entries.pop(spreadsheet_id, None)
+
+
 @st.cache_data(ttl=300)
 def build_match_index(spreadsheet_id: str, match_tabs: Tuple[str, ...]) -> List[Dict]:
     """
     Builds lightweight metadata per match tab for the navigation UI.
 
-    PERFORMANCE: uses ONE Sheets API batchGet call to read only the stable header cells (B4:E7)
-    from ALL match tabs.
+    PERFORMANCE: incremental (update_match_index) - after the first build only
+    new or renamed tabs cost an API call (one batchGet over their B4:E7 headers);
+    prefetched days (prefetch_day_tabs) cost none.
     """
     if not spreadsheet_id or not match_tabs:
         return []
 
-    ranges = tuple([f"'{tab}'!B4:E7" for tab in match_tabs])
-    range_map = batch_get_worksheet_values_ranges_by_id(spreadsheet_id, ranges)
-
-    def first_non_empty(row: List[str]) -> str:
-        for v in row or []:
-            if isinstance(v, str) and v.strip():
-                return v.strip()
-        return ""
-
-    def last_non_empty(row: List[str]) -> str:
-        for v in reversed(row or []):
-            if isinstance(v, str) and v.strip():
-                return v.strip()
-        return ""
-
-    index: List[Dict] = []
-    for tab in match_tabs:
-        key = f"'{tab}'!B4:E7"
-        vals = range_map.get(key, []) or []
-
-        home = away = match_date = competition = kickoff = ""
-
-        if len(vals) >= 1:
-            row0 = vals[0] or []
-            # B4:C4 is home (merged), D4:E4 is away (merged)
-            # Depending on merge behavior, Google may return only one cell, or both.
-            home = first_non_empty(row0[:2] if len(row0) >= 2 else row0)
-            away = last_non_empty(row0[2:] if len(row0) >= 3 else row0)
-
-        if len(vals) >= 2:
-            match_date = first_non_empty(vals[1] or [])
-
-        if len(vals) >= 3:
-            competition = first_non_empty(vals[2] or [])
-
-        if len(vals) >= 4:
-            kickoff = first_non_empty(vals[3] or [])
-
-        if not (home and away):
-            ph, pa = parse_tab_teams(tab)
-            home = home or ph
-            away = away or pa
-
-        country, league = extract_country_league(competition)
-
-        index.append(
-            {
-                "tab": tab,
-                "home": home,
-                "away": away,
-                "competition": competition,
-                "country": country,
-                "league": league,
-                "flag": get_flag_emoji(country),
-                "kickoff": kickoff,
-                "date": match_date,
-            }
-        )
-
+    index, _ = update_match_index(spreadsheet_id, tuple(match_tabs))
     return index
 
+
 def group_matches_by_country_league(match_index: List[Dict]) -> Dict[str, Dict[str, List[Dict]]]:
     grouped: Dict[str, Dict[str, List[Dict]]] = {}
     for m in match_index:
@@ -0,0 +1,102 @@
+"""
+Micro-benchmark for navigator indexing
+
+Builds synthetic B4:E7 headers for N match tabs and times _index_entry over all of
+them - once with cleared country/flag caches ("cold", first build of a day) and
+once with warm caches (reruns / further days).
+
+Usage:
+    python -m utils.match_index_benchmark [--tabs 1000] [--repeat 20]
+"""
+
+import argparse
+import random
+import time
+from typing import Dict, List, Tuple
+
+from utils.match_index import (
+    _index_entry,
+    _normalize_country_key,
+    extract_country_league,
+    get_flag_emoji,
+)
+
+_COMPETITIONS = [
+    "Deutschland - Bundesliga - Spieltag {n}",
+    "Deutschland - 2. Bundesliga - Spieltag {n}",
+    "England - Premier League - Matchday {n}",
+    "Österreich - Bundesliga - Runde {n}",
+    "Türkei - Süper Lig - Hafta {n}",
+    "Côte d'Ivoire - Ligue 1 - Journée {n}",
+    "Spanien - La Liga - Jornada {n}",
+    "Italien - Serie A - Giornata {n}",
+    "Frankreich - Ligue 1 - Journée {n}",
+    "Schottland - Premiership - Round {n}",
+    "Dänemark - Superliga - Runde {n}",
+    "Südkorea - K League 1 - Round {n}",
+    "Premier League: Matchday {n}",
+]
+
+
+def synthetic_headers(n: int = 1000, seed: int = 0) -> List[Tuple[str, List[List[str]]]]:
+    """(tab name, B4:E7 values) for n synthetic match tabs."""
+    rnd = random.Random(seed)
+    tabs = []
+    for i in range(n):
+        home, away = f"Team {rnd.randint(1, 400)}", f"Team {rnd.randint(1, 400)}"
+        competition = rnd.choice(_COMPETITIONS).format(n=rnd.randint(1, 34))
+        values = [
+            [home, "", away],
+            ["15.12.2025"],
+            [competition],
+            [f"{rnd.randint(12, 21)}:{rnd.choice(['00', '15', '30', '45'])}"],
+        ]
+        tabs.append((f"{i}_{home} vs {away}", values))
+    return tabs
+
+
+def _clear_caches() -> None:
+    _normalize_country_key.cache_clear()
+    get_flag_emoji.cache_clear()
+    extract_country_league.cache_clear()
+
+
+def benchmark_index(n_tabs: int = 1000, repeat: int = 20) -> Dict[str, float]:
+    """
+    Returns:
+        Dictionary with tabs, cold_us_per_tab, warm_us_per_tab
+    """
+    tabs = synthetic_headers(n_tabs)
+
+    cold = float("inf")
+    warm = float("inf")
+    for _ in range(repeat):
+        _clear_caches()
+        start = time.perf_counter()
+        for tab, values in tabs:
+            _index_entry(tab, values)
+        cold = min(cold, time.perf_counter() - start)
+
+        start = time.perf_counter()
+        for tab, values in tabs:
+            _index_entry(tab, values)
+        warm = min(warm, time.perf_counter() - start)
+
+    return {
+        "tabs": n_tabs,
+        "cold_us_per_tab": cold / n_tabs * 1e6,
+        "warm_us_per_tab": warm / n_tabs * 1e6,
+    }
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="Match index micro-benchmark")
+    arg_parser.add_argument("--tabs", type=int, default=1000)
+    arg_parser.add_argument("--repeat", type=int, default=20)
+    args = arg_parser.parse_args()
+
+    stats = benchmark_index(args.tabs, args.repeat)
+    print(
+        f"{stats['tabs']} Tabs: cold {stats['cold_us_per_tab']:.2f} µs/Tab, "
+        f"warm {stats['warm_us_per_tab']:.2f} µs/Tab"
+    )
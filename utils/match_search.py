@@ -0,0 +1,295 @@
+"""
+Multi-day match search
+
+Cross-day navigator index: per-day entries from build_match_index/update_match_index,
+plus an inverted index over normalized team/league/country tokens with prefix search
+("bay" -> every Bayern match in the loaded days).
+
+Days are refreshed incrementally (only when the day's spreadsheet version changed)
+and the whole state is persisted in the local Sheets cache, so a restart does not
+re-read unchanged days.
+"""
+
+from __future__ import annotations
+
+import bisect
+import threading
+import time
+import unicodedata
+from datetime import date, timedelta
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from data.google_sheets import (
+    list_daily_sheets_in_folder,
+    list_match_tabs_for_day,
+    parse_date,
+    spreadsheet_version,
+)
+from data.sheets_cache import SHEETS_DISK_CACHE
+from utils.match_index import (
+    MATCH_INDEX_VERSION,
+    group_matches_by_country_league,
+    update_match_index,
+)
+
+SEARCH_FIELDS = ("home", "away", "league", "country", "competition", "tab")
+DEFAULT_DAYS_AHEAD = 14
+REFRESH_INTERVAL = 60.0  # seconds between version checks of the loaded days
+_STATE_CACHE_KEY = "match_search_index"
+
+
+def normalize_tokens(text: str) -> List[str]:
+    """Lowercase, accent-free alphanumeric tokens ("München" -> ["munchen"])."""
+    text = (text or "").lower().replace("ß", "ss")
+    text = unicodedata.normalize("NFKD", text)
+    chars = [c if c.isalnum() else " " for c in text if not unicodedata.combining(c)]
+    return "".join(chars).split()
+
+
+class MatchSearchIndex:
+    """
+    Inverted index over match entries of several days.
+
+    Each document is a navigator entry (see utils.match_index._index_entry)
+    plus "day" (dd.mm.yyyy key of the daily sheet) and "spreadsheet_id".
+    """
+
+    def __init__(self):
+        self._docs: Dict[int, Dict] = {}
+        self._postings: Dict[str, Set[int]] = {}
+        self._tokens: List[str] = []  # sorted, for prefix ranges
+        self._days: Dict[str, Tuple[str, Optional[str], List[int]]] = {}
+        self._grouped: Dict[str, Dict[str, Dict[str, List[Dict]]]] = {}
+        self._next_id = 0
+        self._lock = threading.RLock()
+        self.last_refresh = 0.0
+
+    # ── building ─────────────────────────────────────────────
+
+    def day_version(self, day: str) -> Optional[str]:
+        entry = self._days.get(day)
+        return entry[1] if entry else None
+
+    def has_day(self, day: str) -> bool:
+        return day in self._days
+
+    def days(self) -> List[str]:
+        with self._lock:
+            return list(self._days)
+
+    def ensure_day(
+        self, day: str, spreadsheet_id: str, version: Optional[str], entries: List[Dict]
+    ) -> bool:
+        """
+        Indexes a day unless it is already indexed with the same version and tabs
+        (cheap no-op on reruns). Returns True if the day was (re)indexed.
+        """
+        with self._lock:
+            known = self._days.get(day)
+            if known and known[0] == spreadsheet_id and known[1] == version:
+                if [self._docs[i].get("tab") for i in known[2]] == [e.get("tab") for e in entries]:
+                    return False
+            self.update_day(day, spreadsheet_id, version, entries)
+            return True
+
+    def update_day(
+        self, day: str, spreadsheet_id: str, version: Optional[str], entries: Iterable[Dict]
+    ) -> None:
+        """Replaces all documents of one day."""
+        with self._lock:
+            self.remove_day(day)
+            doc_ids = []
+            for entry in entries:
+                doc_id = self._next_id
+                self._next_id += 1
+                doc = dict(entry, day=day, spreadsheet_id=spreadsheet_id)
+                self._docs[doc_id] = doc
+                doc_ids.append(doc_id)
+                for token in self._doc_tokens(doc):
+                    postings = self._postings.get(token)
+                    if postings is None:
+                        self._postings[token] = postings = set()
+                        bisect.insort(self._tokens, token)
+                    postings.add(doc_id)
+            self._days[day] = (spreadsheet_id, version, doc_ids)
+
+    def remove_day(self, day: str) -> None:
+        with self._lock:
+            entry = self._days.pop(day, None)
+            self._grouped.pop(day, None)
+            if entry is None:
+                return
+            for doc_id in entry[2]:
+                doc = self._docs.pop(doc_id)
+                for token in self._doc_tokens(doc):
+                    postings = self._postings.get(token)
+                    if postings is None:
+                        continue
+                    postings.discard(doc_id)
+                    if not postings:
+                        del self._postings[token]
+                        i = bisect.bisect_left(self._tokens, token)
+                        del self._tokens[i]
+
+    @staticmethod
+    def _doc_tokens(doc: Dict) -> Set[str]:
+        tokens: Set[str] = set()
+        for field in SEARCH_FIELDS:
+            tokens.update(normalize_tokens(str(doc.get(field, ""))))
+        return tokens
+
+    # ── queries ──────────────────────────────────────────────
+
+    def _prefix_postings(self, prefix: str) -> Set[int]:
+        start = bisect.bisect_left(self._tokens, prefix)
+        end = bisect.bisect_left(self._tokens, prefix + "\uffff")
+        hits: Set[int] = set()
+        for token in self._tokens[start:end]:
+            hits |= self._postings[token]
+        return hits
+
+    def search(
+        self,
+        query: str,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+        days: Optional[Iterable[str]] = None,
+    ) -> List[Dict]:
+        """
+        All matches whose tokens start with every query token (AND).
+
+        Args:
+            query: free text, e.g. "bayern" or "premier leag"
+            start/end: inclusive date range (None = open)
+            days: restrict to these dd.mm.yyyy days
+
+        Returns:
+            Entries sorted by date and kickoff
+        """
+        tokens = normalize_tokens(query)
+        with self._lock:
+            if tokens:
+                hits: Optional[Set[int]] = None
+                for token in tokens:
+                    found = self._prefix_postings(token)
+                    hits = found if hits is None else hits & found
+                    if not hits:
+                        return []
+            else:
+                hits = set(self._docs)
+
+            allowed_days = set(days) if days is not None else None
+            results = []
+            for doc_id in hits:
+                doc = self._docs[doc_id]
+                if allowed_days is not None and doc["day"] not in allowed_days:
+                    continue
+                if start is not None or end is not None:
+                    d = parse_date(doc["day"])
+                    if (start is not None and d < start) or (end is not None and d > end):
+                        continue
+                results.append(doc)
+        results.sort(key=lambda m: (parse_date(m["day"]), m.get("kickoff", ""), m.get("tab", "")))
+        return results
+
+    def day_entries(self, day: str) -> List[Dict]:
+        with self._lock:
+            entry = self._days.get(day)
+            return [self._docs[doc_id] for doc_id in entry[2]] if entry else []
+
+    def grouped_for_day(self, day: str) -> Dict[str, Dict[str, List[Dict]]]:
+        """Country -> league -> matches of a day (computed once per day update)."""
+        with self._lock:
+            grouped = self._grouped.get(day)
+            if grouped is None:
+                grouped = group_matches_by_country_league(self.day_entries(day))
+                self._grouped[day] = grouped
+            return grouped
+
+    # ── persistence ──────────────────────────────────────────
+
+    def to_state(self) -> Dict:
+        with self._lock:
+            return {
+                day: [sid, version, [self._docs[i] for i in doc_ids]]
+                for day, (sid, version, doc_ids) in self._days.items()
+            }
+
+    @classmethod
+    def from_state(cls, state: Dict) -> "MatchSearchIndex":
+        index = cls()
+        for day, (sid, version, docs) in (state or {}).items():
+            index.update_day(day, sid, version, docs)
+        return index
+
+
+_indexes: Dict[str, MatchSearchIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_match_search_index(folder_id: str) -> MatchSearchIndex:
+    """Process-wide index per Drive folder (restored from the local cache)."""
+    with _indexes_lock:
+        index = _indexes.get(folder_id)
+        if index is None:
+            state = SHEETS_DISK_CACHE.get(folder_id, _STATE_CACHE_KEY, MATCH_INDEX_VERSION)
+            index = MatchSearchIndex.from_state(state) if state else MatchSearchIndex()
+            _indexes[folder_id] = index
+        return index
+
+
+def refresh_match_search_index(
+    folder_id: str,
+    start: Optional[date] = None,
+    days_ahead: int = DEFAULT_DAYS_AHEAD,
+    include_days: Iterable[str] = (),
+    force: bool = False,
+) -> MatchSearchIndex:
+    """
+    Brings the cross-day index up to date for [start, start + days_ahead].
+
+    Only days that are new or whose spreadsheet version changed are re-indexed
+    (tab list + incremental update_match_index); version checks run at most
+    every REFRESH_INTERVAL seconds unless force=True. Days outside the window
+    are dropped, except include_days (e.g. the currently selected day).
+    """
+    index = get_match_search_index(folder_id)
+    now = time.monotonic()
+    wanted = set(include_days)
+    missing_wanted = any(not index.has_day(day) for day in wanted)
+    if not force and not missing_wanted and now - index.last_refresh < REFRESH_INTERVAL:
+        return index
+
+    start = start or date.today()
+    end = start + timedelta(days=days_ahead)
+    date_to_id = list_daily_sheets_in_folder(folder_id)
+    for day, sid in date_to_id.items():
+        try:
+            d = parse_date(day)
+        except ValueError:
+            continue
+        if start <= d <= end:
+            wanted.add(day)
+
+    changed = False
+    for day in index.days():
+        if day not in wanted:
+            index.remove_day(day)
+            changed = True
+
+    for day in sorted(wanted):
+        sid = date_to_id.get(day)
+        if not sid:
+            continue
+        version = spreadsheet_version(sid)
+        if index.has_day(day) and version and index.day_version(day) == version:
+            continue
+        tabs = tuple(list_match_tabs_for_day(sid) or [])
+        entries, _ = update_match_index(sid, tabs) if tabs else ([], 0)
+        index.update_day(day, sid, version, entries)
+        changed = True
+
+    index.last_refresh = now
+    if changed:
+        SHEETS_DISK_CACHE.put(folder_id, _STATE_CACHE_KEY, MATCH_INDEX_VERSION, index.to_state())
+    return index
@@ -4,18 +4,53 @@ Mathematische Hilfsfunktionen
 
 import math
 
+import numpy as np
+
+# Fakultäten k! für k = 0..PMF_K_MAX werden einmal beim Import berechnet
+# (als Python-Liste für den Skalar-Pfad, als Array für den vektorisierten Pfad).
+PMF_K_MAX = 15
+_FACTORIALS = [math.factorial(k) for k in range(PMF_K_MAX + 1)]
+_FACTORIALS_ARRAY = np.array(_FACTORIALS, dtype=float)
+
 
 def poisson_probability(lmbda: float, k: int) -> float:
     """
     Berechnet die Poisson-Wahrscheinlichkeit für k Ereignisse bei erwarteter Rate lambda
-    
+
     Args:
         lmbda: Erwartete Anzahl von Ereignissen (λ)
         k: Tatsächliche Anzahl von Ereignissen
-        
+
     Returns:
         Wahrscheinlichkeit P(X = k)
     """
     if lmbda <= 0:
         return 1.0 if k == 0 else 0.0
-    return (math.exp(-lmbda) * (lmbda**k)) / math.factorial(k)
+    factorial = _FACTORIALS[k] if k <= PMF_K_MAX else math.factorial(k)
+    return (math.exp(-lmbda) * (lmbda**k)) / factorial
+
+
+def poisson_pmf_array(lmbda, max_k: int) -> np.ndarray:
+    """
+    Vektorisierte Poisson-PMF für k = 0..max_k
+
+    Ein exp() pro λ statt eines Aufrufs pro (λ, k)-Zelle; für viele λ auf
+    einmal (z.B. alle Matches eines Spieltags) als ein einziger NumPy-Aufruf.
+
+    Args:
+        lmbda: Erwartete Rate (Skalar oder Array beliebiger Form)
+        max_k: Höchstes k
+
+    Returns:
+        Array der Form (*lmbda.shape, max_k + 1)
+    """
+    lmbda = np.asarray(lmbda, dtype=float)[..., None]
+    k = np.arange(max_k + 1)
+    if max_k <= PMF_K_MAX:
+        factorials = _FACTORIALS_ARRAY[: max_k + 1]
+    else:
+        factorials = np.array([math.factorial(i) for i in k], dtype=float)
+    safe = np.where(lmbda > 0, lmbda, 1.0)
+    pmf = np.exp(-safe) * np.power(safe, k) / factorials
+    # λ <= 0: alle Masse bei k = 0 (wie poisson_probability)
+    return np.where(lmbda > 0, pmf, (k == 0).astype(float))